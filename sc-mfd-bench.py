@@ -0,0 +1,362 @@
+"""Bancs d'essai headless des chemins chauds du MFD.
+
+Usage :
+    python sc-mfd-bench.py                          # écrit bench_results.json
+    python sc-mfd-bench.py --output new.json --compare baseline.json --threshold 0.15
+    python sc-mfd-bench.py --net-clients 32             # + charge du serveur réseau (0 = ignoré)
+    python sc-mfd-bench.py --feed-readers 16            # + débit du flux mémoire partagée avec 16 processus lecteurs
+    python sc-mfd-bench.py --replay session.jnl.gz --speed 10   # rejoue un journal de session dans un deck headless
+
+Tourne sous QT_QPA_PLATFORM=offscreen avec un faux pynput (aucune touche n'est envoyée au système)
+et un dossier de données temporaire. Toutes les métriques sont "plus bas = mieux".
+"""
+import os
+import sys
+import json
+import time
+import enum
+import types
+import argparse
+import platform
+import tempfile
+import importlib.util
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# --- ENVIRONNEMENT ISOLE ---
+def install_pynput_stub():
+    """Remplace pynput par un Controller qui ne fait qu'enregistrer les appels."""
+    Key = enum.Enum("Key", {name: name for name in (
+        ["alt", "alt_l", "alt_r", "alt_gr", "ctrl", "ctrl_l", "ctrl_r", "shift", "shift_l", "shift_r", "cmd", "cmd_l", "cmd_r",
+         "up", "down", "left", "right", "insert", "delete", "home", "end", "page_up", "page_down", "space", "enter", "tab", "esc",
+         "backspace", "caps_lock"] + [f"f{i}" for i in range(1, 21)])})
+    class Controller:
+        def __init__(self): self.events = []
+        def press(self, key): self.events.append(("press", key))
+        def release(self, key): self.events.append(("release", key))
+    keyboard = types.ModuleType("pynput.keyboard"); keyboard.Key = Key; keyboard.Controller = Controller
+    pynput = types.ModuleType("pynput"); pynput.keyboard = keyboard
+    sys.modules["pynput"] = pynput; sys.modules["pynput.keyboard"] = keyboard
+
+def load_deck_module(data_dir):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["LOCALAPPDATA"] = data_dir
+    os.environ["SC_MFD_FEED_NAME"] = f"RSI_MFD_FEED_BENCH_{os.getpid()}" # Ne jamais écraser le flux d'un deck en cours
+    install_pynput_stub()
+    spec = importlib.util.spec_from_file_location("sc_mfd", os.path.join(HERE, "sc-mfd.py"))
+    mod = importlib.util.module_from_spec(spec); sys.modules["sc_mfd"] = mod; spec.loader.exec_module(mod)
+    return mod
+
+# --- OUTILS DE MESURE ---
+def summarize(prefix, samples_ms, results):
+    mfd = sys.modules["sc_mfd"]
+    results[f"{prefix}.avg_ms"] = sum(samples_ms) / len(samples_ms)
+    results[f"{prefix}.p50_ms"] = mfd.percentile(samples_ms, 50)
+    results[f"{prefix}.p99_ms"] = mfd.percentile(samples_ms, 99)
+
+def timed(fn, repeat):
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); out.append((time.perf_counter() - t0) * 1000.0)
+    return out
+
+def spin(app, ms):
+    end = time.perf_counter() + ms / 1000.0
+    while time.perf_counter() < end: app.processEvents(); time.sleep(0.001)
+
+# --- BANCS ---
+def bench_construction(mfd, app, results, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); deck = mfd.SC_ControlDeck(); deck.build_all_panels(); samples.append((time.perf_counter() - t0) * 1000.0)
+        deck.shutdown_services(); deck.deleteLater(); app.processEvents()
+    summarize("deck.construction", samples, results)
+
+def bench_action_overlay(mfd, deck, results, frames=300):
+    ov = deck.action_overlay; ov.set_config(mfd.QColor(255, 0, 0), "EJECTING")
+    def frame(): ov.set_state(True, 0.5, False); ov.repaint(ov.damage_region())
+    summarize("action_overlay.paint", timed(frame, frames), results)
+    ov.set_state(False); ov.repaint()
+
+def bench_system_overlay(mfd, deck, results, frames=200):
+    ov = deck.sys_overlay; ov.set_mode("BOOT")
+    for line in mfd.BOOT_SEQUENCE_LOGS: ov.add_log(line)
+    summarize("system_overlay.boot_paint", timed(ov.repaint, frames), results)
+    ov.set_mode("SHUTDOWN"); ov.shutdown_y_scale = 0.5
+    summarize("system_overlay.shutdown_paint", timed(ov.repaint, frames), results)
+    ov.mode = "BOOT"; ov.set_opacity(0); ov.repaint()
+
+def bench_log(deck, app, results):
+    for total in (10_000, 100_000):
+        t0 = time.perf_counter()
+        for i in range(total): deck.add_log_entry(f"BENCH ENTRY {i}", is_user_action=bool(i & 1))
+        app.processEvents()
+        results[f"log.append_{total // 1000}k.us_per_entry"] = (time.perf_counter() - t0) * 1e6 / total
+
+def bench_telemetry(deck, results, ticks=200):
+    summarize("telemetry.gui_tick", timed(deck.update_telemetry, ticks), results)
+    snap = deck.telemetry_sampler.sample()
+    summarize("telemetry.apply_snapshot", timed(lambda: deck.apply_telemetry_snapshot(snap), ticks), results)
+    summarize("telemetry.sample_offthread", timed(deck.telemetry_sampler.sample, 20), results)
+
+def bench_send_action(mfd, deck, app, results, presses=300):
+    deck.input_engine.backend = mfd.RecordingBackend(); deck.input_engine.latencies_ms.clear()
+    summarize("send_action.gui_call", timed(lambda: deck.send_action("DECOY", silent=True), presses), results)
+    spin(app, 200); deck.input_engine.latencies_ms.clear()
+    for _ in range(100): deck.send_action("DECOY", silent=True); spin(app, 5) # Appuis espacés, comme au doigt
+    stats = deck.input_engine.latency_stats()
+    results["send_action.keystroke_latency.p50_ms"] = stats["p50_ms"]; results["send_action.keystroke_latency.p99_ms"] = stats["p99_ms"]
+
+def bench_macros(mfd, deck, app, results, concurrent=4, steps=10):
+    """Macros qui se chevauchent : retard de chaque étape sur son échéance monotone, compilation, annulation."""
+    deck.input_engine.backend = mfd.RecordingBackend(); deck.macro_timings = mfd.MacroTimings()
+    deck.macros["BENCH_SALVO"] = {"steps": ["DECOY", {"wait": 0.02}] * steps, "gap": 0.0}
+    summarize("macro.compile", timed(lambda: (deck.macro_cache.clear(), deck.macro_steps("BENCH_SALVO")), 50), results)
+    for _ in range(3):
+        for _ in range(concurrent): deck.run_macro("BENCH_SALVO"); spin(app, 3)
+        spin(app, int(steps * 20 + 150))
+    stats = deck.macro_timings.stats().get("BENCH_SALVO", {})
+    results["macro.step_jitter.p50_ms"] = stats.get("p50_ms", 0.0); results["macro.step_jitter.p99_ms"] = stats.get("p99_ms", 0.0)
+    cmd = deck.run_macro("AUTOLAND"); spin(app, 20); t0 = time.perf_counter(); deck.cancel_macros("AUTOLAND")
+    while cmd.t_done is None and time.perf_counter() - t0 < 1.0: spin(app, 1)
+    results["macro.cancel_ms"] = (cmd.t_done - t0) * 1000.0 if cmd.t_done else 1000.0
+
+def bench_config(mfd, deck, results, reloads=50):
+    """Édition externe du fichier de config : détection (stat + empreinte) puis application incrémentale d'un binding."""
+    path = deck.config_file.path; deck.config_file.save(deck.config); samples = []
+    summarize("config.poll_unchanged", timed(deck.config_file.poll, 200), results)
+    for i in range(reloads):
+        conf = dict(deck.config, DECOY="h" if i % 2 else "g"); mfd.atomic_write_text(path, json.dumps(conf, indent=4), fsync=False)
+        t0 = time.perf_counter(); deck.check_config_file(); samples.append((time.perf_counter() - t0) * 1000.0)
+    summarize("config.reload_binding", samples, results)
+    summarize("config.save", timed(lambda: deck.config_file.save(deck.config), 20), results)
+
+def bench_journal(mfd, deck, app, results, records=5000):
+    """Coût côté GUI d'un enregistrement (mise en file seule), écriture par lots, puis rejeu accéléré du journal produit."""
+    journal = deck.journal
+    if journal is None or not journal.isRunning(): return
+    journal.flush()
+    t0 = time.perf_counter()
+    for i in range(records): journal.write(mfd.J_LOG, (mfd.LOG_LEVEL_SYSTEM, f"BENCH ENTRY {i:05d} // Shield harmonics: 98%"))
+    results["journal.write.us_per_record"] = (time.perf_counter() - t0) * 1e6 / records
+    t0 = time.perf_counter(); journal.flush(); results["journal.drain_ms"] = (time.perf_counter() - t0) * 1000.0
+    snap = deck.telemetry_sampler.sample()
+    for i in range(200): deck.replay_record(mfd.J_TELEMETRY, snap); deck.send_action("DECOY", silent=True)
+    journal.flush(); deck.input_engine.backend = mfd.RecordingBackend()
+    stats = replay_journal(mfd, deck, app, journal.path, speed=0)
+    results["journal.replay.us_per_record"] = stats["duration_s"] * 1e6 / max(1, stats["replayed"])
+
+def bench_notes(mfd, deck, app, results, size_mb=4, keystrokes=200, queries=200):
+    """Migration d'un carnet de plusieurs Mo en sections, ouverture paresseuse, indexation et recherche à la frappe."""
+    from PyQt6.QtGui import QTextCursor
+    notes = deck.notes_widget; notes.flush(); words = ["HURSTON", "ARCCORP", "MICROTECH", "CRUSADER", "LARANITE", "QUANTANIUM", "AGRICIUM", "TITANIUM"]
+    lines = [f"{words[i % 8]} -> {words[(i * 3 + 1) % 8]} {1000 + i % 9000} SCU {words[(i * 5 + 2) % 8]} @ {i % 97}.5 aUEC CONTRACT{i}\n" for i in range(4000)]
+    chunk = "".join(lines); body = "".join(f"# ROUTE LOG {n}\n" + chunk for n in range(max(1, size_mb * 1024 * 1024 // len(chunk))))
+    import shutil; shutil.rmtree(mfd.get_notes_dir(), ignore_errors=True)
+    with open(mfd.get_notes_path(), "w", encoding="utf-8") as f: f.write(body)
+    t0 = time.perf_counter(); notes.load_notes(); results[f"notes.migrate_{size_mb}mb_ms"] = (time.perf_counter() - t0) * 1000.0
+    notes.indexer.wait(); app.processEvents(); results[f"notes.index_build_{size_mb}mb_ms"] = notes.indexer.build_ms
+    opens = []
+    for _ in range(5): notes.load_notes(); opens.append(notes.load_ms); notes.indexer.wait(); app.processEvents() # Carnet déjà migré
+    summarize(f"notes.open_{size_mb}mb", opens, results)
+    typed = [q[:n] for q in ("laran", "arccorp 4200", "contract3999", "quantanium agri", "zzz") for n in range(2, len(q) + 1)]
+    cycle = iter(typed * (queries // len(typed) + 1))
+    summarize(f"notes.search_{size_mb}mb", timed(lambda: deck.notes_panel.run_search(next(cycle)), queries), results)
+    deck.notes_panel.run_search(""); notes.moveCursor(QTextCursor.MoveOperation.End)
+    summarize("notes.keystroke_section", timed(lambda: notes.insertPlainText("x"), keystrokes), results)
+    summarize("notes.snapshot_section", timed(lambda: (notes.mark_dirty(), notes.save_notes()), 10), results)
+    notes.writer.flush()
+
+def bench_history(mfd, results, days=2, reads=50):
+    """Historique disque : coût d'un ajout (avec agrégation 1 min / 10 min), lecture d'une fenêtre de graphe, empreinte."""
+    directory = os.path.join(mfd.get_data_dir(), "bench_history"); history = mfd.TelemetryHistory(directory)
+    now = time.time(); total = days * 86400; t0 = time.perf_counter()
+    for i in range(total): history.append({"ts": now - total + i, "cpu": i % 100, "ram": 40 + i % 7, "disk": 60, "swap": None if i % 50 else 5})
+    results["history.append.us_per_sample"] = (time.perf_counter() - t0) * 1e6 / total
+    for label, span in (("15m", 900), ("24h", 86400), ("7d", 7 * 86400)):
+        summarize(f"history.read_{label}", timed(lambda: history.read(now - span, now, max_points=1800), reads), results)
+    history.close()
+    results["history.disk_mb"] = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)) / 1e6
+
+def bench_touch(mfd, deck, app, results, taps=300):
+    """Deux doigts simultanés sur DECOY et NOISE (injection synthétique), puis un QTouchEvent réel envoyé au filtre."""
+    from PyQt6.QtGui import QEventPoint, QTouchEvent, QPointingDevice, QInputDevice
+    router = deck.touch_router; router.latencies_ms.clear(); router.dispatch_ms.clear(); deck.input_engine.backend = mfd.RecordingBackend()
+    decoy, noise = (next(b for b in deck.findChildren(mfd.QPushButton) if b.text().startswith(t)) for t in ("DECOY", "NOISE"))
+    P, R = QEventPoint.State.Pressed, QEventPoint.State.Released
+    summarize("touch.two_finger_tap", timed(lambda: (router.inject([(1, P, decoy), (2, P, noise)]), router.inject([(1, R, decoy), (2, R, noise)])), taps), results)
+    stats = router.latency_stats(); results["touch.latency.p50_ms"] = stats["p50_ms"]; results["touch.latency.p99_ms"] = stats["p99_ms"]
+    device = QPointingDevice("bench", 1, QInputDevice.DeviceType.TouchScreen, QPointingDevice.PointerType.Finger, QInputDevice.Capability.Position, 10, 0)
+    pos = mfd.QPointF(decoy.mapToGlobal(decoy.rect().center())); root = deck.centralWidget(); none = mfd.Qt.KeyboardModifier.NoModifier
+    def qt_tap():
+        mfd.QApplication.sendEvent(root, QTouchEvent(mfd.QEvent.Type.TouchBegin, device, none, [QEventPoint(0, P, pos, pos)]))
+        mfd.QApplication.sendEvent(root, QTouchEvent(mfd.QEvent.Type.TouchEnd, device, none, [QEventPoint(0, R, pos, pos)]))
+    summarize("touch.qtouchevent_tap", timed(qt_tap, taps), results)
+    spin(app, 100)
+
+def bench_theme(mfd, deck, app, results, toggles=200):
+    """Changement d'état (propriété + repolish d'un widget) et bascule complète de thème (feuilles déjà compilées).
+    theme.swap : palette + propriété theme + repolish des widgets des fenêtres ; la feuille n'est ni reposée ni reparsée."""
+    states = iter(range(toggles))
+    summarize("theme.status_toggle", timed(lambda: (deck.set_game_status(next(states) % 2 == 0, 1), deck.status_lbl.repaint()), toggles), results)
+    names = mfd.THEME.names() * 3; swaps = iter(names)
+    summarize("theme.swap", timed(lambda: (deck.set_theme(next(swaps)), app.processEvents()), len(names)), results)
+    deck.set_theme(mfd.DEFAULT_THEME); app.processEvents()
+
+def bench_profiles(mfd, deck, app, results, switches=200):
+    """Bascule entre profils préchauffés (pages déjà dans le QStackedWidget) et construction à froid d'une page."""
+    names = [f"SHIP{i}" for i in range(mfd.PROFILE_CACHE_MAX - 1)]
+    deck.on_profiles_loaded({n: mfd.parse_profile({"systems": mfd.DEFAULT_SYSTEM_BUTTONS[i:] + mfd.DEFAULT_SYSTEM_BUTTONS[:i]}, n) for i, n in enumerate(names)})
+    spin(app, 100); cycle = iter((names + [mfd.DEFAULT_PROFILE]) * switches)
+    stack = deck.systems_stack
+    summarize("profile.switch_warm", timed(lambda: (deck.switch_profile(next(cycle)), stack.repaint()), switches), results)
+    def cold():
+        page = deck.build_systems_page(mfd.DEFAULT_SYSTEM_BUTTONS); stack.addWidget(page); stack.setCurrentWidget(page); stack.repaint(); stack.removeWidget(page); page.deleteLater()
+    summarize("profile.switch_cold", timed(cold, 20), results)
+    deck.switch_profile(mfd.DEFAULT_PROFILE)
+
+def bench_feed(mfd, deck, results, readers=0, seconds=2.0):
+    """Flux mémoire partagée : coût d'une publication côté deck, d'une lecture côté outil ; débit avec N processus lecteurs."""
+    feed = mfd.sc_mfd_feed
+    if deck.feed is None or feed is None: return
+    snap = deck.telemetry_sampler.sample()
+    summarize("feed.publish_telemetry", timed(lambda: deck.feed.publish_telemetry(snap), 500), results)
+    summarize("feed.publish_hold", timed(lambda: deck.feed.set_hold("EJECT", 0.5), 500), results)
+    with feed.FeedReader(deck.feed.name) as reader: summarize("feed.read_decode", timed(reader.read, 500), results)
+    if readers:
+        stats = feed.run_throughput(deck.feed, readers, seconds)
+        results[f"feed.readers_{readers}.us_per_read"] = 1e6 / max(1.0, stats["reads_per_s_per_reader"]); results[f"feed.readers_{readers}.retry_ratio"] = stats["retry_ratio"]
+    deck.feed.set_hold(None)
+
+def bench_net_server(mfd, deck, app, results, clients=16, pings=50):
+    """N clients TCP concurrents + un client qui ne lit jamais : RTT de l'ack pendant que la télémétrie et le journal diffusent."""
+    import asyncio, socket
+    deck.input_engine.backend = mfd.RecordingBackend()
+    server = deck.start_mfd_server("127.0.0.1", 0); server.ready.wait(5)
+    slow = socket.create_connection(("127.0.0.1", server.port)); slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    async def client(rtts):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        for i in range(pings):
+            t0 = time.perf_counter(); writer.write(json.dumps({"t": "action", "a": "DECOY", "id": i}).encode() + b"\n"); await writer.drain()
+            while True:
+                msg = json.loads(await reader.readline())
+                if msg.get("t") == "ack" and msg.get("id") == i: break
+            rtts.append((time.perf_counter() - t0) * 1000.0); await asyncio.sleep(0.005)
+        writer.close()
+    async def load():
+        rtts = []; await asyncio.gather(*(client(rtts) for _ in range(clients))); return rtts
+    import threading
+    out = {}; worker = threading.Thread(target=lambda: out.setdefault("rtts", asyncio.run(load()))); worker.start()
+    snap = deck.telemetry_sampler.sample(); i = 0
+    while worker.is_alive():
+        snap["cpu"] = (i * 7) % 100; i += 1; deck.apply_telemetry_snapshot(snap); deck.add_log_entry(f"NET BENCH {i}"); spin(app, 2)
+    summarize(f"net.ack_rtt_{clients}c", out["rtts"], results)
+    results["net.slow_client_dropped_logs"] = sum(c.dropped for c in server.clients)
+    slow.close(); server.stop(); deck.mfd_server = None
+
+def run_all(net_clients=0, feed_readers=0):
+    data_dir = tempfile.mkdtemp(prefix="sc_mfd_bench_")
+    mfd = load_deck_module(data_dir)
+    mfd.DEFAULT_CONFIG["RSS_FEED_URL"] = "http://127.0.0.1:9/" # Pas de réseau pendant les mesures
+    app = mfd.QApplication.instance() or mfd.QApplication(sys.argv[:1])
+    results = {}
+    bench_construction(mfd, app, results)
+    deck = mfd.SC_ControlDeck(); deck.build_all_panels(); deck.show(); spin(app, 300)
+    for job in ("telemetry", "ambient_log", "throttle"): deck.scheduler.cancel(job) # Pas de bruit de fond pendant les mesures
+    bench_action_overlay(mfd, deck, results)
+    bench_system_overlay(mfd, deck, results)
+    bench_telemetry(deck, results)
+    bench_send_action(mfd, deck, app, results)
+    bench_macros(mfd, deck, app, results)
+    bench_config(mfd, deck, results)
+    bench_journal(mfd, deck, app, results)
+    bench_notes(mfd, deck, app, results)
+    bench_history(mfd, results)
+    bench_touch(mfd, deck, app, results)
+    bench_theme(mfd, deck, app, results)
+    bench_profiles(mfd, deck, app, results)
+    bench_log(deck, app, results)
+    bench_feed(mfd, deck, results, feed_readers)
+    if net_clients: bench_net_server(mfd, deck, app, results, clients=net_clients)
+    deck.shutdown_services()
+    from PyQt6.QtCore import QT_VERSION_STR
+    meta = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(), "platform": platform.platform(), "qt": QT_VERSION_STR}
+    return {"meta": meta, "results": results}
+
+# --- REJEU D'UN JOURNAL DE SESSION ---
+def replay_journal(mfd, deck, app, path, speed=1.0):
+    """Réinjecte entrées et télémétrie du journal dans le deck ; speed=0 : aussi vite que possible.
+    Seuls les horodatages du journal sont accélérés : les macros gardent leur durée réelle dans le deck."""
+    records = list(mfd.read_journal(path)); events = [r for r in records if r[1] in (mfd.J_INPUT, mfd.J_TELEMETRY)]
+    stats = {"records": len(records), "replayed": len(events), "duration_s": 0.0, "lag_p50_ms": 0.0, "lag_p99_ms": 0.0,
+             "keys_journal": [v[1] for _, k, v in records if k == mfd.J_KEY]}
+    if not events: return stats
+    first = events[0][0]; t0 = time.perf_counter(); lags = []
+    for ts, kind, value in events:
+        due = t0 + (ts - first) / speed if speed > 0 else time.perf_counter()
+        while time.perf_counter() < due: app.processEvents(); time.sleep(min(0.001, max(0.0, due - time.perf_counter())))
+        lags.append((time.perf_counter() - due) * 1000.0); deck.replay_record(kind, value)
+        if speed <= 0: app.processEvents()
+    stats["duration_s"] = time.perf_counter() - t0
+    stats["lag_p50_ms"] = mfd.percentile(lags, 50); stats["lag_p99_ms"] = mfd.percentile(lags, 99)
+    return stats
+
+def run_replay(path, speed):
+    data_dir = tempfile.mkdtemp(prefix="sc_mfd_replay_")
+    mfd = load_deck_module(data_dir)
+    mfd.DEFAULT_CONFIG["RSS_FEED_URL"] = "http://127.0.0.1:9/"
+    app = mfd.QApplication.instance() or mfd.QApplication(sys.argv[:1])
+    deck = mfd.SC_ControlDeck(); deck.build_all_panels(); deck.show(); spin(app, 300)
+    for job in ("telemetry", "ambient_log", "throttle"): deck.scheduler.cancel(job)
+    deck.telemetry_sampler.stop() # Seule la télémétrie du journal doit arriver au deck
+    backend = deck.input_engine.backend = mfd.RecordingBackend()
+    if speed > 0: deck.config["HOLD_DURATIONS"] = {mode: float(s) / speed for mode, s in deck.config.get("HOLD_DURATIONS", {}).items()} # Un maintien déclenché à l'origine doit l'être au rejeu
+    stats = replay_journal(mfd, deck, app, path, speed)
+    spin(app, 500 + int(max(mfd.AUTO_LAND_HOLD_S, *deck.config.get("HOLD_DURATIONS", {"": 2.0}).values()) * 1000)) # Fin des maintiens et macros
+    deck.journal.flush(); replayed_keys = [v[1] for _, k, v in mfd.read_journal(deck.journal.path) if k == mfd.J_KEY]
+    deck.shutdown_services()
+    expected = stats.pop("keys_journal")
+    divergence = next((i for i, (a, b) in enumerate(zip(expected, replayed_keys)) if a != b), None if len(expected) == len(replayed_keys) else min(len(expected), len(replayed_keys)))
+    stats.update({"keys_expected": len(expected), "keys_replayed": len(replayed_keys), "key_events": len(backend.events), "first_divergence": divergence})
+    return stats
+
+# --- COMPARAISON ---
+NOISE_FLOOR_MS = 0.25 # En dessous, les écarts relatifs ne veulent rien dire
+
+def compare(current, baseline, threshold):
+    """Liste (métrique, base, actuel, ratio) des régressions au-delà du seuil relatif."""
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        cur = current["results"].get(name)
+        if cur is None or not base: continue
+        if cur > base * (1.0 + threshold) and cur - base > NOISE_FLOOR_MS: regressions.append((name, base, cur, cur / base))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SC MFD headless benchmarks")
+    parser.add_argument("--output", default="bench_results.json", help="fichier JSON de résultats")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON de référence à comparer")
+    parser.add_argument("--net-clients", type=int, default=0, help="clients simulés pour le serveur réseau (0 = ignoré)")
+    parser.add_argument("--feed-readers", type=int, default=0, help="processus lecteurs du flux mémoire partagée (0 = ignoré)")
+    parser.add_argument("--threshold", type=float, default=0.15, help="régression si > base * (1 + seuil)")
+    parser.add_argument("--replay", metavar="JOURNAL", help="rejoue un journal de session (.jnl ou .jnl.gz) au lieu des bancs")
+    parser.add_argument("--speed", type=float, default=1.0, help="facteur d'accélération du rejeu (0 = aussi vite que possible)")
+    args = parser.parse_args(argv)
+    if args.replay:
+        stats = run_replay(args.replay, args.speed)
+        for name, value in stats.items(): print(f"{name:<20}  {value}")
+        return 0 if stats["first_divergence"] is None else 1
+    report = run_all(args.net_clients, args.feed_readers)
+    with open(args.output, "w") as f: json.dump(report, f, indent=2, sort_keys=True)
+    width = max(len(k) for k in report["results"])
+    for name, value in sorted(report["results"].items()): print(f"{name:<{width}}  {value:12.4f}")
+    if args.compare:
+        with open(args.compare) as f: baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, base, cur, ratio in regressions: print(f"REGRESSION {name}: {base:.4f} -> {cur:.4f} (x{ratio:.2f})")
+        if regressions: return 1
+        print("NO REGRESSION")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,49 @@
+import time
+_T_PROCESS_START = time.perf_counter()
 import sys
-import psutil
+import math
 import json
 import os
 import random
-import time
-import urllib.request
-import shutil  # Pour déplacer les fichiers
-import xml.etree.ElementTree as ET
+import threading
+import heapq
+import itertools
+import shutil
+import types
+import queue
+import traceback
+import struct
+from collections import deque, OrderedDict
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QPushButton, QGridLayout, 
                              QWidget, QLabel, QVBoxLayout, QFrame, QHBoxLayout, 
                              QDialog, QScrollArea, QProgressBar, QTextEdit, QComboBox,
-                             QLineEdit, QFileDialog, QMessageBox) # Nouveaux widgets
-from PyQt6.QtCore import Qt, QTimer, QTime, QRectF, QEvent, QPointF, QRect, QThread, pyqtSignal
-from PyQt6.QtGui import QColor, QPalette, QBrush, QPainter, QPen, QPainterPath, QLinearGradient, QPolygonF, QFont, QRadialGradient
-from pynput.keyboard import Controller, Key
+                             QLineEdit, QFileDialog, QMessageBox, QListView, QCheckBox, QStackedWidget, QListWidget, QListWidgetItem, QAbstractButton) # Nouveaux widgets
+from PyQt6.QtCore import Qt, QTimer, QTime, QRectF, QEvent, QPointF, QRect, QThread, pyqtSignal, QAbstractListModel, QModelIndex, QObject
+from PyQt6.QtGui import QColor, QPalette, QBrush, QPainter, QPen, QPainterPath, QLinearGradient, QPolygonF, QFont, QRadialGradient, QPixmap, QRegion, QTransform, QShortcut, QKeySequence, QEventPoint
+# Modules lourds (psutil, pynput, urllib, ElementTree) importés au premier usage : démarrage plus rapide
+try: import sc_mfd_feed # Flux local pour outils externes (fichier voisin, bibliothèque standard seulement)
+except ImportError: sc_mfd_feed = None
+
+# --- PROFILAGE DU DEMARRAGE (--profile-startup) ---
+class StartupProfiler:
+    """Chronologie du démarrage : une marque par phase, temps jusqu'à la première image."""
+    def __init__(self, enabled=False, t0=_T_PROCESS_START):
+        self.enabled = enabled; self.t0 = t0; self._last = t0; self.phases = []; self.first_frame_ms = None; self.ready_ms = None
+    def mark(self, phase):
+        now = time.perf_counter(); self.phases.append((phase, (now - self._last) * 1000.0)); self._last = now
+    def since_start_ms(self): return (time.perf_counter() - self.t0) * 1000.0
+    def first_frame(self):
+        if self.first_frame_ms is None: self.first_frame_ms = self.since_start_ms(); self.mark("first_frame")
+    def ready(self):
+        if self.ready_ms is None: self.ready_ms = self.since_start_ms()
+    def as_dict(self): return {"phases_ms": dict(self.phases), "time_to_first_frame_ms": self.first_frame_ms, "time_to_ready_ms": self.ready_ms}
+    def report(self):
+        lines = ["--- STARTUP PROFILE ---"] + [f"  {name:<22}{ms:9.1f} ms" for name, ms in self.phases]
+        lines += [f"  {'TIME TO FIRST FRAME':<22}{self.first_frame_ms or 0.0:9.1f} ms", f"  {'TIME TO READY':<22}{self.ready_ms or 0.0:9.1f} ms"]
+        return "\n".join(lines)
+
+STARTUP_TRACE = StartupProfiler("--profile-startup" in sys.argv)
+STARTUP_TRACE.mark("imports")
 
 # --- GESTION DES CHEMINS (PATH SYSTEM) ---
 APP_NAME = "RSI_MFD"
@@ -70,15 +100,21 @@ def update_location_map(new_path):
             json.dump({"data_path": new_path}, f)
     except Exception as e: print(f"Error updating map: {e}")
 
-# Initialisation globale du chemin
-CURRENT_DATA_DIR = ensure_initial_setup()
+# Initialisation globale du chemin (au premier accès, plus à l'import)
+CURRENT_DATA_DIR = None
+
+def get_data_dir():
+    global CURRENT_DATA_DIR
+    if CURRENT_DATA_DIR is None: CURRENT_DATA_DIR = ensure_initial_setup()
+    return CURRENT_DATA_DIR
 
 # --- CONFIGURATION FICHIER ---
-def get_config_path(): return os.path.join(CURRENT_DATA_DIR, CONFIG_FILENAME)
-def get_notes_path(): return os.path.join(CURRENT_DATA_DIR, NOTES_FILENAME)
+def get_config_path(): return os.path.join(get_data_dir(), CONFIG_FILENAME)
+def get_notes_path(): return os.path.join(get_data_dir(), NOTES_FILENAME)
 
-DEFAULT_CONFIG = {
-    "TARGET_SCREEN_INDEX": 1,
+CONFIG_VERSION = 2
+
+DEFAULT_BINDINGS = { # Action -> spec de binding (voir COMPILATEUR DE BINDINGS)
     "WEAPON_POWER": "f5", "ENGINE_POWER": "f6", "SHIELD_POWER": "f7", "POWER_RESET": "f8",
     "SHIELD_FWD": "up", "SHIELD_BACK": "down", "SHIELD_LEFT": "left", "SHIELD_RIGHT": "right", "SHIELD_RESET": "insert",
     "LANDING": "n", "QUANTUM": "b", "ENGINES": "i", 
@@ -86,9 +122,28 @@ DEFAULT_CONFIG = {
     "FLIGHT_READY": "r", "EXIT_SEAT": "y",
     "SPACE_BRAKE": "x", "DECOUPLED": "c", "VTOL": "k",
     "DECOY": "h", "NOISE": "j",
-    "ATC_KEY_BASE": "n"
+    "ATC_KEY_BASE": "alt+n@0.1",
 }
 
+DEFAULT_SETTINGS = { # Tout ce qui n'est pas un binding ; une nouvelle option se déclare ici et n'est jamais prise pour une touche
+    "CONFIG_VERSION": CONFIG_VERSION,
+    "TARGET_SCREEN_INDEX": 1,
+    "HOLD_DURATIONS": {"EJECT": 2.0, "AUTOLAND": 2.0}, # Secondes de maintien avant déclenchement
+    "RSS_FEED_URL": "https://leonick.se/feeds/rsi/atom",
+    "PERF_HUD": False,
+    "STALL_WATCHDOG_MS": 50, # Seuil de blocage de la boucle GUI (0 = désactivé)
+    "NET_SERVER_PORT": 0, # 0 = serveur réseau désactivé
+    "NET_SERVER_HOST": "127.0.0.1", # Loopback par défaut ; une autre adresse exige un jeton (généré s'il est vide)
+    "NET_SERVER_TOKEN": "",
+    "THEME": "CONSTELLATION", # CONSTELLATION / NIGHT_VISION / HIGH_CONTRAST
+    "ACTIVE_PROFILE": "DEFAULT",
+    "FEED_SHM": True, # Instantané en mémoire partagée pour les outils locaux (sc_mfd_feed.py)
+    "FEED_SOCKET": "", # Chemin du socket Unix du flux de changements ("" = désactivé)
+    "SESSION_JOURNAL": True # Journal de session rejouable dans <dossier de données>/journal
+}
+
+DEFAULT_CONFIG = {**DEFAULT_SETTINGS, **DEFAULT_BINDINGS}
+
 SCI_FI_LOGS = [
     "Scanning local grid...", "Quantum fuel injection: NOMINAL", "Shield harmonics: 98%",
     "Coolant pressure: STABLE", "Incoming transmission blocked", "UEE Signature verified",
@@ -103,94 +158,1515 @@ BOOT_SEQUENCE_LOGS = [
     "CALIBRATING TOUCH SENSORS...", "SYSTEM READY."
 ]
 
-def load_config():
-    path = get_config_path()
-    if os.path.exists(path):
+# --- CONFIG : VERSIONS, MIGRATIONS, ECRITURE ATOMIQUE, RECHARGEMENT A CHAUD ---
+# Fichier sans "CONFIG_VERSION" = version 1. Chaque migration fait passer de la version N à N+1.
+CONFIG_WATCH_MS = 1000 # Scrutation du fichier (un stat ; relecture seulement si mtime/taille/inode bougent)
+
+def _migrate_config_v1(conf):
+    """v1 -> v2 : ATC_KEY_BASE était la touche seule, Alt et le maintien de 0,1 s étaient codés en dur."""
+    atc = conf.get("ATC_KEY_BASE")
+    if isinstance(atc, str) and "+" not in atc and "@" not in atc: conf["ATC_KEY_BASE"] = f"alt+{atc}@0.1"
+    return conf
+
+CONFIG_MIGRATIONS = {1: _migrate_config_v1}
+
+def migrate_config(conf):
+    """Applique les migrations dans l'ordre ; ValueError si le fichier vient d'une version plus récente."""
+    version = conf.get("CONFIG_VERSION", 1)
+    if not isinstance(version, int) or not 1 <= version <= CONFIG_VERSION: raise ValueError(f"unsupported config version {version!r}")
+    while version < CONFIG_VERSION: conf = CONFIG_MIGRATIONS[version](conf); version += 1; conf["CONFIG_VERSION"] = version
+    return conf
+
+def decode_config(text):
+    """Texte JSON -> dict tel qu'écrit sur disque ; ValueError si invalide."""
+    try: conf = json.loads(text)
+    except json.JSONDecodeError as e: raise ValueError(f"invalid JSON: {e}")
+    if not isinstance(conf, dict): raise ValueError("config must be a JSON object")
+    return conf
+
+def complete_config(conf):
+    """Dict décodé -> config complète (migrée, clés manquantes reprises de DEFAULT_CONFIG) ; ValueError si version inconnue."""
+    conf = migrate_config(conf)
+    for k, v in DEFAULT_CONFIG.items(): conf.setdefault(k, v)
+    return conf
+
+def parse_config(text): return complete_config(decode_config(text))
+
+def config_digest(text):
+    import hashlib
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+class ConfigFile:
+    """sc_mfd_config.json : écriture temporaire + rename, et détection des éditions externes (mtime/taille puis empreinte du contenu)."""
+    def __init__(self, path=None): self._path = path; self._stat = None; self._digest = None; self.last_error = None
+    @property
+    def path(self): return self._path or get_config_path() # Suit un changement de dossier de données
+    def _stat_of(self):
+        try: st = os.stat(self.path); return (st.st_mtime_ns, st.st_size, st.st_ino) # Inode : chaque écriture atomique en crée un nouveau
+        except OSError: return None
+    def load(self):
+        path = self.path
+        if not os.path.exists(path): return json.loads(json.dumps(DEFAULT_CONFIG))
         try:
-            with open(path, 'r') as f: 
-                conf = json.load(f)
-                for k, v in DEFAULT_CONFIG.items():
-                    if k not in conf: conf[k] = v
-                return conf
-        except: return DEFAULT_CONFIG.copy()
-    return DEFAULT_CONFIG.copy()
+            with open(path, "r", encoding="utf-8") as f: text = f.read()
+            raw = decode_config(text); version = raw.get("CONFIG_VERSION"); conf = complete_config(raw) # Un seul décodage ; version lue avant migration
+        except (OSError, ValueError) as e:
+            print(f"Config Error: {e}"); self.last_error = str(e)
+            try: shutil.copy2(path, path + ".bad") # Garder le fichier illisible avant qu'une sauvegarde ne l'écrase
+            except OSError: pass
+            return json.loads(json.dumps(DEFAULT_CONFIG))
+        if version != CONFIG_VERSION: self.save(conf) # Migré : on réécrit au nouveau format
+        else: self._stat = self._stat_of(); self._digest = config_digest(text)
+        return conf
+    def save(self, config):
+        config["CONFIG_VERSION"] = CONFIG_VERSION; text = json.dumps(config, indent=4)
+        try: atomic_write_text(self.path, text)
+        except OSError as e: print(f"Config Error: {e}"); return False
+        self._stat = self._stat_of(); self._digest = config_digest(text)
+        return True
+    def poll(self):
+        """Nouvelle config si le fichier a été modifié de l'extérieur (et reste valide), sinon None."""
+        st = self._stat_of()
+        if st is None or st == self._stat: return None
+        self._stat = st
+        try:
+            with open(self.path, "r", encoding="utf-8") as f: text = f.read()
+        except OSError as e: print(f"Config Error: {e}"); return None
+        digest = config_digest(text)
+        if digest == self._digest: return None # Simple touch, ou notre propre écriture
+        self._digest = digest
+        try: conf = parse_config(text)
+        except ValueError as e: print(f"Config Error: {e}"); self.last_error = str(e); return None # On garde la config en cours ; la prochaine édition valide sera prise
+        self.last_error = None
+        return conf
 
-def save_config(config):
-    with open(get_config_path(), 'w') as f: json.dump(config, f, indent=4)
+def load_config(): return ConfigFile().load()
+def save_config(config): return ConfigFile().save(config)
+
+def atomic_write_text(path, text, encoding='utf-8', fsync=True):
+    """Écrit un fichier via fichier temporaire + rename (jamais de fichier à moitié écrit)."""
+    import tempfile
+    folder = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(text); f.flush()
+            if fsync: os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
 
 def get_key_object(key_str):
+    from pynput.keyboard import Key
     try:
         if len(key_str) == 1: return key_str
         return getattr(Key, key_str)
     except AttributeError: return key_str
 
+# --- COMPILATEUR DE BINDINGS ---
+# Syntaxe : "k" touche simple, "alt+n" accord, "f5 f6" séquence, "n@3" maintien de 3 s
+MODIFIER_KEYS = {"alt": "alt_l", "ctrl": "ctrl_l", "shift": "shift", "win": "cmd"}
+NON_BINDING_KEYS = frozenset(DEFAULT_SETTINGS)
+SEQUENCE_GAP_S = 0.05 # Pause entre deux accords d'une séquence
+AUTO_LAND_HOLD_S = 3.0
+
+def resolve_key(name):
+    """Nom de touche -> objet pynput ; ValueError si inconnu."""
+    if name in MODIFIER_KEYS: name = MODIFIER_KEYS[name]
+    k = get_key_object(name)
+    if isinstance(k, str) and len(k) != 1: raise ValueError(f"unknown key '{name}'")
+    return k
+
+def parse_binding(spec):
+    """Découpe une spec en accords (modificateurs, touche, maintien en s)."""
+    chords = []
+    for token in str(spec).lower().split():
+        hold = 0.0
+        if "@" in token and len(token) > 1:
+            token, hold_str = token.rsplit("@", 1)
+            try: hold = float(hold_str.rstrip("s"))
+            except ValueError: raise ValueError(f"bad hold duration '{hold_str}'")
+        parts = [token] if token == "+" else token.split("+")
+        if not all(parts): raise ValueError(f"bad chord '{token}'")
+        mods, key = parts[:-1], parts[-1]
+        for mod in mods:
+            if mod not in MODIFIER_KEYS: raise ValueError(f"unknown modifier '{mod}'")
+        chords.append((tuple(mods), key, hold))
+    if not chords: raise ValueError("empty binding")
+    return tuple(chords)
+
+class Binding:
+    """Binding compilé : étapes (décalage, op, touche) prêtes pour l'InputDispatcher."""
+    __slots__ = ("action", "spec", "chords", "signature", "steps", "press_steps", "release_steps")
+    def __init__(self, action, spec):
+        self.action = action; self.spec = spec; self.chords = parse_binding(spec)
+        self.signature = tuple((tuple(sorted(mods)), key) for mods, key, _ in self.chords)
+        steps = []; presses = []; t = 0.0
+        for mods, key, hold in self.chords:
+            keys = [resolve_key(m) for m in mods] + [resolve_key(key)]
+            steps += [(t, "press", k) for k in keys] + [(t + hold, "release", k) for k in reversed(keys)]
+            presses += keys; t += hold + SEQUENCE_GAP_S
+        self.steps = tuple(steps)
+        self.press_steps = tuple((0.0, "press", k) for k in presses)
+        self.release_steps = tuple((0.0, "release", k) for k in reversed(presses))
+    def hold_steps(self, hold_s):
+        """Tout enfoncer, tout relâcher après hold_s (ex. maintien auto-land)."""
+        return self.press_steps + tuple((hold_s, op, k) for _, op, k in self.release_steps)
+
+class BindingTable:
+    """Table immuable action -> Binding, compilée une fois par chargement/sauvegarde de la config."""
+    def __init__(self, table, conflicts, errors):
+        self._table = types.MappingProxyType(table); self.conflicts = conflicts; self.errors = errors
+    def get(self, action): return self._table.get(action)
+    def __contains__(self, action): return action in self._table
+    def __len__(self): return len(self._table)
+    def __iter__(self): return iter(self._table)
+    def describe_problems(self):
+        lines = [f"CONFLICT: {' / '.join(actions)} -> {self._table[actions[0]].spec.upper()}" for actions in self.conflicts.values()]
+        return lines + [f"INVALID: {action} ({err})" for action, err in self.errors.items()]
+
+def compile_bindings(config, previous=None):
+    """previous : table précédente dont on réutilise les Binding inchangés (rechargement à chaud)."""
+    table = {}; errors = {}; by_signature = {}
+    for action, spec in config.items():
+        if action in NON_BINDING_KEYS or not isinstance(spec, str): continue
+        b = previous.get(action) if previous is not None else None
+        if b is None or b.spec != spec:
+            try: b = Binding(action, spec)
+            except ValueError as e: errors[action] = str(e); continue
+        table[action] = b; by_signature.setdefault(b.signature, []).append(action)
+    conflicts = {sig: actions for sig, actions in by_signature.items() if len(actions) > 1}
+    return BindingTable(table, conflicts, errors)
+
+def percentile(values, pct):
+    """Percentile par rang le plus proche (values n'a pas besoin d'être trié)."""
+    if not values: return 0.0
+    ordered = sorted(values); idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+# --- MACROS (SEQUENCES TEMPORISEES) ---
+# <dossier de données>/sc_mfd_macros.json, à côté de sc_mfd_config.json :
+#   {"SALVO": {"steps": ["DECOY", {"wait": 0.2}, "DECOY", {"hold": "NOISE", "for": 1.5}, "alt+n"], "log": "DEFENSE: SALVO", "gap": 0.08}}
+# Étape : nom d'action (binding courant du profil) ou spec de binding ("alt+n", "f5 f6", "n@3") ;
+#   {"wait": s} pause, {"hold": x, "for": s} maintien, {"press": x} / {"release": x} accord gardé enfoncé entre plusieurs étapes.
+# "gap" : pause après chaque étape touche (SEQUENCE_GAP_S par défaut) ; "log" / "done" : lignes de journal au départ / à la fin.
+MACROS_FILENAME = "sc_mfd_macros.json"
+MACRO_TIMING_FILENAME = "sc_mfd_macro_timing.json"
+MACRO_JITTER_SAMPLES = 200 # Retards mesurés gardés par étape
+DEFAULT_MACROS = { # Procédures intégrées ; un fichier utilisateur peut les redéfinir sous le même nom
+    "POWER_DEC_WEAPONS": {"steps": ["SHIELD_POWER", "ENGINE_POWER"]},
+    "POWER_DEC_SHIELDS": {"steps": ["WEAPON_POWER", "ENGINE_POWER"]},
+    "POWER_DEC_ENGINES": {"steps": ["WEAPON_POWER", "SHIELD_POWER"]},
+    "CALL_ATC": {"steps": ["ATC_KEY_BASE"], "log": "COMMS: HAILING LANDING SERVICES...", "done": "COMMS: REQUEST SENT"},
+    "AUTOLAND": {"steps": [{"hold": "LANDING", "for": AUTO_LAND_HOLD_S}], "log": "FLIGHT: AUTO-LAND ENGAGED", "done": "FLIGHT: AUTO-LAND SIGNAL COMPLETE"},
+}
+
+def get_macros_path(): return os.path.join(get_data_dir(), MACROS_FILENAME)
+
+def load_macros(path=None):
+    """Macros intégrées + fichier utilisateur. Retourne (macros, erreurs par nom)."""
+    macros = {name: dict(spec) for name, spec in DEFAULT_MACROS.items()}; errors = {}
+    path = path or get_macros_path()
+    if not os.path.exists(path): return macros, errors
+    try:
+        with open(path, "r", encoding="utf-8") as f: data = json.load(f)
+        if not isinstance(data, dict): raise ValueError("macros file must be a JSON object")
+    except Exception as e: print(f"Macros Error: {e}"); return macros, {MACROS_FILENAME: str(e)}
+    for name, spec in data.items():
+        if isinstance(spec, list): spec = {"steps": spec}
+        if not isinstance(spec, dict) or not isinstance(spec.get("steps"), list): errors[str(name).upper()] = "missing steps list"; continue
+        macros[str(name).upper()] = spec
+    return macros, errors
+
+def _macro_binding(ref, bindings):
+    if not isinstance(ref, str): raise ValueError(f"bad step {ref!r}")
+    b = bindings.get(ref)
+    return b if b is not None else Binding(None, ref)
+
+def compile_macro(spec, bindings):
+    """Macro -> étapes (décalage absolu, op, touche) pour l'InputDispatcher ; ValueError avec le numéro de l'étape fautive."""
+    try: gap = max(0.0, float(spec.get("gap", SEQUENCE_GAP_S)))
+    except (TypeError, ValueError): raise ValueError("bad gap")
+    steps = []; down = []; t = 0.0
+    for i, step in enumerate(spec["steps"]):
+        try:
+            if isinstance(step, dict) and "wait" in step: t += max(0.0, float(step["wait"])); continue
+            if isinstance(step, dict) and "hold" in step:
+                hold = max(0.0, float(step.get("for", 0.0))); steps += [(t + dt, op, k) for dt, op, k in _macro_binding(step["hold"], bindings).hold_steps(hold)]; t += hold
+            elif isinstance(step, dict) and "press" in step:
+                b = _macro_binding(step["press"], bindings); steps += [(t, op, k) for _, op, k in b.press_steps]; down += [k for _, _, k in b.press_steps]
+            elif isinstance(step, dict) and "release" in step:
+                for _, op, k in _macro_binding(step["release"], bindings).release_steps:
+                    if k not in down: raise ValueError(f"release of '{k}' without press")
+                    down.remove(k); steps.append((t, op, k))
+            else:
+                b = _macro_binding(step, bindings); steps += [(t + dt, op, k) for dt, op, k in b.steps]; t += max(dt for dt, _, _ in b.steps)
+        except (TypeError, ValueError) as e: raise ValueError(f"step {i + 1}: {e}")
+        t += gap
+    steps += [(t, "release", k) for k in reversed(down)] # Jamais de touche laissée enfoncée en fin de macro
+    if not steps: raise ValueError("no key steps")
+    return tuple(steps)
+
+class MacroTimings:
+    """Retard réel - prévu de chaque étape, par macro : sert à régler les pauses que le jeu enregistre à coup sûr."""
+    def __init__(self): self.layouts = {}; self.samples = {}; self.runs = {}; self.cancelled = {}
+    def record(self, name, cmd):
+        if cmd.cancelled: self.cancelled[name] = self.cancelled.get(name, 0) + 1; return
+        if self.layouts.get(name) != cmd.steps: self.layouts[name] = cmd.steps; self.samples[name] = [deque(maxlen=MACRO_JITTER_SAMPLES) for _ in cmd.steps] # Macro recompilée : on repart de zéro
+        for q, j in zip(self.samples[name], cmd.jitter_ms):
+            if j is not None: q.append(j)
+        self.runs[name] = self.runs.get(name, 0) + 1
+    def stats(self):
+        out = {}
+        for name in sorted(set(self.runs) | set(self.cancelled)):
+            per_step = self.samples.get(name, []); vals = [j for q in per_step for j in q]
+            out[name] = {"runs": self.runs.get(name, 0), "cancelled": self.cancelled.get(name, 0), "p50_ms": percentile(vals, 50), "p99_ms": percentile(vals, 99), "max_ms": max(vals) if vals else 0.0,
+                         "steps": [{"at_s": round(at, 4), "op": op, "key": str(k).replace("Key.", ""), "p50_ms": percentile(list(q), 50), "p99_ms": percentile(list(q), 99), "max_ms": max(q) if q else 0.0} for (at, op, k), q in zip(self.layouts.get(name, ()), per_step)]}
+        return out
+    def save(self, path=None):
+        if not self.runs and not self.cancelled: return
+        try: atomic_write_text(path or os.path.join(get_data_dir(), MACRO_TIMING_FILENAME), json.dumps(self.stats(), indent=2), fsync=False)
+        except Exception as e: print(f"Macro Timing Error: {e}")
+
+# --- PROFILS DE VAISSEAUX (DISPOSITION + BINDINGS PAR VAISSEAU) ---
+# <dossier de données>/profiles/<NOM>.json :
+#   {"name": "CUTLASS", "systems": [["FLIGHT READY", "FLIGHT_READY", true], ...], "bindings": {"VTOL": "k"}}
+# "systems" : boutons du panneau FLIGHT SYSTEMS (libellé, action, bascule) ; "bindings" : surcharge de la config globale.
+PROFILES_DIRNAME = "profiles"
+DEFAULT_PROFILE = "DEFAULT"
+PROFILE_CACHE_MAX = 4 # Panneaux gardés construits (LRU) ; le profil actif n'est jamais évincé
+DEFAULT_SYSTEM_BUTTONS = [
+    ("FLIGHT READY", "FLIGHT_READY", True), ("ENGINES", "ENGINES", True), ("QUANTUM", "QUANTUM", True), ("SCAN MODE", "SCAN", False),
+    ("LANDING GEAR", "LANDING", True), ("DOORS", "DOORS", True), ("LIGHTS", "LIGHTS", True), ("SPACE BRAKE", "SPACE_BRAKE", False),
+    ("DECOUPLED", "DECOUPLED", True), ("VTOL MODE", "VTOL", True)
+]
+
+def get_profiles_dir(): return os.path.join(get_data_dir(), PROFILES_DIRNAME)
+def default_profile(): return {"name": DEFAULT_PROFILE, "systems": list(DEFAULT_SYSTEM_BUTTONS), "bindings": {}}
+
+def parse_profile(data, fallback_name):
+    """Valide un profil ; lève ValueError avec un message lisible."""
+    if not isinstance(data, dict): raise ValueError("profile must be a JSON object")
+    name = str(data.get("name") or fallback_name).upper()
+    systems = []
+    for entry in data.get("systems", DEFAULT_SYSTEM_BUTTONS):
+        if not isinstance(entry, (list, tuple)) or len(entry) not in (2, 3): raise ValueError(f"bad systems entry {entry!r}")
+        systems.append((str(entry[0]), str(entry[1]), bool(entry[2]) if len(entry) == 3 else True))
+    bindings = data.get("bindings", {})
+    if not isinstance(bindings, dict) or not all(isinstance(v, str) for v in bindings.values()): raise ValueError("bindings must map actions to key specs")
+    return {"name": name, "systems": systems, "bindings": dict(bindings)}
+
+def load_profile_files(directory=None):
+    directory = directory or get_profiles_dir(); profiles = {}
+    try: names = sorted(f for f in os.listdir(directory) if f.lower().endswith(".json"))
+    except OSError: return profiles
+    for filename in names:
+        try:
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f: profile = parse_profile(json.load(f), os.path.splitext(filename)[0])
+            profiles[profile["name"]] = profile
+        except Exception as e: print(f"Profile Error ({filename}): {e}")
+    return profiles
+
+class ProfileLoader(QThread):
+    """Lecture et validation des fichiers de profils hors du thread GUI."""
+    profiles_loaded = pyqtSignal(dict)
+    def run(self): self.profiles_loaded.emit(load_profile_files())
+
+# --- MOTEUR D'INJECTION CLAVIER (THREAD DEDIE) ---
+def ctypes_winmm(fn, period_ms=1):
+    try:
+        import ctypes
+        getattr(ctypes.windll.winmm, fn)(period_ms)
+    except Exception as e: print(f"Timer resolution error: {e}")
+
+class PynputBackend:
+    """Backend réel : clavier système via pynput."""
+    def __init__(self):
+        from pynput.keyboard import Controller
+        self.controller = Controller()
+    def press(self, key): self.controller.press(key)
+    def release(self, key): self.controller.release(key)
+
+class RecordingBackend:
+    """Backend de test : enregistre (horodatage, op, touche) sans toucher au clavier."""
+    def __init__(self): self.events = []; self._lock = threading.Lock()
+    def press(self, key):
+        with self._lock: self.events.append((time.perf_counter(), "press", key))
+    def release(self, key):
+        with self._lock: self.events.append((time.perf_counter(), "release", key))
+
+class KeyCommand:
+    """Une commande = des étapes (décalage en s, "press"/"release", touche) + horodatages perf_counter. L'ordre est rétabli par le tas du dispatcher."""
+    __slots__ = ("label", "steps", "on_done", "t_enqueue", "t_dispatch", "t_done", "remaining", "cancelled", "down", "jitter_ms")
+    def __init__(self, label, steps, on_done=None, t_enqueue=None):
+        self.label = label; self.steps = steps; self.on_done = on_done
+        self.t_enqueue = t_enqueue if t_enqueue is not None else time.perf_counter(); self.t_dispatch = None; self.t_done = None; self.remaining = len(self.steps)
+        self.cancelled = False; self.down = {}; self.jitter_ms = [None] * len(self.steps) # Retard réel de chaque étape sur son échéance
+    def latency_ms(self): return (self.t_dispatch - self.t_enqueue) * 1000.0 if self.t_dispatch is not None else None
+
+class _CancelCommand:
+    __slots__ = ("cmd",)
+    def __init__(self, cmd): self.cmd = cmd
+
+DISPATCH_SPIN_S = 0.0015 # Dernière 1,5 ms avant une échéance : on cède la main au lieu de dormir (granularité des timeouts OS)
+
+class InputDispatcher(QThread):
+    """Injecte les touches depuis une file ; les maintiens temporisés sont planifiés, jamais des sleep."""
+    command_finished = pyqtSignal(object)
+    def __init__(self, backend=None, history_size=1000, parent=None):
+        super().__init__(parent)
+        self.backend = backend if backend is not None else PynputBackend()
+        self._queue = queue.SimpleQueue(); self._held = {}; self._seq = 0
+        self.latencies_ms = deque(maxlen=history_size); self.jitter_ms = deque(maxlen=history_size); self.completed = 0; self.cancelled = 0
+        self.command_finished.connect(self._run_callback)
+
+    # API appelée depuis le thread GUI (ne bloque jamais)
+    def submit(self, command): self._queue.put(command); return command
+    def tap(self, key, hold_s=0.0, label=None, on_done=None, t_enqueue=None):
+        return self.submit(KeyCommand(label or str(key), [(0.0, "press", key), (hold_s, "release", key)], on_done, t_enqueue))
+    def send(self, label, steps, on_done=None, t_enqueue=None): return self.submit(KeyCommand(label, steps, on_done, t_enqueue))
+    def press(self, key, label=None): return self.submit(KeyCommand(label or str(key), [(0.0, "press", key)]))
+    def release(self, key, label=None): return self.submit(KeyCommand(label or str(key), [(0.0, "release", key)]))
+    def cancel(self, command):
+        """Abandonne les étapes restantes ; les touches déjà enfoncées par la commande sont relâchées tout de suite."""
+        self._queue.put(_CancelCommand(command))
+
+    def latency_stats(self):
+        vals = list(self.latencies_ms); jit = list(self.jitter_ms)
+        return {"count": len(vals), "p50_ms": percentile(vals, 50), "p99_ms": percentile(vals, 99), "max_ms": max(vals) if vals else 0.0, "jitter_p99_ms": percentile(jit, 99)}
+
+    def stop(self):
+        self._queue.put(None); self.wait(2000)
+
+    def run(self):
+        pending = [] # tas (échéance, seq, commande, index de l'étape)
+        if sys.platform == "win32": ctypes_winmm("timeBeginPeriod") # Timeouts à 1 ms au lieu de 15,6 ms tant que le dispatcher tourne
+        try:
+            while True:
+                wait = pending[0][0] - time.perf_counter() if pending else None
+                try:
+                    if wait is None or wait > DISPATCH_SPIN_S: cmd = self._queue.get(timeout=None if wait is None else wait - DISPATCH_SPIN_S)
+                    else: cmd = self._queue.get_nowait()
+                except queue.Empty:
+                    cmd = False
+                    if wait is not None and 0 < wait <= DISPATCH_SPIN_S: time.sleep(0)
+                if cmd is None: break
+                if isinstance(cmd, _CancelCommand): pending = self._cancel(pending, cmd.cmd)
+                elif cmd:
+                    base = time.perf_counter()
+                    if not cmd.steps: cmd.t_dispatch = cmd.t_done = base; self.completed += 1; self.command_finished.emit(cmd) # Rien à planifier : terminée tout de suite
+                    for i, step in enumerate(cmd.steps): self._seq += 1; heapq.heappush(pending, (base + step[0], self._seq, cmd, i))
+                while pending and pending[0][0] <= time.perf_counter():
+                    deadline, _, c, i = heapq.heappop(pending); self._execute(c, i, deadline)
+            # Arrêt : on exécute immédiatement les étapes restantes (relâchements) puis on libère toute touche encore enfoncée
+            while pending:
+                deadline, _, c, i = heapq.heappop(pending); self._execute(c, i, None)
+            for key in list(self._held): self._apply("release", key)
+        finally:
+            if sys.platform == "win32": ctypes_winmm("timeEndPeriod")
+
+    def _cancel(self, pending, cmd):
+        if cmd.t_done is not None or cmd.cancelled: return pending
+        cmd.cancelled = True; self.cancelled += 1
+        for key, n in list(cmd.down.items()):
+            for _ in range(n): self._apply("release", key)
+        cmd.down.clear(); cmd.t_done = time.perf_counter(); self.command_finished.emit(cmd)
+        pending = [entry for entry in pending if entry[2] is not cmd]; heapq.heapify(pending)
+        return pending
+
+    def _apply(self, op, key):
+        if op == "press": self.backend.press(key); self._held[key] = self._held.get(key, 0) + 1
+        else:
+            self.backend.release(key)
+            if self._held.get(key, 0) <= 1: self._held.pop(key, None)
+            else: self._held[key] -= 1
+
+    def _execute(self, cmd, index, deadline):
+        _, op, key = cmd.steps[index]
+        try:
+            self._apply(op, key)
+            if op == "press": cmd.down[key] = cmd.down.get(key, 0) + 1 # Seulement si l'appui a réussi : l'annulation ne relâche que ce qui est enfoncé
+            elif cmd.down.get(key): cmd.down[key] -= 1
+        except Exception as e: print(f"Input dispatch error ({cmd.label}): {e}")
+        now = time.perf_counter()
+        if deadline is not None: jitter = (now - deadline) * 1000.0; cmd.jitter_ms[index] = jitter; self.jitter_ms.append(jitter)
+        if cmd.t_dispatch is None: cmd.t_dispatch = now; self.latencies_ms.append(cmd.latency_ms())
+        cmd.remaining -= 1
+        if cmd.remaining == 0: cmd.t_done = now; self.completed += 1; self.command_finished.emit(cmd)
+
+    def _run_callback(self, cmd):
+        if cmd.on_done and not cmd.cancelled: cmd.on_done()
+
 # --- THREAD RSS WORKER ---
+RSS_FEED_URL = "https://leonick.se/feeds/rsi/atom"
+RSS_CACHE_FILENAME = "sc_mfd_rss_cache.json"
+RSS_MAX_ENTRIES = 6
+RSS_REFRESH_MS = 15 * 60 * 1000
+RSS_BACKOFF_BASE_MS = 30 * 1000 # Hors ligne : 30 s, 1 min, 2 min... plafonné à RSS_REFRESH_MS
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+def get_rss_cache_path(): return os.path.join(get_data_dir(), RSS_CACHE_FILENAME)
+
+def load_rss_cache():
+    try:
+        with open(get_rss_cache_path(), 'r', encoding='utf-8') as f: return json.load(f)
+    except: return {}
+
+def parse_atom_entries(stream, limit=RSS_MAX_ENTRIES):
+    """Parse incrémental : s'arrête dès que `limit` entrées sont lues, sans construire tout l'arbre."""
+    import xml.etree.ElementTree as ET
+    items = []
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if elem.tag != ATOM_NS + "entry": continue
+        title_elem = elem.find(ATOM_NS + "title"); updated_elem = elem.find(ATOM_NS + "updated")
+        if title_elem is not None:
+            date_str = updated_elem.text[:10] if updated_elem is not None and updated_elem.text else ""
+            items.append((date_str, title_elem.text))
+        elem.clear()
+        if len(items) >= limit: break
+    return items
+
 class RSSWorker(QThread):
     data_refreshed = pyqtSignal(list)
+    def __init__(self, url=RSS_FEED_URL, max_entries=RSS_MAX_ENTRIES, parent=None):
+        super().__init__(parent); self.url = url; self.max_entries = max_entries; self.failures = 0; self.last_status = "IDLE"
+
+    def next_delay_ms(self):
+        if not self.failures: return RSS_REFRESH_MS
+        return min(RSS_REFRESH_MS, RSS_BACKOFF_BASE_MS * 2 ** (self.failures - 1))
+
     def run(self):
-        url = "https://leonick.se/feeds/rsi/atom"
+        import urllib.request, urllib.error
+        cache = load_rss_cache()
+        if cache.get("url") != self.url: cache = {}
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        if cache.get("etag"): headers['If-None-Match'] = cache["etag"]
+        if cache.get("last_modified"): headers['If-Modified-Since'] = cache["last_modified"]
+        cached_items = [tuple(i) for i in cache.get("items", [])]
         try:
-            req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+            req = urllib.request.Request(self.url, headers=headers)
             with urllib.request.urlopen(req, timeout=10) as response:
-                xml_data = response.read(); root = ET.fromstring(xml_data); ns = {'atom': 'http://www.w3.org/2005/Atom'}; news_items = []
-                entries = root.findall('atom:entry', ns)
-                for entry in entries[:6]: 
-                    title_elem = entry.find('atom:title', ns); updated_elem = entry.find('atom:updated', ns)
-                    if title_elem is not None:
-                        title = title_elem.text; date_str = ""
-                        if updated_elem is not None: date_str = updated_elem.text[:10]
-                        news_items.append((date_str, title))
-                self.data_refreshed.emit(news_items)
-        except Exception as e: print(f"RSS Error: {e}"); self.data_refreshed.emit([("ERROR", "COMM-LINK OFFLINE (Check Network)")])
+                news_items = parse_atom_entries(response, self.max_entries)
+                etag = response.headers.get('ETag'); last_modified = response.headers.get('Last-Modified')
+            self.failures = 0; self.last_status = "UPDATED"
+            try: atomic_write_text(get_rss_cache_path(), json.dumps({"url": self.url, "etag": etag, "last_modified": last_modified, "fetched_at": time.time(), "items": news_items}))
+            except Exception as e: print(f"RSS cache error: {e}")
+            self.data_refreshed.emit(news_items)
+        except urllib.error.HTTPError as e:
+            if e.code == 304: self.failures = 0; self.last_status = "NOT_MODIFIED"; self.data_refreshed.emit(cached_items); return
+            self.on_failure(e, cached_items)
+        except Exception as e: self.on_failure(e, cached_items)
+
+    def on_failure(self, error, cached_items):
+        self.failures += 1; self.last_status = "OFFLINE"; print(f"RSS Error: {error}")
+        self.data_refreshed.emit([("ERROR", "COMM-LINK OFFLINE (Check Network)")] + cached_items)
+
+# --- THREAD TELEMETRIE (ECHANTILLONNAGE HORS THREAD GUI) ---
+TELEMETRY_INTERVAL_S = 1.0
+TELEMETRY_HISTORY_SIZE = 120 # ~2 minutes d'historique à 1 Hz
+
+class TelemetrySampler(QThread):
+    """Collecte toutes les métriques psutil en une passe et émet un instantané compact."""
+    snapshot_ready = pyqtSignal(dict)
+    def __init__(self, interval_s=TELEMETRY_INTERVAL_S, history_size=TELEMETRY_HISTORY_SIZE, parent=None):
+        super().__init__(parent)
+        self.interval_s = interval_s; self.history = deque(maxlen=history_size); self._lock = threading.Lock(); self._stop_event = threading.Event()
+        self.sample_count = 0; self.last_sample_ms = 0.0; self.store = None # TelemetryHistory : écrit depuis ce thread
+
+    def sample(self):
+        import psutil
+        t0 = time.perf_counter()
+        cores = psutil.cpu_percent(percpu=True)
+        snap = {"ts": time.time(), "cpu": int(sum(cores) / len(cores)) if cores else 0, "cores": tuple(int(c) for c in cores),
+                "ram": int(psutil.virtual_memory().percent), "disk": None, "swap": None}
+        try: snap["disk"] = int(psutil.disk_usage('/').percent)
+        except: pass
+        try: snap["swap"] = int(psutil.swap_memory().percent)
+        except: pass
+        self.last_sample_ms = (time.perf_counter() - t0) * 1000.0; self.sample_count += 1
+        with self._lock: self.history.append(snap)
+        return snap
+
+    def recent(self, n=None):
+        """Copie des n derniers échantillons (les plus anciens en premier)."""
+        with self._lock: items = list(self.history)
+        return items if n is None else items[-n:]
+
+    def run(self):
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            start = time.monotonic()
+            try:
+                snap = self.sample(); self.snapshot_ready.emit(snap)
+                if self.store: self.store.append(snap)
+            except Exception as e: print(f"Telemetry Error: {e}")
+            self._stop_event.wait(max(0.0, self.interval_s - (time.monotonic() - start)))
+
+    def stop(self):
+        self._stop_event.set(); self.wait(2000)
+        if self.store: self.store.close()
+
+# --- HISTORIQUE TELEMETRIE (SERIES TEMPORELLES SUR DISQUE) ---
+# <dossier de données>/telemetry/telemetry_<palier>.bin : en-tête + enregistrements de largeur fixe, fichier pré-alloué
+# et mappé en mémoire, en ajout seul. Plein : renommé en .1 (l'ancien .1 est supprimé). Empreinte bornée à 2 segments par palier.
+TELEMETRY_DIRNAME = "telemetry"
+TS_MAGIC = b"SCTS"; TS_VERSION = 1
+TS_HEADER = struct.Struct("<4sHHII") # magic, version, taille d'enregistrement, nombre écrit, capacité
+TS_RECORD = struct.Struct("<d4B4B") # horodatage, moyennes cpu/ram/disk/swap, maxima cpu/ram/disk/swap
+TS_TIME = struct.Struct("<d")
+TS_FIELDS = ("cpu", "ram", "disk", "swap")
+TS_MISSING = 255
+TS_TIERS = (("1s", 1, 86400), ("1m", 60, 7 * 1440), ("10m", 600, 366 * 144)) # (nom, résolution s, capacité d'un segment) : 1 jour / 1 semaine / 1 an
+
+def get_telemetry_dir(): return os.path.join(get_data_dir(), TELEMETRY_DIRNAME)
+
+class TimeSeriesFile:
+    """Un segment mappé d'un palier. Écriture : enregistrement puis compteur de l'en-tête (un lecteur ne voit jamais d'enregistrement partiel)."""
+    def __init__(self, path, capacity, readonly=False):
+        self.path = path; self.capacity = capacity; self.readonly = readonly; self._file = None; self.mm = None; self._prev = None; self.rotations = 0
+    def _size(self): return TS_HEADER.size + self.capacity * TS_RECORD.size
+
+    def _map(self, path, readonly):
+        """(fichier, mmap) ou (None, None) si absent/invalide en lecture seule."""
+        import mmap
+        if readonly:
+            try:
+                f = open(path, "rb")
+                if os.fstat(f.fileno()).st_size < TS_HEADER.size: f.close(); return None, None
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except OSError: return None, None
+            magic, version, rec_size, _, _ = TS_HEADER.unpack_from(mm, 0)
+            if magic != TS_MAGIC or version != TS_VERSION or rec_size != TS_RECORD.size: mm.close(); f.close(); return None, None
+            return f, mm
+        try:
+            f = open(path, "r+b"); valid = os.fstat(f.fileno()).st_size == self._size() and TS_HEADER.unpack(f.read(TS_HEADER.size))[:3] == (TS_MAGIC, TS_VERSION, TS_RECORD.size)
+        except (OSError, struct.error): f = None; valid = False
+        if not valid: # Absent, tronqué ou d'un autre format : segment neuf
+            if f: f.close()
+            f = open(path, "w+b"); f.truncate(self._size()); f.write(TS_HEADER.pack(TS_MAGIC, TS_VERSION, TS_RECORD.size, 0, self.capacity)); f.flush()
+        return f, mmap.mmap(f.fileno(), self._size())
+
+    def open(self):
+        if self.mm is None: self._file, self.mm = self._map(self.path, self.readonly)
+        return self.mm is not None
+    def close(self):
+        for seg in (self._prev, (self._file, self.mm)):
+            if seg and seg[1] is not None: seg[1].close(); seg[0].close()
+        self._file = self.mm = self._prev = None
+
+    def count(self): return self._count(self.mm)
+    @staticmethod
+    def _count(mm):
+        return 0 if mm is None else min(TS_HEADER.unpack_from(mm, 0)[3], (len(mm) - TS_HEADER.size) // TS_RECORD.size)
+
+    def append(self, record):
+        if not self.open(): return
+        n = self.count()
+        if n >= self.capacity: self.rotate(); n = 0
+        TS_RECORD.pack_into(self.mm, TS_HEADER.size + n * TS_RECORD.size, *record)
+        TS_HEADER.pack_into(self.mm, 0, TS_MAGIC, TS_VERSION, TS_RECORD.size, n + 1, self.capacity)
+
+    def rotate(self):
+        self.close(); os.replace(self.path, self.path + ".1"); self.rotations += 1; self.open()
+
+    def previous(self):
+        """Segment .1 ouvert en lecture seule à la demande (fermé avant chaque rotation)."""
+        if self._prev is None: self._prev = self._map(self.path + ".1", True)
+        return self._prev[1]
+
+    def first_ts(self):
+        self.open()
+        for mm in (self.previous(), self.mm):
+            if self._count(mm): return TS_TIME.unpack_from(mm, TS_HEADER.size)[0]
+        return None
+
+    def read(self, t0, t1):
+        """Enregistrements t0 <= ts < t1 : recherche dichotomique sur les horodatages, seule la plage visible est décodée."""
+        if not self.open(): return []
+        out = []
+        for mm in (self.previous(), self.mm):
+            n = self._count(mm)
+            if not n: continue
+            def ts_at(i): return TS_TIME.unpack_from(mm, TS_HEADER.size + i * TS_RECORD.size)[0]
+            lo, hi = 0, n
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if ts_at(mid) < t0: lo = mid + 1
+                else: hi = mid
+            end, hi = lo, n
+            while end < hi:
+                mid = (end + hi) // 2
+                if ts_at(mid) < t1: end = mid + 1
+                else: hi = mid
+            if end > lo: out.extend(TS_RECORD.iter_unpack(mm[TS_HEADER.size + lo * TS_RECORD.size:TS_HEADER.size + end * TS_RECORD.size]))
+        return out
+
+class TelemetryHistory:
+    """Les trois paliers + l'agrégation en continu : chaque échantillon 1 s alimente directement les seaux 1 min et 10 min."""
+    def __init__(self, directory, tiers=TS_TIERS, readonly=False):
+        self.directory = directory; self.tiers = tiers; self.readonly = readonly; self._lock = threading.Lock(); self.files = None; self._buckets = {}
+        self.appended = 0
+
+    def _open(self):
+        if self.files is None:
+            if not self.readonly: os.makedirs(self.directory, exist_ok=True)
+            self.files = {name: TimeSeriesFile(os.path.join(self.directory, f"telemetry_{name}.bin"), cap, self.readonly) for name, _, cap in self.tiers}
+        return self.files
+
+    def append(self, snap):
+        vals = tuple(TS_MISSING if snap.get(k) is None else max(0, min(100, int(snap[k]))) for k in TS_FIELDS)
+        with self._lock:
+            files = self._open(); ts = snap["ts"]
+            files[self.tiers[0][0]].append((ts,) + vals + vals)
+            for name, res, _ in self.tiers[1:]:
+                key = int(ts // res); acc = self._buckets.get(name)
+                if acc is not None and acc[0] != key: self._flush_bucket(name, res, acc); acc = None
+                if acc is None: acc = self._buckets[name] = [key, [0] * 4, [0] * 4, [TS_MISSING] * 4]
+                for i, v in enumerate(vals):
+                    if v == TS_MISSING: continue
+                    acc[1][i] += v; acc[2][i] += 1; acc[3][i] = v if acc[3][i] == TS_MISSING else max(acc[3][i], v)
+            self.appended += 1
+
+    def _flush_bucket(self, name, res, acc):
+        self.files[name].append(self._bucket_record(res, acc))
+
+    @staticmethod
+    def _bucket_record(res, acc):
+        return (float(acc[0] * res),) + tuple(round(acc[1][i] / acc[2][i]) if acc[2][i] else TS_MISSING for i in range(4)) + tuple(acc[3])
+
+    def pick_tier(self, t0, t1, max_points):
+        """Palier le plus fin qui couvre t0 et tient en max_points points."""
+        with self._lock:
+            files = self._open()
+            for name, res, _ in self.tiers:
+                first = files[name].first_ts()
+                if (t1 - t0) / res <= max_points and first is not None and first <= t0 + res: return name
+            for name, res, _ in self.tiers: # Rien ne couvre t0 (historique récent) : le plus fin qui tient
+                if (t1 - t0) / res <= max_points: return name
+            return self.tiers[-1][0]
+
+    def read(self, t0, t1, max_points=None, tier=None):
+        """(palier, [(ts, cpu, ram, disk, swap, cpu_max, ram_max, disk_max, swap_max)]) pour la plage demandée."""
+        tier = tier or (self.pick_tier(t0, t1, max_points) if max_points else self.tiers[0][0])
+        with self._lock:
+            records = self._open()[tier].read(t0, t1); acc = self._buckets.get(tier)
+            if acc is not None: # Seau en cours (pas encore sur disque) : la dernière minute reste visible
+                res = next(r for name, r, _ in self.tiers if name == tier)
+                if t0 <= acc[0] * res < t1: records.append(self._bucket_record(res, acc))
+            return tier, records
+
+    def move_to(self, directory):
+        """Ferme les segments, déplace le dossier (changement de dossier de données), rouvre au prochain ajout."""
+        with self._lock:
+            self._close()
+            if os.path.isdir(self.directory) and not os.path.exists(directory): shutil.move(self.directory, directory)
+            self.directory = directory
+
+    def _close(self):
+        if self.files is None: return
+        if not self.readonly:
+            for name, res, _ in self.tiers[1:]:
+                acc = self._buckets.pop(name, None)
+                if acc: self._flush_bucket(name, res, acc) # Seau partiel conservé
+        for f in self.files.values(): f.close()
+        self.files = None
+
+    def close(self):
+        with self._lock: self._close()
+
+# --- THREAD SURVEILLANCE PROCESSUS JEU ---
+GAME_PROCESS_NAME = "StarCitizen.exe"
+
+def foreground_pid():
+    """PID de la fenêtre au premier plan (Windows uniquement, 0 ailleurs)."""
+    if sys.platform != "win32": return 0
+    import ctypes
+    pid = ctypes.c_ulong(0); hwnd = ctypes.windll.user32.GetForegroundWindow()
+    if hwnd: ctypes.windll.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return pid.value
+
+GAME_SCAN_BACKOFF_MAX_S = 10.0 # Intervalle max entre deux scans complets quand le jeu est absent
+
+class GameProcessWatcher(QThread):
+    """Garde le handle du processus du jeu en cache ; scan complet uniquement quand il a disparu."""
+    status_changed = pyqtSignal(bool, int) # (en ligne, pid)
+    def __init__(self, process_name=GAME_PROCESS_NAME, check_interval_s=1.0, scan_interval_s=1.0, max_scan_interval_s=GAME_SCAN_BACKOFF_MAX_S, parent=None):
+        super().__init__(parent)
+        self.process_name = process_name; self.check_interval_s = check_interval_s; self.scan_interval_s = scan_interval_s; self.max_scan_interval_s = max_scan_interval_s
+        self.proc = None; self.online = None; self._stop_event = threading.Event(); self._last_scan = 0.0; self._scan_delay = scan_interval_s
+        self.scan_count = 0; self.check_count = 0; self.last_scan_ms = 0.0; self.total_scan_ms = 0.0
+
+    def is_alive(self):
+        """Vérification O(1) du processus en cache (is_running détecte aussi la réutilisation de PID)."""
+        import psutil
+        self.check_count += 1
+        try: return self.proc is not None and psutil.pid_exists(self.proc.pid) and self.proc.is_running() and self.proc.status() != psutil.STATUS_ZOMBIE
+        except (psutil.NoSuchProcess, psutil.AccessDenied): return False
+
+    def scan(self):
+        import psutil
+        t0 = time.perf_counter(); found = None
+        for proc in psutil.process_iter(['name']):
+            try:
+                if proc.info['name'] == self.process_name: found = proc; break
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess): pass
+        self.last_scan_ms = (time.perf_counter() - t0) * 1000.0; self.total_scan_ms += self.last_scan_ms; self.scan_count += 1; self._last_scan = time.monotonic()
+        return found
+
+    def poll(self):
+        if not self.is_alive():
+            self.proc = None
+            if self.online is not False or time.monotonic() - self._last_scan >= self._scan_delay:
+                self.proc = self.scan()
+                # Hors ligne : 1 s, 2 s, 4 s... jusqu'à max_scan_interval_s ; retour à l'intervalle de base dès que le jeu est trouvé
+                self._scan_delay = self.scan_interval_s if self.proc or self.online is not False else min(self.max_scan_interval_s, self._scan_delay * 2)
+        online = self.proc is not None
+        if online != self.online: self.online = online; self.status_changed.emit(online, self.proc.pid if online else 0)
+
+    def metrics(self):
+        return {"scans": self.scan_count, "checks": self.check_count, "last_scan_ms": self.last_scan_ms,
+                "avg_scan_ms": self.total_scan_ms / self.scan_count if self.scan_count else 0.0, "pid": self.proc.pid if self.proc else 0}
+
+    def run(self):
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            try: self.poll()
+            except Exception as e: print(f"Process watcher error: {e}")
+            wait = self.check_interval_s if self.online else max(self.check_interval_s, self._last_scan + self._scan_delay - time.monotonic())
+            self._stop_event.wait(wait)
+
+    def stop(self): self._stop_event.set(); self.wait(2000)
+
+# --- WATCHDOG DE LA BOUCLE GUI ---
+STALL_THRESHOLD_MS = 50
+STALL_REPORT_FILENAME = "sc_mfd_stalls.log"
+STALL_STACK_DEPTH = 12
+
+class StallWatchdog(QThread):
+    """Envoie un ping au thread GUI ; sans réponse au-delà du seuil, capture sa pile Python et l'écrit dans un rapport.
+    Compteurs ping/pong et relevés partagés entre les deux threads : toujours sous _lock."""
+    ping = pyqtSignal(int)
+    def __init__(self, threshold_ms=STALL_THRESHOLD_MS, parent=None):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms; self.gui_ident = threading.get_ident(); self._stop_event = threading.Event(); self._lock = threading.Lock()
+        self._sent = 0; self._sent_at = 0.0; self._answered = 0; self._answered_at = 0.0; self._current = None
+        self.stall_count = 0; self.stalls = deque(maxlen=50)
+        self.ping.connect(self._pong) # Objet vivant dans le thread GUI : connexion en file
+
+    def _pong(self, seq):
+        with self._lock: self._answered_at = time.perf_counter(); self._answered = seq
+
+    def run(self):
+        self._stop_event.clear(); interval = self.threshold_ms / 2000.0
+        while not self._stop_event.wait(interval):
+            now = time.perf_counter()
+            with self._lock: answered, answered_at = self._answered, self._answered_at
+            if answered == self._sent:
+                if self._current: self._finish_stall((answered_at - self._sent_at) * 1000.0)
+                with self._lock: self._sent += 1; self._sent_at = now; seq = self._sent
+                self.ping.emit(seq)
+            elif self._current is None and (now - self._sent_at) * 1000.0 > self.threshold_ms:
+                self._begin_stall((now - self._sent_at) * 1000.0)
+
+    def _begin_stall(self, waited_ms):
+        frame = sys._current_frames().get(self.gui_ident)
+        stack = traceback.format_stack(frame, limit=STALL_STACK_DEPTH) if frame is not None else []
+        with self._lock: self.stall_count += 1
+        self._current = {"ts": time.time(), "detected_ms": waited_ms, "duration_ms": None, "stack": stack}
+        self.write_report(f"=== STALL #{self.stall_count} {time.strftime('%Y-%m-%d %H:%M:%S')} >= {waited_ms:.0f} ms (threshold {self.threshold_ms} ms)\n" + "".join(stack))
+
+    def _finish_stall(self, duration_ms):
+        self._current["duration_ms"] = duration_ms
+        with self._lock: self.stalls.append(self._current)
+        self._current = None
+        self.write_report(f"--- stall ended after {duration_ms:.0f} ms\n")
+
+    def write_report(self, text):
+        try:
+            with open(os.path.join(get_data_dir(), STALL_REPORT_FILENAME), "a", encoding="utf-8") as f: f.write(text)
+        except Exception as e: print(f"Watchdog report error: {e}")
+
+    def stall_stats(self):
+        """Lecture depuis le thread GUI (HUD, banc)."""
+        with self._lock: return {"stalls": self.stall_count, "pings": self._sent, "answered": self._answered, "recent": list(self.stalls)}
+
+    def stop(self): self._stop_event.set(); self.wait(2000)
+
+# --- MOTEUR DE THEMES ---
+# Couleurs définies une seule fois par rôle. Une seule feuille globale contient tous les thèmes : chaque règle est limitée
+# ($T / $P) aux fenêtres dont la propriété "theme" porte ce nom. Posée une fois sur l'application, jamais reparsée ensuite.
+DEFAULT_THEME = "CONSTELLATION"
+THEME_PROPERTY = "theme"
+THEMES = {
+    "CONSTELLATION": {
+        "bg": "#000000", "panel": "#0a0a0a", "accent": "#2affea", "accent_soft": "rgba(42, 255, 234, 0.08)", "accent_hover": "rgba(42, 255, 234, 0.2)", "on_accent": "#000000",
+        "text": "#ffffff", "muted": "#aaaaaa", "border_muted": "#444444", "frame": "#334455", "console_bg": "#050505", "console_border": "#004400", "input_bg": "#001111",
+        "binding_bg": "#002222", "tool_bg": "#222222", "danger": "#ff5555", "danger_alarm": "#ff0000", "danger_bg": "#330000", "danger_text": "#ffaaaa", "reset_bg": "#550000",
+        "close_bg": "#220000", "close_text": "#aa0000", "close_border": "#550000", "warn": "#ffaa00", "ok": "#44ff44", "offline": "#ff4444",
+        "shield": "#4444ff", "shield_text": "#aaaaff", "shield_bg": "rgba(0,0,50,0.3)", "shield_group_bg": "rgba(0,20,40,0.4)", "weapons": "#ff4444", "engines": "#44ff44",
+        "atc": "#ffff00", "autoland_btn": "#00ff00", "config_text": "#cccccc", "config_border": "#888888", "noise": "#aaaaaa",
+        "cpu": "#2affea", "ram": "#ffaa00", "disk": "#ff5555", "swap": "#aa55ff", "log_system": "#00aa00", "log_user": "#ffffff", "eject": "#ff0000", "autoland": "#00ff00", "shutdown_text": "#ff3232", "rss_title": "#eeeeee",
+    },
+}
+# Vision nocturne : tout en rouge pour préserver l'adaptation à l'obscurité
+THEMES["NIGHT_VISION"] = dict(THEMES["CONSTELLATION"], **{
+    "panel": "#070000", "accent": "#ff2a2a", "accent_soft": "rgba(255, 42, 42, 0.08)", "accent_hover": "rgba(255, 42, 42, 0.2)", "text": "#ff8080", "muted": "#aa3333",
+    "border_muted": "#441111", "frame": "#551111", "console_bg": "#050000", "console_border": "#440000", "input_bg": "#110000", "binding_bg": "#220000", "tool_bg": "#220505",
+    "danger": "#ff6060", "danger_text": "#ff9090", "warn": "#ff7040", "ok": "#ff9999", "offline": "#ff3030", "shield": "#cc3344", "shield_text": "#ff7777",
+    "shield_bg": "rgba(50,0,0,0.3)", "shield_group_bg": "rgba(40,0,0,0.4)", "weapons": "#ff4444", "engines": "#ff9966", "atc": "#ffaa66", "autoland_btn": "#ff9999",
+    "config_text": "#cc6666", "config_border": "#883333", "noise": "#aa5555", "cpu": "#ff2a2a", "ram": "#ff7040", "disk": "#ff5555", "swap": "#cc4466",
+    "log_system": "#aa2222", "log_user": "#ff9090", "eject": "#ff0000", "autoland": "#ff8844", "rss_title": "#ff9090",
+})
+# Contraste élevé : blanc/jaune francs sur noir, sans transparence
+THEMES["HIGH_CONTRAST"] = dict(THEMES["CONSTELLATION"], **{
+    "panel": "#000000", "accent": "#ffffff", "accent_soft": "#000000", "accent_hover": "#333333", "muted": "#ffffff", "border_muted": "#ffffff", "frame": "#ffffff",
+    "console_bg": "#000000", "console_border": "#ffffff", "input_bg": "#000000", "binding_bg": "#000000", "tool_bg": "#000000", "warn": "#ffff00", "ok": "#00ff00",
+    "offline": "#ff0000", "shield": "#00ffff", "shield_text": "#00ffff", "shield_bg": "#000000", "shield_group_bg": "#000000", "weapons": "#ff0000", "engines": "#00ff00",
+    "config_text": "#ffffff", "config_border": "#ffffff", "noise": "#ffffff", "cpu": "#00ffff", "ram": "#ffff00", "disk": "#ff0000", "swap": "#ff00ff",
+    "log_system": "#00ff00", "log_user": "#ffffff", "rss_title": "#ffffff",
+})
+
+# $T : widget descendant d'une fenêtre du thème ; $P : la fenêtre elle-même (QMainWindow)
+STYLE_TEMPLATE = """
+    QMainWindow$P { background-color: $bg; }
+    $T QWidget { font-family: 'Verdana'; font-size: 14px; }
+    $T QFrame#panel_frame { background-color: $panel; border: 1px solid $accent; border-radius: 0px; border-right: 5px solid $accent; }
+    $T QFrame#header_frame { background-color: $panel; border-bottom: 2px solid $accent; }
+    $T QLabel { color: $accent; font-weight: bold; }
+    $T QLabel#panel_title { font-size: 18px; border-bottom: 1px dashed $accent; margin-bottom: 15px; padding-bottom: 5px; color: $text;}
+    $T QLabel#brand_lbl { font-size: 20px; font-weight: bold; letter-spacing: 3px; color: $accent; }
+    $T QLabel#id_lbl { color: $muted; font-family: 'Consolas'; }
+    $T QLabel#status_lbl[state="online"] { color: $ok; font-weight: bold; }
+    $T QLabel#status_lbl[state="offline"] { color: $offline; font-weight: bold; }
+    $T QLabel#clock_lbl { font-size:30px; color: $text; font-family:'Consolas'; border: 1px solid $frame; border-radius: 5px; margin-bottom: 10px; }
+    $T QLabel#power_lbl { color: $text; font-weight:bold; }
+    $T QFrame#shield_group { background-color: $shield_group_bg; border: 1px solid $shield; border-radius: 4px; }
+    $T QLabel#shield_group_lbl { color: $shield_text; font-size:12px; border:none; background:transparent; }
+    $T QTextEdit#log_console, $T QListView#log_console { background-color: $bg; border: 1px dotted $console_border; font-family: 'Consolas'; font-size: 11px; }
+    $T QTextEdit#rss_console { background-color: $console_bg; border: 1px solid $accent; color: $accent; font-family: 'Verdana'; font-size: 11px; padding: 5px; }
+    $T QLineEdit#notes_search { background-color: $console_bg; border: 1px solid $accent; color: $accent; font-family: 'Consolas'; font-size: 13px; padding: 4px; }
+    $T QComboBox#notes_sections { background-color: $bg; color: $accent; border: 1px solid $accent; padding: 3px; font-size: 11px; }
+    $T QListWidget#notes_results { background-color: $console_bg; border: 1px solid $accent; color: $text; font-family: 'Consolas'; font-size: 12px; }
+    $T QTextEdit#notes_editor { background-color: $console_bg; border: 1px solid $accent; color: $accent; font-family: 'Consolas'; font-size: 13px; }
+    $T QPushButton { background-color: $accent_soft; color: $accent; border: 1px solid $accent; border-radius: 2px; font-weight: bold; }
+    $T QPushButton:pressed { background-color: $accent; color: $on_accent; }
+    $T QPushButton:checked { background-color: $accent; color: $on_accent; border: 2px solid $text; }
+    $T QPushButton:hover { background-color: $accent_hover; border: 1px solid $text; }
+    $T QPushButton#btn_shd_reset { color: $warn; border: 2px solid $warn; font-size: 16px; }
+    $T QPushButton#btn_shd_reset:pressed { background-color: $warn; color: $on_accent; }
+    $T QPushButton#btn_shield_inc, $T QPushButton#btn_shield_dec { font-size: 24px; border: 1px solid $shield; color: $shield; background-color: $shield_bg; }
+    $T QPushButton#btn_weapons_inc, $T QPushButton#btn_weapons_dec { color: $weapons; border-color: $weapons; font-size: 20px; }
+    $T QPushButton#btn_engines_inc, $T QPushButton#btn_engines_dec { color: $engines; border-color: $engines; font-size: 20px; }
+    $T QPushButton#btn_shields_inc, $T QPushButton#btn_shields_dec { color: $shield; border-color: $shield; font-size: 20px; }
+    $T QPushButton#btn_atc { border-color: $atc; color: $atc; }
+    $T QPushButton#btn_autoland { border-color: $autoland_btn; color: $autoland_btn; }
+    $T QPushButton#btn_noise { color: $noise; border-color: $noise; }
+    $T QPushButton#config_btn { font-size: 18px; border: 2px solid $config_border; color: $config_text; }
+    $T QPushButton#close_btn { font-size: 18px; background-color: $danger_bg; color: $danger; border: 2px solid $danger_alarm; }
+    $T QPushButton#btn_danger { color: $warn; border: 1px dashed $warn; }
+    $T QComboBox#profile_combo { background-color: $bg; color: $accent; border: 1px solid $accent; padding: 4px 10px; font-weight: bold; min-width: 160px; }
+    $T QComboBox#profile_combo QAbstractItemView { background-color: $bg; color: $accent; selection-background-color: $accent; selection-color: $on_accent; }
+    $T QProgressBar { border: 1px solid $frame; background-color: $bg; text-align: center; color: $text; }
+    $T QProgressBar#bar_cpu::chunk { background-color: $cpu; }
+    $T QProgressBar#bar_ram::chunk { background-color: $ram; }
+    $T QProgressBar#bar_disk::chunk { background-color: $disk; }
+    $T QProgressBar#bar_swap::chunk { background-color: $swap; }
+    $T QDialog#settings_dialog { background-color: $bg; color: $accent; font-family: 'Verdana'; border: 2px solid $accent; }
+    $T QDialog#settings_dialog QComboBox { background-color: $bg; color: $accent; border: 1px solid $accent; padding: 5px; font-size: 14px; font-weight: bold; }
+    $T QDialog#settings_dialog QComboBox::drop-down { border: 0px; }
+    $T QDialog#settings_dialog QComboBox QAbstractItemView { background-color: $bg; color: $accent; selection-background-color: $accent; selection-color: $on_accent; border: 1px solid $accent; outline: none; }
+    $T QDialog#settings_dialog QLineEdit { background: $input_bg; color: $muted; border: 1px solid $accent; padding: 5px; }
+    $T #settings_path_frame, $T #settings_path_frame * { border: 1px solid $border_muted; margin-bottom: 10px; padding: 5px; }
+    $T #settings_screen_frame, $T #settings_screen_frame * { border: 1px solid $accent; margin-bottom: 10px; }
+    $T #settings_bindings, $T #settings_bindings * { background-color: $bg; }
+    $T QPushButton#settings_tool_btn { background-color: $tool_bg; color: $accent; font-weight: bold; }
+    $T QPushButton#settings_primary_btn { background-color: $accent; color: $on_accent; font-weight: bold; padding: 10px; }
+    $T QPushButton#settings_save_btn { background-color: $accent; color: $on_accent; padding: 10px; font-weight: bold; margin-top: 10px; }
+    $T QPushButton#settings_reset_btn { background-color: $reset_bg; color: $danger_text; padding: 10px; font-weight: bold; margin-top: 10px; border: 1px solid $danger; }
+    $T QPushButton#binding_btn { border: 1px solid $accent; padding: 5px; background: $binding_bg; color: $accent; }
+    $T QPushButton#binding_btn[conflict="true"] { border: 1px solid $danger; color: $danger; }
+    $T QLabel#conflict_lbl { color: $danger; }
+    $T QDialog#history_dialog { background-color: $bg; border: 2px solid $accent; }
+    $T QLabel#history_info { color: $muted; font-family: 'Consolas'; font-size: 12px; }
+"""
+
+def repolish(widget):
+    """Réévalue les sélecteurs de propriétés d'un seul widget, sans reparser la feuille."""
+    style = widget.style(); style.unpolish(widget); style.polish(widget); widget.update()
+
+def repolish_tree(root):
+    """Repolit une fenêtre et ses descendants : nouvelles règles de la feuille déjà posée, sans la reparser."""
+    for w in [root] + root.findChildren(QWidget): repolish(w)
+
+class ThemeEngine:
+    """Compile une feuille unique (tous thèmes) + une QPalette par thème ; une bascule ne change que la propriété theme des fenêtres."""
+    def __init__(self, themes=THEMES):
+        self.themes = themes; self.name = None; self._sheet = None; self._palettes = {}; self._colors = {}; self.compile_count = 0
+    def names(self): return list(self.themes)
+    def roles(self, name=None): return self.themes.get(name or self.name) or self.themes[DEFAULT_THEME]
+    def color(self, role):
+        """QColor mis en cache pour les widgets peints à la main (overlays, graphes, journal)."""
+        key = (self.name, role); c = self._colors.get(key)
+        if c is None: c = self._colors[key] = QColor(self.roles()[role])
+        return c
+    def stylesheet(self):
+        if self._sheet is None:
+            from string import Template
+            template = Template(STYLE_TEMPLATE); self.compile_count += 1
+            self._sheet = "\n".join(template.substitute(self.roles(n), T=f'*[{THEME_PROPERTY}="{n}"]', P=f'[{THEME_PROPERTY}="{n}"]') for n in self.themes)
+        return self._sheet
+    def palette(self, name):
+        pal = self._palettes.get(name)
+        if pal is None:
+            r = self.roles(name); pal = self._palettes[name] = QPalette()
+            for group_role, key in ((QPalette.ColorRole.Window, "bg"), (QPalette.ColorRole.Base, "bg"), (QPalette.ColorRole.Button, "panel"), (QPalette.ColorRole.WindowText, "accent"),
+                                    (QPalette.ColorRole.Text, "accent"), (QPalette.ColorRole.ButtonText, "accent"), (QPalette.ColorRole.Highlight, "accent"), (QPalette.ColorRole.HighlightedText, "on_accent")):
+                pal.setColor(group_role, QColor(r[key]))
+        return pal
+    def apply(self, name, app=None):
+        """Retourne True si le thème a changé. Au premier appel, pose la feuille (parse + polish unique). Ensuite, une bascule
+        change la propriété theme des fenêtres et repolit leurs widgets : ni reparsing, ni setStyleSheet sur l'application."""
+        name = name if name in self.themes else DEFAULT_THEME
+        app = app or QApplication.instance(); sheet = self.stylesheet(); changed = name != self.name or app.styleSheet() != sheet
+        if changed: self.name = name; app.setPalette(self.palette(name))
+        stale = [w for w in app.topLevelWidgets() if w.parentWidget() is None and w.property(THEME_PROPERTY) != name] # Dialogues : via leur parent
+        for win in stale: win.setProperty(THEME_PROPERTY, name) # Nouvelle fenêtre sans enfants : rien à repolir
+        if app.styleSheet() != sheet: app.setStyleSheet(sheet)
+        else:
+            for win in stale: repolish_tree(win)
+        return changed
+
+THEME = ThemeEngine()
+
+# --- WIDGETS TELEMETRIE ---
+class SparklineWidget(QWidget):
+    """Mini-graphe de l'historique CPU, repeint uniquement quand une valeur arrive."""
+    clicked = pyqtSignal()
+    def __init__(self, color, size=TELEMETRY_HISTORY_SIZE, parent=None):
+        super().__init__(parent); self.values = deque(maxlen=size); self.color = QColor(color); self.setMinimumHeight(40)
+    def set_color(self, color): self.color = QColor(color); self.update()
+    def push(self, value): self.values.append(value); self.update()
+    def mousePressEvent(self, event): self.clicked.emit()
+    def paintEvent(self, event):
+        if len(self.values) < 2: return
+        painter = QPainter(self); painter.setRenderHint(QPainter.RenderHint.Antialiasing); w, h = self.width(), self.height()
+        step = w / (self.values.maxlen - 1); x0 = w - step * (len(self.values) - 1)
+        poly = QPolygonF([QPointF(x0 + i * step, h - 1 - (h - 2) * v / 100.0) for i, v in enumerate(self.values)])
+        painter.setPen(QPen(self.color, 1.5)); painter.drawPolyline(poly)
+
+class CoreBarsWidget(QWidget):
+    """Une barre verticale par coeur logique."""
+    def __init__(self, color, parent=None):
+        super().__init__(parent); self.cores = (); self.color = QColor(color); self.setMinimumHeight(30)
+    def set_color(self, color): self.color = QColor(color); self.update()
+    def set_cores(self, cores):
+        if cores != self.cores: self.cores = cores; self.update()
+    def paintEvent(self, event):
+        if not self.cores: return
+        painter = QPainter(self); w, h = self.width(), self.height(); n = len(self.cores); bw = w / n
+        for i, c in enumerate(self.cores):
+            bh = int(h * c / 100.0); painter.fillRect(QRectF(i * bw + 1, h - bh, max(1.0, bw - 2), bh), self.color)
+
+HISTORY_SPANS = (("15M", 900), ("1H", 3600), ("6H", 6 * 3600), ("24H", 86400), ("7D", 7 * 86400), ("30D", 30 * 86400))
+
+class HistoryChartWidget(QWidget):
+    """Graphe de l'historique disque : ne lit que la fenêtre affichée, au palier qui donne ~1 point par pixel."""
+    def __init__(self, history, parent=None):
+        super().__init__(parent); self.history = history; self.span_s = HISTORY_SPANS[1][1]; self.end_ts = None; self.tier = None; self.records = []; self.read_ms = 0.0
+        self.setMinimumSize(600, 240)
+    def window(self):
+        t1 = self.end_ts if self.end_ts is not None else time.time(); return t1 - self.span_s, t1
+    def set_span(self, span_s): self.span_s = span_s; self.refresh()
+    def pan(self, fraction):
+        """Décale la fenêtre ; revenir au présent repasse en suivi du direct."""
+        t1 = self.window()[1] + fraction * self.span_s
+        self.end_ts = None if t1 >= time.time() else t1; self.refresh()
+    def refresh(self):
+        t0, t1 = self.window(); start = time.perf_counter()
+        try: self.tier, self.records = self.history.read(t0, t1, max_points=2 * max(60, self.width())) # ~2 points par pixel au plus
+        except Exception as e: print(f"History read error: {e}"); self.tier, self.records = None, []
+        self.read_ms = (time.perf_counter() - start) * 1000.0; self.update()
+    def paintEvent(self, event):
+        painter = QPainter(self); painter.setRenderHint(QPainter.RenderHint.Antialiasing); w, h = self.width(), self.height(); t0, t1 = self.window()
+        painter.setPen(QPen(THEME.color("frame"), 1))
+        for pct in (25, 50, 75): y = h - 1 - (h - 2) * pct / 100.0; painter.drawLine(QPointF(0, y), QPointF(w, y))
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        if not self.records: painter.setPen(THEME.color("muted")); painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "NO DATA"); return
+        scale = w / max(1e-6, t1 - t0); gap = {"1s": 1, "1m": 60, "10m": 600}.get(self.tier, 1) * 3 # Trou d'enregistrement (deck éteint) : ligne coupée
+        for i, role in ((1, "cpu"), (2, "ram"), (4, "swap")):
+            painter.setPen(QPen(THEME.color(role), 1.5)); line = []; last_ts = None
+            for rec in self.records:
+                v = rec[i]
+                if v == TS_MISSING or (last_ts is not None and rec[0] - last_ts > gap): self._draw_run(painter, line); line = []
+                if v != TS_MISSING: line.append(QPointF((rec[0] - t0) * scale, h - 1 - (h - 2) * v / 100.0))
+                last_ts = rec[0]
+            self._draw_run(painter, line)
+    @staticmethod
+    def _draw_run(painter, line):
+        if len(line) > 1: painter.drawPolyline(QPolygonF(line))
+        elif line: painter.drawEllipse(line[0], 2, 2) # Point isolé (un seul échantillon dans la fenêtre)
+
+class HistoryDialog(QDialog):
+    """Historique CPU / RAM / SWAP sur plusieurs semaines (Ctrl+Shift+H ou clic sur le graphe CPU)."""
+    def __init__(self, history, parent=None):
+        super().__init__(parent); self.setObjectName("history_dialog"); self.setWindowTitle("TELEMETRY HISTORY"); self.resize(900, 380)
+        layout = QVBoxLayout(self); bar = QHBoxLayout(); bar.setSpacing(4)
+        self.chart = HistoryChartWidget(history)
+        for label, span in HISTORY_SPANS:
+            btn = QPushButton(label); btn.setMinimumSize(56, 34); btn.setFocusPolicy(Qt.FocusPolicy.NoFocus); btn.clicked.connect(lambda _, s=span: self.chart.set_span(s)); bar.addWidget(btn)
+        bar.addStretch()
+        for label, frac in (("<<", -0.5), (">>", 0.5)):
+            btn = QPushButton(label); btn.setMinimumSize(50, 34); btn.setFocusPolicy(Qt.FocusPolicy.NoFocus); btn.clicked.connect(lambda _, f=frac: self.chart.pan(f)); bar.addWidget(btn)
+        now_btn = QPushButton("NOW"); now_btn.setMinimumSize(60, 34); now_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus); now_btn.clicked.connect(lambda: (setattr(self.chart, "end_ts", None), self.chart.refresh())); bar.addWidget(now_btn)
+        layout.addLayout(bar); layout.addWidget(self.chart, 1)
+        self.info_lbl = QLabel(); self.info_lbl.setObjectName("history_info"); layout.addWidget(self.info_lbl)
+        self.live_timer = QTimer(self); self.live_timer.setInterval(int(TELEMETRY_INTERVAL_S * 1000)); self.live_timer.timeout.connect(self.on_live_tick) # Actif seulement dialogue ouvert
+    def on_live_tick(self):
+        if self.chart.end_ts is None: self.chart.refresh()
+    def showEvent(self, event):
+        super().showEvent(event); self.chart.refresh(); self.live_timer.start()
+        self.info_lbl.setText("   ".join(f'<span style="color:{THEME.roles()[r]};">&#9632; {r.upper()}</span>' for r in ("cpu", "ram", "swap"))) # Légende du thème courant
+    def hideEvent(self, event): self.live_timer.stop(); super().hideEvent(event)
+    def resizeEvent(self, event): super().resizeEvent(event); self.chart.refresh() if self.isVisible() else None
+
+# --- JOURNAL DE COMMANDES (RING BUFFER + MODEL/VIEW) ---
+LOG_CAPACITY = 500
+LOG_LEVEL_SYSTEM = 0; LOG_LEVEL_USER = 1
+LOG_EXPORT_FILENAME = "sc_mfd_command_log.txt"
+LOG_SPILL_FILENAME = "sc_mfd_command_log.{pid}-{n}.spill" # Lignes sorties de l'anneau : un fichier par journal et par processus (ajout seul)
+LOG_SPILL_BATCH = 100 # Lignes évincées écrites d'un coup
+
+_log_spill_ids = itertools.count(1)
+def get_log_spill_path():
+    """Nouveau fichier à chaque journal : un deuxième deck ou une reconstruction n'efface jamais l'historique d'un autre."""
+    return os.path.join(get_data_dir(), LOG_SPILL_FILENAME.format(pid=os.getpid(), n=next(_log_spill_ids)))
+
+def purge_stale_log_spills(directory):
+    """Supprime les fichiers de débordement laissés par des sessions terminées (crash compris)."""
+    import glob, psutil
+    for path in glob.glob(os.path.join(directory, LOG_SPILL_FILENAME.format(pid="*", n="*"))):
+        pid = os.path.basename(path).split(".")[-2].split("-")[0]
+        if pid.isdigit() and int(pid) != os.getpid() and not psutil.pid_exists(int(pid)):
+            try: os.remove(path)
+            except OSError as e: print(f"Log Spill Error: {e}")
+
+def format_log_record(ts, level, text): return f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))} [{'USER' if level == LOG_LEVEL_USER else 'SYS'}] {text}"
+
+class LogRingBuffer:
+    """Tampon circulaire à capacité fixe, accès indexé O(1)."""
+    def __init__(self, capacity=LOG_CAPACITY):
+        self.capacity = capacity; self._items = [None] * capacity; self._start = 0; self._len = 0
+    def __len__(self): return self._len
+    def __getitem__(self, i): return self._items[(self._start + i) % self.capacity]
+    def __iter__(self): return (self[i] for i in range(self._len))
+    def is_full(self): return self._len == self.capacity
+    def pop_oldest(self): self._items[self._start] = None; self._start = (self._start + 1) % self.capacity; self._len -= 1
+    def append(self, item): self._items[(self._start + self._len) % self.capacity] = item; self._len += 1
+
+class LogModel(QAbstractListModel):
+    """Enregistrements compacts (horodatage, niveau, texte) ; le texte affiché n'est formaté que pour les lignes visibles.
+    Avec spill_path, les lignes évincées de l'anneau sont ajoutées par lots à ce fichier : l'export couvre toute la session."""
+    def __init__(self, capacity=LOG_CAPACITY, parent=None, spill_path=None):
+        super().__init__(parent); self.records = LogRingBuffer(capacity); self.total_appended = 0; self.spill_path = spill_path; self._evicted = []; self.spilled = 0
+        if spill_path:
+            try: open(spill_path, "a", encoding="utf-8").close() # Jamais tronqué : un fichier existant garde son historique
+            except OSError as e: print(f"Log Spill Error: {e}"); self.spill_path = None
+        self.set_colors(THEME.color("log_system"), THEME.color("log_user"))
+
+    def set_colors(self, system_color, user_color):
+        bold = QFont("Consolas"); bold.setBold(True)
+        self._styles = {LOG_LEVEL_SYSTEM: (QBrush(QColor(system_color)), QFont("Consolas")), LOG_LEVEL_USER: (QBrush(QColor(user_color)), bold)}
+        if len(self.records): self.dataChanged.emit(self.index(0), self.index(len(self.records) - 1), [Qt.ItemDataRole.ForegroundRole])
+
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self.records)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        ts, level, text = self.records[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole: return f"[{time.strftime('%H:%M:%S', time.localtime(ts))}] > {text}"
+        if role == Qt.ItemDataRole.ForegroundRole: return self._styles[level][0]
+        if role == Qt.ItemDataRole.FontRole: return self._styles[level][1]
+        return None
+
+    def append(self, text, level=LOG_LEVEL_SYSTEM, ts=None):
+        if self.records.is_full():
+            if self.spill_path:
+                self._evicted.append(self.records[0])
+                if len(self._evicted) >= LOG_SPILL_BATCH: self.flush_spill()
+            self.beginRemoveRows(QModelIndex(), 0, 0); self.records.pop_oldest(); self.endRemoveRows()
+        row = len(self.records)
+        self.beginInsertRows(QModelIndex(), row, row); self.records.append((ts if ts is not None else time.time(), level, text)); self.endInsertRows()
+        self.total_appended += 1
+
+    def flush_spill(self):
+        if not self._evicted: return
+        try:
+            with open(self.spill_path, "a", encoding="utf-8") as f: f.write("".join(format_log_record(*r) + "\n" for r in self._evicted))
+            self.spilled += len(self._evicted)
+        except OSError as e: print(f"Log Spill Error: {e}")
+        self._evicted.clear()
+
+    def export(self, path):
+        """Exporte tout l'historique de la session (lignes évincées puis anneau) en texte brut."""
+        spilled = ""
+        if self.spill_path:
+            self.flush_spill()
+            try:
+                with open(self.spill_path, "r", encoding="utf-8") as f: spilled = f.read()
+            except OSError as e: print(f"Log Spill Error: {e}")
+        lines = [format_log_record(*r) for r in self.records]
+        atomic_write_text(path, spilled + "\n".join(lines) + "\n")
+        return spilled.count("\n") + len(lines)
+
+# --- NOTES : SECTIONS INDEXEES (UN FICHIER PAR SECTION) ---
+# <dossier de données>/notes/index.json (titres, tailles, section courante) + notes/<id>.txt
+# L'ancien fichier unique sc_mfd_notes.txt est découpé une fois (titres "#" ou ~32 Ko), puis renommé en .migrated.
+NOTES_DIRNAME = "notes"
+NOTES_INDEX_FILENAME = "index.json"
+NOTES_SECTION_MAX_CHARS = 32 * 1024
+NOTES_SEARCH_LIMIT = 50
+NOTES_TITLE_MAX = 40
+
+def get_notes_dir(): return os.path.join(get_data_dir(), NOTES_DIRNAME)
+
+def note_tokens(text):
+    """Mots en minuscules (>= 2 caractères) ; '28.5' donne '28', 'HUR-L1' donne 'hur' et 'l1'."""
+    import re
+    return re.findall(r"\w{2,}", text.lower())
+
+def note_title(text):
+    for line in text.splitlines():
+        line = line.strip().lstrip("#").strip()
+        if line: return line[:NOTES_TITLE_MAX].upper()
+    return "EMPTY"
+
+def split_note_sections(text, max_chars=NOTES_SECTION_MAX_CHARS):
+    """Coupe sur les titres '#', sinon sur une ligne vide une fois la taille cible atteinte."""
+    sections, current, size = [], [], 0
+    for line in text.splitlines(keepends=True):
+        if current and (line.startswith("#") or (size >= max_chars and not line.strip()) or size >= 2 * max_chars):
+            sections.append("".join(current)); current, size = [], 0
+        current.append(line); size += len(line)
+    if current: sections.append("".join(current))
+    return sections or [""]
+
+class NoteIndex:
+    """Index inversé mot -> sections, tenu à jour section par section. Recherche par préfixe de mot (frappe en cours)."""
+    def __init__(self):
+        self.postings = {}; self.section_tokens = {}; self._vocab = None
+    def update(self, sid, text):
+        new = set(note_tokens(text)); old = self.section_tokens.get(sid, set())
+        for t in old - new:
+            ids = self.postings[t]; ids.discard(sid)
+            if not ids: del self.postings[t]; self._vocab = None
+        for t in new - old:
+            ids = self.postings.get(t)
+            if ids is None: ids = self.postings[t] = set(); self._vocab = None
+            ids.add(sid)
+        self.section_tokens[sid] = new
+    def remove(self, sid): self.update(sid, ""); self.section_tokens.pop(sid, None)
+    def vocabulary(self):
+        if self._vocab is None: self._vocab = sorted(self.postings) # Retrié seulement quand le vocabulaire change
+        return self._vocab
+    def candidates(self, prefix):
+        import bisect
+        vocab = self.vocabulary(); out = set(); i = bisect.bisect_left(vocab, prefix)
+        while i < len(vocab) and vocab[i].startswith(prefix) and len(out) < len(self.section_tokens): out |= self.postings[vocab[i]]; i += 1
+        return out
+    def sections_for(self, query_tokens):
+        result = None
+        for tok in sorted(set(query_tokens), key=len, reverse=True): # Le plus sélectif d'abord
+            ids = self.candidates(tok); result = ids if result is None else result & ids
+            if not result: return set()
+        return result or set()
+
+class NoteStore:
+    """Sections de notes sur disque. Seul l'index des titres est lu au démarrage ; le texte d'une section à la demande."""
+    def __init__(self, directory):
+        self.directory = directory; self.sections = []; self.current = None; self._texts = {}; self._lower = {}; self._next_id = 1
+    def path(self, sid): return os.path.join(self.directory, f"{sid}.txt")
+    def index_path(self): return os.path.join(self.directory, NOTES_INDEX_FILENAME)
+    def section(self, sid): return next((sec for sec in self.sections if sec["id"] == sid), None)
+
+    def load(self, legacy_path=None):
+        """Retourne la liste des écritures (chemin, texte) à effectuer (migration / création)."""
+        try:
+            with open(self.index_path(), 'r', encoding='utf-8') as f: data = json.load(f)
+            self.sections = [sec for sec in data.get("sections", []) if isinstance(sec, dict) and "id" in sec]; self.current = data.get("current")
+        except FileNotFoundError: self.sections = []
+        except Exception as e: print(f"Notes index error: {e}"); self.sections = []
+        writes = []
+        if not self.sections:
+            legacy = ""
+            if legacy_path and os.path.exists(legacy_path):
+                try:
+                    with open(legacy_path, 'r', encoding='utf-8') as f: legacy = f.read()
+                except Exception as e: print(f"Notes migration error: {e}")
+            for text in split_note_sections(legacy): writes += self.add_section(text)
+            if legacy: print(f"Migrated notes into {len(self.sections)} sections")
+        self._next_id = 1 + max((int(sec["id"][1:]) for sec in self.sections if sec["id"][1:].isdigit()), default=0)
+        if self.section(self.current) is None: self.current = self.sections[0]["id"]
+        return writes + [self.index_write()] if writes else writes
+
+    def text(self, sid):
+        text = self._texts.get(sid)
+        if text is None:
+            try:
+                with open(self.path(sid), 'r', encoding='utf-8') as f: text = f.read()
+            except FileNotFoundError: text = ""
+            self._texts[sid] = text
+        return text
+    def cache_text(self, sid, text): self._texts[sid] = text; self._lower.pop(sid, None)
+    def lower(self, sid):
+        low = self._lower.get(sid)
+        if low is None: low = self._lower[sid] = self.text(sid).lower()
+        return low
+    def adopt(self, texts):
+        for sid, text in texts.items(): self._texts.setdefault(sid, text)
+
+    def add_section(self, text=""):
+        sid = f"s{self._next_id:04d}"; self._next_id += 1
+        self.sections.append({"id": sid, "title": note_title(text), "chars": len(text)}); self._texts[sid] = text
+        return [(self.path(sid), text), self.index_write()]
+    def set_text(self, sid, text):
+        """Met à jour le cache ; l'index des titres n'est réécrit que si le titre change."""
+        sec = self.section(sid); self.cache_text(sid, text); writes = [(self.path(sid), text)]
+        title = note_title(text); sec["chars"] = len(text)
+        if title != sec["title"]: sec["title"] = title; writes.append(self.index_write())
+        return writes
+    def index_write(self): return (self.index_path(), json.dumps({"version": 1, "current": self.current, "sections": self.sections}, ensure_ascii=False))
+
+    def search(self, index, query, limit=NOTES_SEARCH_LIMIT):
+        """[(sid, numéro de ligne, ligne)] : chaque mot de la requête préfixe un mot de la ligne."""
+        qt = note_tokens(query)
+        if not qt: return []
+        results = []; candidates = index.sections_for(qt)
+        for sec in self.sections:
+            sid = sec["id"]
+            if sid not in candidates: continue
+            low = self.lower(sid); src = self.text(sid); key = min(qt, key=low.count); pos = low.find(key); line_no, counted = 0, 0
+            if len(src) != len(low): src = low # lower() peut changer la longueur (rare) : on affiche la version minuscule
+            while pos != -1: # Saut direct aux occurrences du mot le plus rare de la section (str.find en C), puis vérification de la ligne
+                start = low.rfind("\n", 0, pos) + 1; end = low.find("\n", pos); end = len(low) if end == -1 else end
+                words = note_tokens(low[start:end])
+                if all(any(w.startswith(q) for w in words) for q in qt):
+                    line_no += low.count("\n", counted, start); counted = start
+                    results.append((sid, line_no, src[start:end].strip()))
+                    if len(results) >= limit: return results
+                pos = low.find(key, end)
+        return results
+
+class NoteIndexer(QThread):
+    """Lit toutes les sections et construit l'index hors du thread GUI."""
+    index_ready = pyqtSignal(object, dict) # (NoteIndex, {sid: texte})
+    def __init__(self, store, parent=None):
+        super().__init__(parent); self.paths = {sec["id"]: store.path(sec["id"]) for sec in store.sections}; self.build_ms = 0.0
+    def run(self):
+        t0 = time.perf_counter(); index = NoteIndex(); texts = {}
+        for sid, path in self.paths.items():
+            try:
+                with open(path, 'r', encoding='utf-8') as f: texts[sid] = f.read()
+            except OSError: texts[sid] = ""
+            index.update(sid, texts[sid])
+        index.vocabulary()
+        self.build_ms = (time.perf_counter() - t0) * 1000.0
+        self.index_ready.emit(index, texts)
+
+# --- THREAD ECRITURE NOTES (WRITE-BEHIND) ---
+class NotesWriter(QThread):
+    """Écrit les notes en arrière-plan. Seul le dernier instantané en attente de chaque fichier est conservé."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cond = threading.Condition(); self._pending = {}; self._busy = False; self._stopping = False
+        self.writes = 0; self.coalesced = 0; self.failures = 0
+
+    def submit(self, path, text):
+        with self._cond:
+            if path in self._pending: self.coalesced += 1
+            self._pending[path] = text; self._cond.notify_all()
+
+    def flush(self, timeout=5.0):
+        """Bloque jusqu'à ce que les instantanés en attente soient sur disque."""
+        if not self.isRunning():
+            self._write_pending(); return True
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def stop(self):
+        self.flush()
+        with self._cond: self._stopping = True; self._cond.notify_all()
+        self.wait(2000)
+
+    def run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending and self._stopping: return
+            self._write_pending()
+
+    def _write_pending(self):
+        with self._cond:
+            jobs = self._pending; self._pending = {}; self._busy = bool(jobs)
+        if not jobs: return
+        try:
+            for path, text in jobs.items():
+                try: atomic_write_text(path, text); self.writes += 1
+                except Exception as e: self.failures += 1; print(f"Error saving notes: {e}")
+        finally:
+            with self._cond: self._busy = False; self._cond.notify_all()
 
 # --- WIDGET NOTES PERSISTANTES ---
+NOTES_SAVE_DELAY_MS = 1500 # Fenêtre d'inactivité avant écriture
+
 class NotesWidget(QTextEdit):
-    def __init__(self, parent=None):
+    """Éditeur d'une seule section : le QTextEdit ne contient jamais tout le carnet."""
+    section_changed = pyqtSignal(str)
+    index_changed = pyqtSignal()
+    def __init__(self, parent=None, save_delay_ms=NOTES_SAVE_DELAY_MS):
         super().__init__(parent)
         self.setPlaceholderText("ENTER MISSION COORDINATES / TRADING NOTES...")
-        self.setStyleSheet("""
-            background-color: #050505; 
-            border: 1px solid #2affea; 
-            color: #2affea; 
-            font-family: 'Consolas'; 
-            font-size: 13px;
-        """)
+        self.setObjectName("notes_editor")
+        self.dirty = False; self.edit_count = 0; self.snapshot_count = 0; self._loading = False
+        self.store = None; self.index = None; self.indexer = None; self.section_id = None; self._index_stale = False; self._edited = set(); self.load_ms = 0.0
+        self.writer = NotesWriter(); self.writer.start()
+        self.save_timer = QTimer(self); self.save_timer.setSingleShot(True); self.save_timer.setInterval(save_delay_ms); self.save_timer.timeout.connect(self.save_notes)
         self.load_notes()
-        self.textChanged.connect(self.save_notes)
+        self.textChanged.connect(self.mark_dirty)
+
+    def set_save_delay(self, ms): self.save_timer.setInterval(ms)
 
     def load_notes(self):
-        path = get_notes_path()
-        if os.path.exists(path):
-            try:
-                with open(path, "r", encoding='utf-8') as f:
-                    self.setText(f.read())
-            except: pass
+        """Index des sections + section courante uniquement ; l'index plein texte se construit en arrière-plan."""
+        t0 = time.perf_counter()
+        if self.indexer is not None: self.indexer.wait()
+        self.store = NoteStore(get_notes_dir()); self.index = None; self._edited.clear()
+        try: os.makedirs(self.store.directory, exist_ok=True)
+        except OSError as e: print(f"Notes folder error: {e}")
+        writes = self.store.load(get_notes_path())
+        for path, text in writes: self.writer.submit(path, text)
+        if writes and os.path.exists(get_notes_path()):
+            self.writer.flush()
+            try: os.replace(get_notes_path(), get_notes_path() + ".migrated")
+            except OSError as e: print(f"Notes migration error: {e}")
+        self.section_id = None; self.open_section(self.store.current)
+        self.load_ms = (time.perf_counter() - t0) * 1000.0
+        self.indexer = NoteIndexer(self.store); self.indexer.index_ready.connect(self.on_index_ready); self.indexer.start()
+
+    def on_index_ready(self, index, texts):
+        if self.sender() is not self.indexer: return # Indexeur d'un dossier précédent
+        for sid in self._edited: index.update(sid, self.store.text(sid)) # Sections éditées pendant la construction
+        self.store.adopt(texts); self._edited.clear(); self.index = index; self.sync_index(); self.index_changed.emit()
+
+    def open_section(self, sid):
+        if sid == self.section_id or self.store.section(sid) is None: return
+        self.save_notes()
+        self._loading = True
+        try: self.setPlainText(self.store.text(sid))
+        finally: self._loading = False
+        self.section_id = sid; self.store.current = sid; self.dirty = False; self.section_changed.emit(sid)
+
+    def new_section(self):
+        self.save_notes()
+        for path, text in self.store.add_section(""): self.writer.submit(path, text)
+        self.open_section(self.store.sections[-1]["id"])
+
+    def mark_dirty(self):
+        if self._loading: return
+        self.dirty = True; self._index_stale = True; self.edit_count += 1; self.save_timer.start() # Relance la fenêtre à chaque frappe
+
+    def sync_index(self):
+        """Réindexe la section en cours d'édition (la seule qui peut avoir changé)."""
+        if self._index_stale and self.index is not None:
+            text = self.toPlainText(); self.store.cache_text(self.section_id, text); self.index.update(self.section_id, text)
+        self._index_stale = self.index is None and self._index_stale
+
+    def search(self, query):
+        if self.index is None: return None # Index en construction
+        self.sync_index(); return self.store.search(self.index, query)
 
     def save_notes(self):
-        try:
-            with open(get_notes_path(), "w", encoding='utf-8') as f:
-                f.write(self.toPlainText())
-        except Exception as e:
-            print(f"Error saving notes: {e}")
+        """Sérialise la section une seule fois par fenêtre d'inactivité et délègue l'écriture."""
+        self.save_timer.stop()
+        if not self.dirty: return
+        self.dirty = False; self.snapshot_count += 1
+        text = self.toPlainText(); title = self.store.section(self.section_id)["title"]
+        for path, data in self.store.set_text(self.section_id, text): self.writer.submit(path, data)
+        if self.index is not None: self.index.update(self.section_id, text); self._index_stale = False
+        else: self._edited.add(self.section_id)
+        if self.store.section(self.section_id)["title"] != title: self.section_changed.emit(self.section_id)
+
+    def goto_line(self, sid, line_no):
+        self.open_section(sid)
+        block = self.document().findBlockByNumber(line_no)
+        if block.isValid():
+            cursor = self.textCursor(); cursor.setPosition(block.position()); cursor.movePosition(cursor.MoveOperation.EndOfBlock, cursor.MoveMode.KeepAnchor)
+            self.setTextCursor(cursor); self.ensureCursorVisible()
+
+    def flush(self):
+        """Écriture garantie (quit, déplacement du dossier de données)."""
+        self.save_notes()
+        if self.store: self.writer.submit(*self.store.index_write()) # Mémorise la section courante
+        return self.writer.flush()
+
+    def shutdown(self):
+        self.flush(); self.writer.stop()
+        if self.indexer is not None: self.indexer.wait(2000)
+
+    def save_stats(self):
+        return {"edits": self.edit_count, "snapshots": self.snapshot_count, "writes": self.writer.writes,
+                "coalesced": max(0, self.edit_count - self.writer.writes), "coalesced_in_queue": self.writer.coalesced, "failures": self.writer.failures}
+
+class NotesPanel(QWidget):
+    """Recherche + sélecteur de section au-dessus de l'éditeur ; les résultats remplacent l'éditeur tant qu'une requête est saisie."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self); layout.setContentsMargins(0, 0, 0, 0); layout.setSpacing(4); top = QHBoxLayout(); top.setSpacing(4)
+        self.search_box = QLineEdit(); self.search_box.setObjectName("notes_search"); self.search_box.setPlaceholderText("SEARCH NOTES..."); self.search_box.setClearButtonEnabled(True)
+        self.section_combo = QComboBox(); self.section_combo.setObjectName("notes_sections"); self.section_combo.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        new_btn = QPushButton("+"); new_btn.setFixedSize(36, 30); new_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        top.addWidget(self.search_box, 2); top.addWidget(self.section_combo, 1); top.addWidget(new_btn); layout.addLayout(top)
+        self.editor = NotesWidget(); self.results = QListWidget(); self.results.setObjectName("notes_results"); self.results.hide()
+        layout.addWidget(self.editor); layout.addWidget(self.results)
+        self.search_box.textChanged.connect(self.run_search); self.results.itemClicked.connect(self.open_result)
+        self.section_combo.activated.connect(lambda i: self.editor.open_section(self.section_combo.itemData(i)))
+        new_btn.clicked.connect(self.editor.new_section); self.editor.section_changed.connect(self.refresh_sections)
+        self.editor.index_changed.connect(lambda: self.run_search(self.search_box.text()) if self.search_box.text() else None)
+        self.refresh_sections(); self.last_search_ms = 0.0
+
+    def refresh_sections(self, *_):
+        self.section_combo.blockSignals(True); self.section_combo.clear()
+        for sec in self.editor.store.sections: self.section_combo.addItem(sec["title"], sec["id"])
+        self.section_combo.setCurrentIndex(max(0, self.section_combo.findData(self.editor.section_id))); self.section_combo.blockSignals(False)
+
+    def run_search(self, query):
+        if not query.strip(): self.results.hide(); self.editor.show(); return
+        t0 = time.perf_counter(); hits = self.editor.search(query); self.last_search_ms = (time.perf_counter() - t0) * 1000.0
+        self.results.clear()
+        if hits is None: self.results.addItem("INDEXING...")
+        else:
+            titles = {sec["id"]: sec["title"] for sec in self.editor.store.sections}
+            for sid, line_no, line in hits:
+                item = QListWidgetItem(f"{titles.get(sid, sid)} :{line_no + 1}  {line}"); item.setData(Qt.ItemDataRole.UserRole, (sid, line_no)); self.results.addItem(item)
+            if not hits: self.results.addItem("NO MATCH")
+        self.editor.hide(); self.results.show()
+
+    def open_result(self, item):
+        target = item.data(Qt.ItemDataRole.UserRole)
+        if not target: return
+        self.search_box.blockSignals(True); self.search_box.clear(); self.search_box.blockSignals(False)
+        self.results.hide(); self.editor.show(); self.editor.goto_line(*target); self.editor.setFocus()
 
 # --- CLASSE BOUTON ROBUSTE ---
 class HoldButton(QPushButton):
+    """Bouton à maintien. Le tactile passe par TouchRouter (un point de contact par maintien), la souris par ici."""
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
         self.on_press_callback = None
         self.on_release_callback = None
-        self.setAttribute(Qt.WidgetAttribute.WA_AcceptTouchEvents, True)
         self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
 
-    def event(self, e):
-        typ = e.type()
-        if typ == QEvent.Type.TouchBegin:
-            if self.on_press_callback: self.on_press_callback()
-            e.accept(); return True
-        elif typ == QEvent.Type.TouchEnd or typ == QEvent.Type.TouchCancel:
-            if self.on_release_callback: self.on_release_callback()
-            e.accept(); return True
-        return super().event(e)
     def mousePressEvent(self, e):
         if self.on_press_callback: self.on_press_callback()
         super().mousePressEvent(e)
@@ -198,41 +1674,219 @@ class HoldButton(QPushButton):
         if self.on_release_callback: self.on_release_callback()
         super().mouseReleaseEvent(e)
 
+# --- ENTREE TACTILE MULTI-POINTS ---
+TOUCH_LATENCY_SAMPLES = 500
+TOUCH_CLOCK_SANITY_MS = 10_000 # Horodatage Qt sur une autre horloge que time.monotonic : latence non comptée
+TOUCH_EVENT_TYPES = (QEvent.Type.TouchBegin, QEvent.Type.TouchUpdate, QEvent.Type.TouchEnd, QEvent.Type.TouchCancel)
+
+class TouchRouter(QObject):
+    """Suit chaque point de contact du deck et déclenche son bouton dès l'appui, sans passer par la synthèse souris.
+    Un point = un bouton : maintenir EJECT d'un doigt et taper DECOY d'un autre fonctionne. Hors bouton, le tactile
+    est laissé à Qt (souris synthétisée pour les notes, listes, combos)."""
+    def __init__(self, root):
+        super().__init__(root); self.root = root; self.points = {}; self.held = {}
+        self.latencies_ms = deque(maxlen=TOUCH_LATENCY_SAMPLES); self.dispatch_ms = deque(maxlen=TOUCH_LATENCY_SAMPLES); self.untimed = 0
+        root.setAttribute(Qt.WidgetAttribute.WA_AcceptTouchEvents, True); root.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        typ = event.type()
+        if obj is not self.root or typ not in TOUCH_EVENT_TYPES: return False
+        if typ == QEvent.Type.TouchCancel: self.cancel_all(); event.accept(); return True
+        handled = self.route([(pt.id(), pt.state(), pt.globalPosition()) for pt in event.points()], event.timestamp())
+        if handled or typ != QEvent.Type.TouchBegin or self.points: event.accept(); return True
+        event.ignore(); return False # Aucun bouton touché : synthèse souris normale
+
+    def route(self, points, ts_ms):
+        """points : [(id, QEventPoint.State, position globale)]. Retourne True si au moins un bouton a été appuyé/relâché."""
+        t0 = time.perf_counter(); handled = False
+        for pid, state, gpos in points:
+            if state == QEventPoint.State.Pressed and pid not in self.points:
+                btn = self.button_at(gpos)
+                if btn is None: continue
+                self.points[pid] = btn; self.press(btn); handled = True; self.record_latency(ts_ms)
+            elif state == QEventPoint.State.Released and pid in self.points:
+                self.release(self.points.pop(pid)); handled = True
+        if handled: self.dispatch_ms.append((time.perf_counter() - t0) * 1000.0)
+        return handled
+
+    def button_at(self, gpos):
+        w = self.root.childAt(self.root.mapFromGlobal(gpos).toPoint())
+        while w is not None and w is not self.root and not isinstance(w, QAbstractButton): w = w.parentWidget()
+        return w if isinstance(w, QAbstractButton) and w.isEnabled() and w.isVisible() else None
+
+    def press(self, btn):
+        self.held[btn] = self.held.get(btn, 0) + 1
+        if self.held[btn] > 1: return # Deuxième doigt sur le même bouton
+        if isinstance(btn, HoldButton):
+            if btn.on_press_callback: btn.on_press_callback()
+        else: btn.click() # Action à l'appui, pas au relâcher
+        btn.setDown(True)
+
+    def release(self, btn):
+        self.held[btn] -= 1
+        if self.held[btn] > 0: return
+        del self.held[btn]; btn.setDown(False)
+        if isinstance(btn, HoldButton) and btn.on_release_callback: btn.on_release_callback()
+
+    def cancel_all(self):
+        for pid in list(self.points): self.release(self.points.pop(pid))
+
+    def record_latency(self, ts_ms):
+        """Horodatage de l'événement Qt -> action envoyée. Windows (GetMessageTime) et X11 partagent la base de time.monotonic."""
+        if not ts_ms: self.untimed += 1; return
+        now = time.monotonic() * 1000.0; lat = now - ts_ms if ts_ms >= 2 ** 32 else (now - ts_ms) % 2 ** 32 # Horodatages 32 bits qui rebouclent
+        if 0 <= lat < TOUCH_CLOCK_SANITY_MS: self.latencies_ms.append(lat)
+        else: self.untimed += 1
+
+    def inject(self, touches, ts_ms=None):
+        """Injection synthétique (bancs, tests) : touches = [(id, état, widget)], appui au centre du widget."""
+        ts_ms = time.monotonic() * 1000.0 if ts_ms is None else ts_ms
+        return self.route([(pid, state, QPointF(w.mapToGlobal(w.rect().center()))) for pid, state, w in touches], ts_ms)
+
+    def latency_stats(self):
+        vals = list(self.latencies_ms); disp = list(self.dispatch_ms)
+        return {"count": len(vals), "p50_ms": percentile(vals, 50), "p99_ms": percentile(vals, 99), "dispatch_p99_ms": percentile(disp, 99), "untimed": self.untimed}
+
+# --- ORDONNANCEUR CENTRAL (UN SEUL TIMER POUR TOUT LE DECK) ---
+SCHED_FRAME_MS = 16 # Cadence des animations (~60 Hz), uniquement quand une animation tourne
+SCHED_MAX_SLACK_MS = 50 # Une tâche lente peut partir jusqu'à 10 % (max 50 ms) en avance pour partager un réveil
+COSMETIC_THROTTLE_FACTOR = 4 # Jeu au premier plan : tâches cosmétiques 4x plus lentes
+
+class _Job:
+    __slots__ = ("name", "fn", "interval_ms", "due", "last", "slack", "repeat", "cosmetic", "animation")
+    def __init__(self, name, fn, interval_ms, repeat, cosmetic=False, animation=False):
+        self.name = name; self.fn = fn; self.interval_ms = interval_ms; self.repeat = repeat; self.cosmetic = cosmetic; self.animation = animation
+        self.slack = 0.0 if animation or not repeat else min(interval_ms * 0.1, SCHED_MAX_SLACK_MS) / 1000.0
+        self.last = time.perf_counter(); self.due = self.last + interval_ms / 1000.0
+
+class FrameScheduler:
+    """Regroupe les tâches échues dans un seul réveil. Timer précis à la cadence d'affichage tant qu'une animation est active,
+    sinon timer grossier armé sur la prochaine échéance (aucun réveil quand rien n'est dû)."""
+    def __init__(self):
+        self.jobs = {}; self.cosmetic_factor = 1; self.track_lateness = False; self.lateness_ms = {}
+        self.wakeups = 0; self.jobs_run = 0
+        self.timer = QTimer(); self.timer.setSingleShot(True); self.timer.timeout.connect(self.tick)
+
+    def every(self, name, interval_ms, fn, cosmetic=False): self._add(_Job(name, fn, interval_ms, True, cosmetic))
+    def after(self, name, delay_ms, fn): self._add(_Job(name, fn, delay_ms, False))
+    def animate(self, name, fn):
+        """fn(dt_s) à chaque image ; retourne False pour s'arrêter."""
+        job = _Job(name, fn, SCHED_FRAME_MS, True, animation=True); job.due = time.perf_counter(); self._add(job)
+    def cancel(self, name):
+        if self.jobs.pop(name, None) is not None: self._rearm()
+    def pending(self, name): return name in self.jobs
+    def animating(self): return any(j.animation for j in self.jobs.values())
+
+    def set_cosmetic_factor(self, factor):
+        """1 = normal, >1 = ralenti, 0 = suspendu (écran éteint)."""
+        if factor == self.cosmetic_factor: return
+        self.cosmetic_factor = factor; now = time.perf_counter()
+        for job in self.jobs.values():
+            if job.cosmetic: job.due = now + self._interval(job) / 1000.0
+        self._rearm()
+
+    def _interval(self, job): return job.interval_ms * self.cosmetic_factor if job.cosmetic else job.interval_ms
+    def _add(self, job): self.jobs[job.name] = job; self._rearm()
+
+    def _rearm(self):
+        if not self.jobs: self.timer.stop(); return
+        active = [j for j in self.jobs.values() if not (j.cosmetic and self.cosmetic_factor == 0)]
+        if not active: self.timer.stop(); return
+        delay = min(j.due for j in active) - time.perf_counter()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer if self.animating() else Qt.TimerType.CoarseTimer)
+        self.timer.start(max(0, math.ceil(delay * 1000)))
+
+    def tick(self):
+        now = time.perf_counter(); self.wakeups += 1
+        due = [j for j in self.jobs.values() if j.due - j.slack <= now and not (j.cosmetic and self.cosmetic_factor == 0)]
+        for job in due:
+            if self.jobs.get(job.name) is not job: continue # Annulée ou remplacée par une tâche précédente du même tick
+            if self.track_lateness: self.lateness_ms.setdefault(job.name, deque(maxlen=200)).append(max(0.0, (now - job.due) * 1000.0))
+            if job.repeat:
+                job.due += self._interval(job) / 1000.0
+                if job.due < now: job.due = now + self._interval(job) / 1000.0 # Pas de rafale de rattrapage
+            else: del self.jobs[job.name]
+            self.jobs_run += 1; dt = now - job.last; job.last = now
+            try: keep = job.fn(dt) if job.animation else job.fn()
+            except Exception as e: print(f"Scheduler job {job.name} error: {e}"); keep = None
+            if job.animation and keep is False and self.jobs.get(job.name) is job: del self.jobs[job.name]
+        self._rearm()
+
 # --- OVERLAYS ---
+FRAME_BUDGET_MS = 16.0
+
 class ActionOverlay(QWidget):
+    BAR_HEIGHT = 60; STRIPE_WIDTH = 30; DISC_RADIUS = 150
     def __init__(self, parent=None):
         super().__init__(parent)
         self.progress = 0.0; self.triggered = False; self.active = False; self.color = QColor(255, 0, 0); self.text_main = "ACTION"; self.stripe_offset = 0.0
+        self._tape_tile = None; self._disc_cache = None; self.frame_times_ms = deque(maxlen=240); self.frames_over_budget = 0
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True); self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True); self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True); self.setFocusPolicy(Qt.FocusPolicy.NoFocus); self.show()
-    def set_config(self, color, text): self.color = color; self.text_main = text
+    def set_config(self, color, text):
+        if color != self.color: self._tape_tile = None # Le ruban dépend de la couleur
+        self.color = color; self.text_main = text
     def set_state(self, active, progress=0.0, triggered=False):
         self.active = active; self.progress = progress; self.triggered = triggered
         if active:
             self.stripe_offset += 2.0; 
             if self.stripe_offset > 60: self.stripe_offset = 0
-        self.update() 
+        self.update(self.damage_region())
+
+    def disc_rect(self):
+        r = self.DISC_RADIUS + 2; return QRect(int(self.width() / 2 - r), int(self.height() / 2 - r), 2 * r, 2 * r)
+    def damage_region(self):
+        """Seules zones repeintes : le disque (arc + texte) et les deux bandes de ruban."""
+        w, h = self.width(), self.height(); bh = self.BAR_HEIGHT + 2
+        region = QRegion(self.disc_rect()); region += QRect(0, 0, w, bh); region += QRect(0, h - bh, w, bh)
+        return region
+
+    def _new_pixmap(self, w, h):
+        dpr = self.devicePixelRatioF(); pm = QPixmap(int(w * dpr), int(h * dpr)); pm.setDevicePixelRatio(dpr); pm.fill(Qt.GlobalColor.transparent)
+        return pm
+    def tape_tile(self):
+        """Une période du ruban (fond teinté + bande noire), répétée par un pinceau texturé."""
+        if self._tape_tile is None:
+            period = self.STRIPE_WIDTH * 2; bh = self.BAR_HEIGHT; pm = self._new_pixmap(period, bh); p = QPainter(pm); p.setRenderHint(QPainter.RenderHint.Antialiasing)
+            p.fillRect(0, 0, period, bh, QColor(self.color.red(), self.color.green(), self.color.blue(), 100)); p.setPen(Qt.PenStyle.NoPen); p.setBrush(QColor(0, 0, 0, 220))
+            x = -bh - period
+            while x < period + bh:
+                p.drawPolygon(QPolygonF([QPointF(x, 0), QPointF(x + self.STRIPE_WIDTH, 0), QPointF(x + self.STRIPE_WIDTH - bh, bh), QPointF(x - bh, bh)])); x += period
+            p.end(); self._tape_tile = pm
+        return self._tape_tile
+    def disc_cache(self):
+        """Disque sombre + piste grise, identiques à chaque image."""
+        if self._disc_cache is None:
+            d = self.DISC_RADIUS * 2; pm = self._new_pixmap(d, d); p = QPainter(pm); p.setRenderHint(QPainter.RenderHint.Antialiasing)
+            p.setBrush(QColor(0, 0, 0, 180)); p.setPen(Qt.PenStyle.NoPen); p.drawEllipse(0, 0, d, d)
+            p.setPen(QPen(QColor(50, 50, 50, 200), 15)); p.drawEllipse(QRectF(30, 30, d - 60, d - 60)) # Même pinceau : intérieur assombri deux fois
+            p.end(); self._disc_cache = pm
+        return self._disc_cache
+
+    def frame_stats(self):
+        vals = list(self.frame_times_ms)
+        return {"frames": len(vals), "avg_ms": sum(vals) / len(vals) if vals else 0.0, "p99_ms": percentile(vals, 99), "max_ms": max(vals) if vals else 0.0, "over_budget": self.frames_over_budget}
+
     def paintEvent(self, event):
         if not self.active: return
-        painter = QPainter(self); painter.setRenderHint(QPainter.RenderHint.Antialiasing); w, h = self.width(), self.height(); cx, cy = w / 2, h / 2
-        painter.setBrush(QColor(0, 0, 0, 180)); painter.setPen(Qt.PenStyle.NoPen); painter.drawEllipse(int(cx-150), int(cy-150), 300, 300)
-        rect = QRectF(cx-120, cy-120, 240, 240); pen_track = QPen(QColor(50, 50, 50, 200), 15); painter.setPen(pen_track); painter.drawEllipse(rect)
-        prog_color = self.color.lighter(150) if self.triggered else self.color
-        pen_prog = QPen(prog_color, 15); pen_prog.setCapStyle(Qt.PenCapStyle.RoundCap); painter.setPen(pen_prog); span_angle = int(-360 * self.progress * 16); painter.drawArc(rect, 90 * 16, span_angle)
-        painter.setPen(QColor(255, 255, 255)); font = painter.font(); font.setPointSize(24 if self.triggered else 18); font.setBold(True); font.setFamily("Verdana"); painter.setFont(font)
-        txt = f"{self.text_main}\nENGAGED" if self.triggered else f"{self.text_main}\n{int(self.progress*100)}%"; painter.drawText(QRectF(cx-150, cy-150, 300, 300), Qt.AlignmentFlag.AlignCenter, txt)
-        bar_height = 60; stripe_width = 30
-        def draw_caution_tape(rect_zone):
-            painter.save(); painter.setClipRect(rect_zone); bg_color = QColor(self.color.red(), self.color.green(), self.color.blue(), 100); painter.fillRect(rect_zone, bg_color)
-            painter.setPen(Qt.PenStyle.NoPen); painter.setBrush(QColor(0, 0, 0, 220))
-            start_x = -bar_height; current_x = start_x + self.stripe_offset
-            while current_x < w + bar_height:
-                poly = QPolygonF([QPointF(current_x, rect_zone.top()), QPointF(current_x + stripe_width, rect_zone.top()), QPointF(current_x + stripe_width - bar_height, rect_zone.bottom()), QPointF(current_x - bar_height, rect_zone.bottom())]); painter.drawPolygon(poly); current_x += stripe_width * 2
-            painter.setPen(QPen(self.color, 3)); line_y = bar_height if rect_zone.top() == 0 else h - bar_height; painter.drawLine(0, line_y, w, line_y); painter.restore()
-        draw_caution_tape(QRect(0, 0, w, bar_height)); draw_caution_tape(QRect(0, h - bar_height, w, bar_height))
+        t0 = time.perf_counter()
+        painter = QPainter(self); painter.setRenderHint(QPainter.RenderHint.Antialiasing); w, h = self.width(), self.height(); cx, cy = w / 2, h / 2; r = self.DISC_RADIUS
+        if event.region().intersects(self.disc_rect()):
+            painter.drawPixmap(int(cx - r), int(cy - r), self.disc_cache())
+            rect = QRectF(cx-120, cy-120, 240, 240); prog_color = self.color.lighter(150) if self.triggered else self.color
+            pen_prog = QPen(prog_color, 15); pen_prog.setCapStyle(Qt.PenCapStyle.RoundCap); painter.setPen(pen_prog); span_angle = int(-360 * self.progress * 16); painter.drawArc(rect, 90 * 16, span_angle)
+            painter.setPen(QColor(255, 255, 255)); font = painter.font(); font.setPointSize(24 if self.triggered else 18); font.setBold(True); font.setFamily("Verdana"); painter.setFont(font)
+            txt = f"{self.text_main}\nENGAGED" if self.triggered else f"{self.text_main}\n{int(self.progress*100)}%"; painter.drawText(QRectF(cx-r, cy-r, 2*r, 2*r), Qt.AlignmentFlag.AlignCenter, txt)
+        bh = self.BAR_HEIGHT; tape = QBrush(self.tape_tile())
+        for zone, line_y in ((QRect(0, 0, w, bh), bh), (QRect(0, h - bh, w, bh), h - bh)):
+            tape.setTransform(QTransform.fromTranslate(self.stripe_offset, zone.top()))
+            painter.setClipRect(zone); painter.fillRect(zone, tape); painter.setPen(QPen(self.color, 3)); painter.drawLine(0, line_y, w, line_y)
+        painter.end()
+        ms = (time.perf_counter() - t0) * 1000.0; self.frame_times_ms.append(ms)
+        if ms > FRAME_BUDGET_MS: self.frames_over_budget += 1
 
 class SystemOverlay(QWidget):
     def __init__(self, parent=None):
-        super().__init__(parent); self.mode = "NONE"; self.logs = []; self.opacity = 1.0; self.shutdown_y_scale = 1.0; self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True); self.show()
+        super().__init__(parent); self.mode = "NONE"; self.logs = []; self.opacity = 1.0; self.shutdown_y_scale = 1.0; self.frame_times_ms = deque(maxlen=240); self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True); self.show()
     def set_mode(self, mode):
         self.mode = mode
         if mode == "BOOT": self.opacity = 1.0; self.logs = []; self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, False)
@@ -244,61 +1898,463 @@ class SystemOverlay(QWidget):
         if self.opacity <= 0: self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
         self.update()
     def paintEvent(self, event):
+        t0 = time.perf_counter(); self._paint_frame(event); self.frame_times_ms.append((time.perf_counter() - t0) * 1000.0)
+    def _paint_frame(self, event):
         if self.opacity <= 0 and self.mode == "BOOT": return
         painter = QPainter(self); painter.setRenderHint(QPainter.RenderHint.Antialiasing); w, h = self.width(), self.height()
         if self.mode == "SHUTDOWN":
             painter.setBrush(QColor(0, 0, 0)); painter.setPen(Qt.PenStyle.NoPen); visible_h = h * self.shutdown_y_scale; painter.fillRect(self.rect(), QColor(0, 0, 0))
             if self.shutdown_y_scale < 0.05: painter.setPen(QPen(QColor(255, 255, 255), 2)); painter.drawLine(0, int(h/2), w, int(h/2)); return
-            painter.setPen(QColor(255, 50, 50)); font = painter.font(); font.setPointSize(30); font.setBold(True); font.setFamily("Consolas"); painter.setFont(font); painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "SYSTEM DISENGAGED"); return
+            painter.setPen(THEME.color("shutdown_text")); font = painter.font(); font.setPointSize(30); font.setBold(True); font.setFamily("Consolas"); painter.setFont(font); painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "SYSTEM DISENGAGED"); return
         if self.mode == "BOOT":
-            painter.setOpacity(self.opacity); painter.fillRect(self.rect(), QColor(0, 0, 0)); painter.setPen(QColor(42, 255, 234)); font = painter.font(); font.setPointSize(24); font.setBold(True); font.setFamily("Verdana"); painter.setFont(font); painter.drawText(QRect(0, 100, w, 50), Qt.AlignmentFlag.AlignCenter, "RSI SYSTEMS // BOOTLOADER")
+            painter.setOpacity(self.opacity); painter.fillRect(self.rect(), QColor(0, 0, 0)); accent = THEME.color("accent"); painter.setPen(accent); font = painter.font(); font.setPointSize(24); font.setBold(True); font.setFamily("Verdana"); painter.setFont(font); painter.drawText(QRect(0, 100, w, 50), Qt.AlignmentFlag.AlignCenter, "RSI SYSTEMS // BOOTLOADER")
             font.setPointSize(12); font.setFamily("Consolas"); painter.setFont(font); y_pos = h - 200
             for line in self.logs: painter.drawText(50, y_pos, line); y_pos += 20
-            bar_w = w - 100; painter.setPen(QPen(QColor(42, 255, 234), 2)); painter.drawRect(50, h - 50, bar_w, 20); 
+            bar_w = w - 100; painter.setPen(QPen(accent, 2)); painter.drawRect(50, h - 50, bar_w, 20); 
             max_fill = bar_w - 8 
             fill_w = int(max_fill * (len(self.logs) / 8.0)); 
-            painter.fillRect(54, h - 46, fill_w, 12, QColor(42, 255, 234))
+            painter.fillRect(54, h - 46, fill_w, 12, accent)
+
+# --- SERVEUR RESEAU MFD (TABLETTES / TELEPHONES) ---
+# Un seul port : WebSocket (navigateurs) ou TCP brut avec une ligne JSON par message.
+# Client -> serveur : {"t":"auth","token":..} {"t":"action","a":"DECOY","id":1} {"t":"hold","m":"EJECT","s":"start"|"stop"}
+#                     {"t":"atc"} {"t":"power_dec","target":"WEAPONS"} {"t":"macro","m":"SALVO","s":"start"|"cancel"} {"t":"ping","id":1}
+# Serveur -> client : hello, ack, pong, "tm" (deltas de télémétrie), "log" (nouvelles lignes du journal)
+NET_PROTOCOL_VERSION = 1
+NET_CLIENT_QUEUE_MAX = 256 # Lignes de journal en attente par client ; au-delà, les plus anciennes sont perdues
+NET_MAX_MESSAGE_BYTES = 64 * 1024
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+NET_HOLD_MODES = ("EJECT", "AUTOLAND")
+
+def is_loopback_host(host):
+    import ipaddress
+    if host == "localhost": return True
+    try: return ipaddress.ip_address(host).is_loopback
+    except ValueError: return False
+
+class _LineTransport:
+    def __init__(self, reader, writer, first_line=b""): self.reader = reader; self.writer = writer; self._first = first_line
+    async def recv(self):
+        if self._first: line, self._first = self._first, b""
+        else: line = await self.reader.readline()
+        return line.decode("utf-8", "replace").strip() if line else None
+    def send(self, text):
+        if not self.writer.is_closing(): self.writer.write(text.encode("utf-8") + b"\n")
+
+class _WebSocketTransport:
+    """RFC 6455 minimal : trames texte non fragmentées, ping/pong, close."""
+    def __init__(self, reader, writer): self.reader = reader; self.writer = writer
+    @staticmethod
+    async def handshake(reader, writer, request_line):
+        import base64, hashlib
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line or line in (b"\r\n", b"\n"): break
+            name, _, value = line.decode("latin-1").partition(":"); headers[name.strip().lower()] = value.strip()
+        key = headers.get("sec-websocket-key")
+        if not key: writer.write(b"HTTP/1.1 400 Bad Request\r\n\r\n"); return None
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Accept: " + accept + "\r\n\r\n").encode())
+        query = request_line.split(b" ")[1].decode("latin-1") if b" " in request_line else ""
+        return _WebSocketTransport(reader, writer), query
+    async def recv(self):
+        while True:
+            head = await self.reader.readexactly(2)
+            opcode = head[0] & 0x0F; masked = head[1] & 0x80; length = head[1] & 0x7F
+            if length == 126: length = int.from_bytes(await self.reader.readexactly(2), "big")
+            elif length == 127: length = int.from_bytes(await self.reader.readexactly(8), "big")
+            if length > NET_MAX_MESSAGE_BYTES: return None
+            mask = await self.reader.readexactly(4) if masked else b"\0\0\0\0"
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(await self.reader.readexactly(length)))
+            if opcode == 0x8: return None
+            if opcode == 0x9: self._frame(0xA, payload); continue
+            if opcode == 0x1: return payload.decode("utf-8", "replace")
+    def _frame(self, opcode, payload):
+        n = len(payload)
+        head = bytes([0x80 | opcode, n]) if n < 126 else bytes([0x80 | opcode, 126]) + n.to_bytes(2, "big") if n < 65536 else bytes([0x80 | opcode, 127]) + n.to_bytes(8, "big")
+        if not self.writer.is_closing(): self.writer.write(head + payload)
+    def send(self, text): self._frame(0x1, text.encode("utf-8"))
+
+class _NetClient:
+    """File d'envoi propre à chaque client : un client lent ne retarde jamais les autres."""
+    def __init__(self, transport, peer, asyncio_mod):
+        self.transport = transport; self.peer = peer; self.direct = deque(maxlen=NET_CLIENT_QUEUE_MAX); self.logs = deque(maxlen=NET_CLIENT_QUEUE_MAX)
+        self.tm = {}; self.dropped = 0; self.wakeup = asyncio_mod.Event(); self.authed = False
+    def push_direct(self, msg): self.direct.append(msg); self.wakeup.set()
+    def push_log(self, msg):
+        if len(self.logs) == self.logs.maxlen: self.dropped += 1
+        self.logs.append(msg); self.wakeup.set()
+    def push_tm(self, delta): self.tm.update(delta); self.wakeup.set() # Fusion : jamais perdu, seulement coalescé
+
+class MFDServer(QThread):
+    """Serveur asyncio dans son propre thread, qui ne fait que valider et acquitter. Toute commande, touches simples comprises,
+    est exécutée par le thread GUI via remote_command (bindings, flux et journal y sont remplacés par les rechargements)."""
+    remote_command = pyqtSignal(dict)
+    def __init__(self, actions, host="127.0.0.1", port=0, token="", parent=None, macros=()):
+        super().__init__(parent)
+        if not token and not is_loopback_host(host): raise ValueError(f"refusing to serve {host} without NET_SERVER_TOKEN")
+        self.actions = sorted(actions); self.macros = sorted(macros); self.host = host; self.port = port; self.token = token or ""
+        self.clients = set(); self._loop = None; self._stop = None; self._last_tm = {}; self.ready = threading.Event()
+        self.messages_in = 0; self.messages_out = 0
+
+    # --- API thread GUI (thread-safe, jamais bloquante) ---
+    def publish_telemetry(self, snap):
+        if self._loop: self._loop.call_soon_threadsafe(self._broadcast_tm, snap)
+    def publish_log(self, text, level, ts=None):
+        if self._loop and self.clients: self._loop.call_soon_threadsafe(self._broadcast, {"t": "log", "ts": round(ts or time.time(), 3), "l": level, "x": text})
+    def stop(self):
+        if self._loop: self._loop.call_soon_threadsafe(self._stop.set)
+        self.wait(3000)
+
+    def run(self):
+        import asyncio
+        self._asyncio = asyncio
+        try: asyncio.run(self._main())
+        except Exception as e: print(f"MFD server error: {e}")
+        finally: self._loop = None; self.ready.set()
+
+    async def _main(self):
+        asyncio = self._asyncio
+        self._stop = asyncio.Event(); server = await asyncio.start_server(self._handle, self.host, self.port, limit=NET_MAX_MESSAGE_BYTES) # Ligne plus longue : ValueError dans readline
+        self.port = server.sockets[0].getsockname()[1]; self._loop = asyncio.get_running_loop(); self.ready.set()
+        print(f"MFD server listening on {self.host}:{self.port}")
+        async with server:
+            await self._stop.wait()
+            for client in list(self.clients): client.transport.writer.close()
+
+    # --- Diffusion (boucle asyncio) ---
+    def _live_clients(self):
+        """Clients authentifiés encore connectés ; les connexions fermées sont retirées de la diffusion."""
+        for client in [c for c in self.clients if c.transport.writer.is_closing()]: self.clients.discard(client)
+        return [c for c in self.clients if c.authed]
+    def _broadcast_tm(self, snap):
+        delta = {k: (list(v) if isinstance(v, tuple) else v) for k, v in snap.items() if k != "ts" and self._last_tm.get(k) != v}
+        self._last_tm.update({k: snap[k] for k in delta})
+        if delta:
+            for client in self._live_clients(): client.push_tm(delta)
+    def _broadcast(self, msg):
+        for client in self._live_clients(): client.push_log(msg)
+
+    async def _sender(self, client):
+        writer = client.transport.writer
+        try:
+            while not writer.is_closing():
+                await client.wakeup.wait(); client.wakeup.clear()
+                if writer.is_closing(): break
+                while client.direct: client.transport.send(json.dumps(client.direct.popleft())); self.messages_out += 1
+                if client.tm: client.transport.send(json.dumps({"t": "tm", "d": client.tm})); client.tm = {}; self.messages_out += 1
+                while client.logs: client.transport.send(json.dumps(client.logs.popleft())); self.messages_out += 1
+                await writer.drain() # Seul ce client attend si son réseau est lent
+        except ConnectionError: pass
+        finally: self.clients.discard(client)
+    def _token_ok(self, candidate):
+        import hmac
+        return bool(self.token) and isinstance(candidate, str) and hmac.compare_digest(candidate.encode("utf-8"), self.token.encode("utf-8"))
+
+    async def _handle(self, reader, writer):
+        asyncio = self._asyncio; peer = writer.get_extra_info("peername"); sender = client = None
+        try:
+            first = await reader.readline()
+            if first.startswith(b"GET "):
+                result = await _WebSocketTransport.handshake(reader, writer, first.strip())
+                if result is None: writer.close(); return
+                transport, query = result
+                import urllib.parse
+                if self._token_ok(urllib.parse.parse_qs(urllib.parse.urlsplit(query).query).get("token", [None])[0]): transport.authed_by_url = True
+            else: transport = _LineTransport(reader, writer, first)
+            client = _NetClient(transport, peer, asyncio); client.authed = not self.token or getattr(transport, "authed_by_url", False)
+            self.clients.add(client); sender = asyncio.ensure_future(self._sender(client))
+            if client.authed: self._welcome(client)
+            while True:
+                text = await transport.recv()
+                if text is None: break
+                if not text: continue
+                try: msg = json.loads(text)
+                except ValueError: continue
+                self.messages_in += 1; self._on_message(client, msg)
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError): pass # CancelledError : arrêt du serveur
+        except (asyncio.LimitOverrunError, ValueError): pass # Ligne au-delà de NET_MAX_MESSAGE_BYTES : on ferme ce client
+        finally:
+            self.clients.discard(client)
+            if sender: sender.cancel()
+            writer.close()
+
+    def _welcome(self, client):
+        client.push_direct({"t": "hello", "v": NET_PROTOCOL_VERSION, "actions": self.actions, "holds": list(NET_HOLD_MODES), "commands": ["atc", "power_dec", "macro"], "macros": self.macros})
+        if self._last_tm: client.push_tm(dict(self._last_tm))
+
+    def _on_message(self, client, msg):
+        t = msg.get("t"); mid = msg.get("id")
+        if t == "ping": client.push_direct({"t": "pong", "id": mid, "ts": msg.get("ts")}); return
+        if not client.authed:
+            if t == "auth" and self._token_ok(msg.get("token")): client.authed = True; self._welcome(client)
+            else: client.push_direct({"t": "error", "id": mid, "err": "auth required"})
+            return
+        ok = True
+        if t == "action": ok = msg.get("a") in self.actions
+        elif t == "hold": ok = msg.get("m") in NET_HOLD_MODES and msg.get("s") in ("start", "stop")
+        elif t == "power_dec": ok = msg.get("target") in ("WEAPONS", "SHIELDS", "ENGINES")
+        elif t == "macro": ok = msg.get("m") in self.macros and msg.get("s", "start") in ("start", "cancel")
+        elif t != "atc": ok = False
+        if ok: self.remote_command.emit(msg)
+        client.push_direct({"t": "ack", "id": mid, "ok": bool(ok)})
+
+# --- JOURNAL DE SESSION (AJOUT SEUL, ROTATION COMPRESSEE) ---
+# <dossier de données>/journal/session.jnl : en-tête JOURNAL_HEADER puis enregistrements (horodatage, type, taille) + charge utile.
+# Entrées (J_INPUT, même format que les messages du serveur réseau) et télémétrie sont rejouables ; le reste sert à reconstituer
+# ce que le deck a envoyé et quand. Fichier fermé -> session-AAAAMMJJ-HHMMSS.jnl.gz (au démarrage, ou au-delà de la taille / de l'âge max).
+JOURNAL_DIRNAME = "journal"
+JOURNAL_FILENAME = "session.jnl"
+JOURNAL_MAGIC = b"SCJL"; JOURNAL_VERSION = 1
+JOURNAL_HEADER = struct.Struct("<4sHd") # magic, version, création (epoch)
+JOURNAL_RECORD = struct.Struct("<dBH") # epoch, type, taille de la charge utile
+JOURNAL_FLUSH_S = 0.5 # Un lot est écrit au plus tard 0,5 s après son premier enregistrement
+JOURNAL_BATCH_BYTES = 64 * 1024
+JOURNAL_MAX_BYTES = 8 * 1024 * 1024
+JOURNAL_MAX_AGE_S = 3600
+JOURNAL_KEEP = 24 # Archives .gz conservées
+J_SESSION, J_LOG, J_KEY, J_INPUT, J_HOLD, J_MACRO, J_TELEMETRY = range(7)
+J_KIND_NAMES = ("SESSION", "LOG", "KEY", "INPUT", "HOLD", "MACRO", "TELEMETRY")
+J_KEY_PHASES = ("steps", "press_steps", "release_steps")
+J_HOLD_EVENTS = ("trigger", "release", "abort")
+J_MACRO_EVENTS = ("start", "done", "cancel")
+
+def get_journal_dir(): return os.path.join(get_data_dir(), JOURNAL_DIRNAME)
+
+def encode_journal_payload(kind, value):
+    if kind in (J_SESSION, J_INPUT): return json.dumps(value, separators=(",", ":")).encode("utf-8")
+    if kind == J_TELEMETRY:
+        vals = [value.get(k) for k in ("cpu", "ram", "disk", "swap")]
+        return bytes(TS_MISSING if v is None else max(0, min(100, int(v))) for v in vals) + bytes(max(0, min(100, int(c))) for c in value.get("cores", ()))
+    if kind == J_LOG: code, text = value
+    elif kind == J_KEY: code, text = J_KEY_PHASES.index(value[0]), value[1]
+    elif kind == J_HOLD: code, text = J_HOLD_EVENTS.index(value[0]), value[1]
+    else: code, text = J_MACRO_EVENTS.index(value[0]), value[1]
+    return bytes((code,)) + str(text).encode("utf-8")[:60000]
+
+def decode_journal_payload(kind, data):
+    if kind in (J_SESSION, J_INPUT): return json.loads(data)
+    if kind == J_TELEMETRY:
+        snap = {k: (None if b == TS_MISSING else b) for k, b in zip(("cpu", "ram", "disk", "swap"), data[:4])}; snap["cores"] = tuple(data[4:])
+        return snap
+    code, text = data[0], data[1:].decode("utf-8", "replace")
+    if kind == J_LOG: return (code, text)
+    return ((J_KEY_PHASES if kind == J_KEY else J_HOLD_EVENTS if kind == J_HOLD else J_MACRO_EVENTS)[code], text)
+
+def read_journal(path):
+    """(epoch, type, valeur) dans l'ordre ; accepte les archives .gz et s'arrête proprement sur un enregistrement tronqué (crash)."""
+    import gzip
+    with (gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")) as f:
+        head = f.read(JOURNAL_HEADER.size)
+        if len(head) < JOURNAL_HEADER.size or JOURNAL_HEADER.unpack(head)[:2] != (JOURNAL_MAGIC, JOURNAL_VERSION): raise ValueError(f"not a session journal: {path}")
+        while True:
+            rec = f.read(JOURNAL_RECORD.size)
+            if len(rec) < JOURNAL_RECORD.size: return
+            ts, kind, size = JOURNAL_RECORD.unpack(rec); data = f.read(size)
+            if len(data) < size: return
+            yield ts, kind, decode_journal_payload(kind, data)
+
+class JournalWriter(QThread):
+    """Écrivain en arrière-plan : write() ne fait qu'une mise en file, l'encodage et les écritures par lots se font dans ce thread."""
+    def __init__(self, directory, parent=None):
+        super().__init__(parent)
+        self.directory = directory; self._queue = queue.SimpleQueue(); self._file = None; self._created = 0.0
+        self.records = 0; self.batches = 0; self.rotations = 0; self.failures = 0
+
+    # --- API (tout thread, jamais bloquante) ---
+    def write(self, kind, value): self._queue.put((time.time(), kind, value))
+    def flush(self, timeout=5.0):
+        """Bloque jusqu'à ce que tout ce qui a été mis en file soit écrit."""
+        if not self.isRunning(): return False
+        done = threading.Event(); self._queue.put((None, "flush", done)); return done.wait(timeout)
+    def move_to(self, directory): self._queue.put((None, "move", directory))
+    def stop(self): self._queue.put(None); self.wait(3000)
+
+    @property
+    def path(self): return os.path.join(self.directory, JOURNAL_FILENAME)
+
+    def run(self):
+        self._open(); buf = bytearray(); batch_started = 0.0
+        while True:
+            timeout = max(0.0, batch_started + JOURNAL_FLUSH_S - time.monotonic()) if buf else None
+            try: item = self._queue.get(timeout=timeout)
+            except queue.Empty: item = False
+            if item is None: break
+            if item and item[0] is None:
+                self._write(buf); buf.clear()
+                if item[1] == "flush": item[2].set()
+                else: self._move(item[2])
+                continue
+            if item:
+                if not buf: batch_started = time.monotonic()
+                try: payload = encode_journal_payload(item[1], item[2]); buf += JOURNAL_RECORD.pack(item[0], item[1], len(payload)) + payload; self.records += 1
+                except Exception as e: print(f"Journal Error: {e}")
+            if buf and (item is False or len(buf) >= JOURNAL_BATCH_BYTES): self._write(buf); buf.clear()
+        self._write(buf)
+        if self._file: self._file.close(); self._file = None
+
+    def _open(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if os.path.exists(self.path): self._archive() # Session précédente (arrêt normal ou crash)
+            self._file = open(self.path, "ab"); self._created = time.time()
+            self._file.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self._created)); self._file.flush()
+        except OSError as e: print(f"Journal Error: {e}"); self.failures += 1; self._file = None
+
+    def _write(self, buf):
+        if not buf or self._file is None: return
+        try: self._file.write(buf); self._file.flush(); self.batches += 1
+        except OSError as e: print(f"Journal Error: {e}"); self.failures += 1; return
+        if self._file.tell() >= JOURNAL_MAX_BYTES or time.time() - self._created >= JOURNAL_MAX_AGE_S:
+            self._file.close(); self._file = None; self._open()
+
+    def _archive(self):
+        """session.jnl -> session-<création>.jnl.gz, puis élagage des archives les plus anciennes."""
+        import gzip
+        try:
+            with open(self.path, "rb") as src:
+                head = src.read(JOURNAL_HEADER.size); created = JOURNAL_HEADER.unpack(head)[2] if len(head) == JOURNAL_HEADER.size else os.path.getmtime(self.path)
+                base = os.path.join(self.directory, time.strftime("session-%Y%m%d-%H%M%S", time.localtime(created))); target = base + ".jnl.gz"; n = 1
+                while os.path.exists(target): target = f"{base}-{n}.jnl.gz"; n += 1
+                src.seek(0)
+                with gzip.open(target + ".tmp", "wb", compresslevel=6) as dst: shutil.copyfileobj(src, dst)
+            os.replace(target + ".tmp", target); os.remove(self.path); self.rotations += 1
+            for old in journal_archives(self.directory)[:-JOURNAL_KEEP]: os.remove(old)
+        except (OSError, struct.error) as e: print(f"Journal Error: {e}"); self.failures += 1
+
+    def _move(self, directory):
+        if self._file: self._file.close(); self._file = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for name in os.listdir(self.directory): shutil.move(os.path.join(self.directory, name), os.path.join(directory, name))
+        except OSError as e: print(f"Journal Error: {e}"); self.failures += 1
+        self.directory = directory; self._open()
+
+def journal_archives(directory):
+    """Archives compressées, de la plus ancienne à la plus récente."""
+    try: return sorted(os.path.join(directory, n) for n in os.listdir(directory) if n.startswith("session-") and n.endswith(".jnl.gz"))
+    except OSError: return []
+
+# --- DIAGNOSTICS : HUD DE PERFORMANCE + EXPORT ---
+PERF_CSV_FILENAME = "sc_mfd_perf.csv"
+PERF_JSON_FILENAME = "sc_mfd_perf.json"
+PERF_CSV_MAX_BYTES = 2 * 1024 * 1024 # Rotation vers .1 au-delà
+PERF_REPORT_INTERVAL_MS = 1000
+PERF_WATCHED_TIMERS = {"hold_timer": "hold_render", "timer": "telemetry", "log_timer": "ambient_log"} # Colonne CSV -> tâche de l'ordonnanceur
+PERF_CSV_COLUMNS = ("ts", "loop_hz", "action_paint_p99_ms", "system_paint_p99_ms", "hold_timer_late_p99_ms", "timer_late_p99_ms", "log_timer_late_p99_ms", "key_latency_p50_ms", "key_latency_p99_ms")
+
+class PerfHud(QWidget):
+    """Petit cadre de diagnostics, transparent aux clics."""
+    def __init__(self, parent=None):
+        super().__init__(parent); self.lines = []; self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True); self.setFixedSize(330, 182); self.hide()
+    def set_lines(self, lines): self.lines = lines; self.update()
+    def paintEvent(self, event):
+        painter = QPainter(self); painter.fillRect(self.rect(), QColor(0, 0, 0, 200)); painter.setPen(THEME.color("accent")); painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        font = painter.font(); font.setFamily("Consolas"); font.setPointSize(9); painter.setFont(font); y = 18
+        for line in self.lines: painter.drawText(8, y, line); y += 16
+
+class PerfMonitor:
+    """Compteurs de performance du deck. Désactivé : aucun timer actif, aucune connexion."""
+    def __init__(self, deck):
+        self.deck = deck; self.enabled = False; self.loop_ticks = 0; self._window_start = time.perf_counter(); self._wakeups = 0
+        self.probe = QTimer(); self.probe.setTimerType(Qt.TimerType.PreciseTimer); self.probe.setInterval(16); self.probe.timeout.connect(self._on_probe)
+        self.report_timer = QTimer(); self.report_timer.setInterval(PERF_REPORT_INTERVAL_MS); self.report_timer.timeout.connect(self.report)
+        self.hud = PerfHud(deck); self.hud.move(20, 80); self._csv = None
+
+    def set_enabled(self, enabled):
+        enabled = bool(enabled)
+        if enabled == self.enabled: return
+        self.enabled = enabled
+        if enabled:
+            self.loop_ticks = 0; self._window_start = time.perf_counter(); self._wakeups = self.deck.scheduler.wakeups; self.deck.scheduler.track_lateness = True
+            self.probe.start(); self.report_timer.start(); self.hud.show(); self.hud.raise_()
+        else:
+            self.probe.stop(); self.report_timer.stop(); self.hud.hide(); self.deck.scheduler.track_lateness = False
+            if self._csv: self._csv.close(); self._csv = None
+
+    def _on_probe(self): self.loop_ticks += 1
+
+    def snapshot(self):
+        now = time.perf_counter(); elapsed = max(1e-6, now - self._window_start)
+        snap = {"ts": round(time.time(), 3), "loop_hz": self.loop_ticks / elapsed,
+                "action_paint_p99_ms": percentile(list(self.deck.action_overlay.frame_times_ms), 99), "system_paint_p99_ms": percentile(list(self.deck.sys_overlay.frame_times_ms), 99)}
+        sched = self.deck.scheduler; snap["wakeups_hz"] = (sched.wakeups - self._wakeups) / elapsed; self._wakeups = sched.wakeups # Retard mesuré par l'ordonnanceur lui-même
+        for column, job in PERF_WATCHED_TIMERS.items(): snap[f"{column}_late_p99_ms"] = percentile(list(sched.lateness_ms.get(job, ())), 99)
+        keys = self.deck.input_engine.latency_stats(); snap["key_latency_p50_ms"] = keys["p50_ms"]; snap["key_latency_p99_ms"] = keys["p99_ms"]
+        touch = self.deck.touch_router.latency_stats(); snap["touch_latency_p50_ms"] = touch["p50_ms"]; snap["touch_latency_p99_ms"] = touch["p99_ms"]
+        self.loop_ticks = 0; self._window_start = now
+        return snap
+
+    def report(self):
+        snap = self.snapshot()
+        self.hud.set_lines([f"LOOP      {snap['loop_hz']:6.1f} Hz", f"WAKEUPS   {snap['wakeups_hz']:6.1f} Hz", f"PAINT ACT {snap['action_paint_p99_ms']:6.2f} ms p99", f"PAINT SYS {snap['system_paint_p99_ms']:6.2f} ms p99",
+                            f"LATE HOLD {snap['hold_timer_late_p99_ms']:6.2f} ms", f"LATE TELE {snap['timer_late_p99_ms']:6.2f} ms", f"LATE LOG  {snap['log_timer_late_p99_ms']:6.2f} ms",
+                            f"KEY LAT   {snap['key_latency_p50_ms']:6.2f} / {snap['key_latency_p99_ms']:.2f} ms",
+                            f"TOUCH LAT {snap['touch_latency_p50_ms']:6.2f} / {snap['touch_latency_p99_ms']:.2f} ms", "CTRL+SHIFT+D TO HIDE"])
+        try: self.export(snap)
+        except Exception as e: print(f"Perf export error: {e}")
+
+    def export(self, snap):
+        """CSV tournant + dernier instantané JSON dans le dossier de données."""
+        csv_path = os.path.join(get_data_dir(), PERF_CSV_FILENAME)
+        if self._csv and self._csv.tell() > PERF_CSV_MAX_BYTES:
+            self._csv.close(); self._csv = None; os.replace(csv_path, csv_path + ".1")
+        if self._csv is None:
+            new_file = not os.path.exists(csv_path); self._csv = open(csv_path, "a", encoding="utf-8")
+            if new_file: self._csv.write(",".join(PERF_CSV_COLUMNS) + "\n")
+        self._csv.write(",".join(f"{snap[c]:.3f}" for c in PERF_CSV_COLUMNS) + "\n"); self._csv.flush()
+        atomic_write_text(os.path.join(get_data_dir(), PERF_JSON_FILENAME), json.dumps(snap), fsync=False)
 
 # --- SETTINGS DIALOG ---
 class SettingsDialog(QDialog):
     def __init__(self, current_config, main_window_ref, parent=None):
         super().__init__(parent); self.main_window = main_window_ref; self.setWindowTitle("SYSTEM CONFIGURATION"); self.resize(600, 900); self.config = current_config; self.listening_btn = None
-        self.setStyleSheet("QDialog { background-color: #000000; color: #2affea; font-family: 'Verdana'; border: 2px solid #2affea; } QLabel { color: #2affea; font-weight: bold; } QComboBox { background-color: #000000; color: #2affea; border: 1px solid #2affea; padding: 5px; font-size: 14px; font-weight: bold; } QComboBox::drop-down { border: 0px; } QComboBox QAbstractItemView { background-color: #000000; color: #2affea; selection-background-color: #2affea; selection-color: #000000; border: 1px solid #2affea; outline: none; } QLineEdit { background: #001111; color: #aaaaaa; border: 1px solid #2affea; padding: 5px; }")
+        self.setObjectName("settings_dialog") # Styles : feuille globale du thème actif
         
         layout = QVBoxLayout(self)
 
         # --- PATH MANAGEMENT ---
-        path_frame = QFrame(); path_frame.setStyleSheet("border: 1px solid #444444; margin-bottom: 10px; padding: 5px;")
+        path_frame = QFrame(); path_frame.setObjectName("settings_path_frame")
         pl = QVBoxLayout(path_frame)
         pl.addWidget(QLabel("DATA STORAGE PATH"))
-        self.path_display = QLineEdit(CURRENT_DATA_DIR)
+        self.path_display = QLineEdit(get_data_dir())
         self.path_display.setReadOnly(True)
         pl.addWidget(self.path_display)
         
         btn_change_path = QPushButton("MOVE DATA FOLDER")
-        btn_change_path.setStyleSheet("background-color: #222222; color: #2affea; font-weight: bold;")
+        btn_change_path.setObjectName("settings_tool_btn")
         btn_change_path.clicked.connect(self.change_data_path)
         pl.addWidget(btn_change_path)
+        btn_export_log = QPushButton("EXPORT COMMAND LOG")
+        btn_export_log.setObjectName("settings_tool_btn")
+        btn_export_log.clicked.connect(self.export_command_log)
+        pl.addWidget(btn_export_log)
         layout.addWidget(path_frame)
         # -----------------------
 
-        screen_frame = QFrame(); screen_frame.setStyleSheet("border: 1px solid #2affea; margin-bottom: 10px;"); sl = QVBoxLayout(screen_frame); sl.addWidget(QLabel("DISPLAY OUTPUT SELECTION")); self.screen_combo = QComboBox()
+        self.perf_check = QCheckBox("PERFORMANCE HUD + METRICS EXPORT (CTRL+SHIFT+D)"); self.perf_check.setChecked(bool(self.config.get("PERF_HUD", False))); layout.addWidget(self.perf_check)
+        self.theme_combo = QComboBox(); self.theme_combo.addItems(THEME.names()); self.theme_combo.setCurrentText(self.config.get("THEME", DEFAULT_THEME)); layout.addWidget(QLabel("DISPLAY THEME")); layout.addWidget(self.theme_combo)
+
+        screen_frame = QFrame(); screen_frame.setObjectName("settings_screen_frame"); sl = QVBoxLayout(screen_frame); sl.addWidget(QLabel("DISPLAY OUTPUT SELECTION")); self.screen_combo = QComboBox()
         for i, s in enumerate(QApplication.screens()): self.screen_combo.addItem(f"MONITOR {i} - [{s.size().width()}x{s.size().height()}]")
         current_idx = self.config.get("TARGET_SCREEN_INDEX", 1); 
         if current_idx < len(QApplication.screens()): self.screen_combo.setCurrentIndex(current_idx)
-        sl.addWidget(self.screen_combo); btn_move = QPushButton("TEST & MOVE TO SCREEN"); btn_move.setStyleSheet("background-color: #2affea; color: black; font-weight: bold; padding: 10px;"); btn_move.clicked.connect(self.trigger_move_screen); sl.addWidget(btn_move); layout.addWidget(screen_frame)
-        layout.addWidget(QLabel("KEY BINDINGS CONFIGURATION")); scroll = QScrollArea(); scroll.setWidgetResizable(True); content = QWidget(); self.grid = QGridLayout(content); content.setStyleSheet("background-color: #000000;"); row = 0; self.buttons = {}
+        sl.addWidget(self.screen_combo); btn_move = QPushButton("TEST & MOVE TO SCREEN"); btn_move.setObjectName("settings_primary_btn"); btn_move.clicked.connect(self.trigger_move_screen); sl.addWidget(btn_move); layout.addWidget(screen_frame)
+        layout.addWidget(QLabel("KEY BINDINGS CONFIGURATION")); scroll = QScrollArea(); scroll.setWidgetResizable(True); content = QWidget(); self.grid = QGridLayout(content); content.setObjectName("settings_bindings"); row = 0; self.buttons = {}
         for action, key_val in self.config.items():
-            if action == "TARGET_SCREEN_INDEX": continue
-            lbl = QLabel(action); btn = QPushButton(str(key_val).upper()); btn.setProperty("action", action); btn.setStyleSheet("border: 1px solid #2affea; padding: 5px; background: #002222; color: #2affea;"); btn.clicked.connect(lambda ch, b=btn: self.start_list(b)); self.grid.addWidget(lbl, row, 0); self.grid.addWidget(btn, row, 1); self.buttons[action] = btn; row += 1
+            if action in NON_BINDING_KEYS: continue
+            lbl = QLabel(action); btn = QPushButton(str(key_val).upper()); btn.setProperty("action", action); btn.setObjectName("binding_btn"); btn.clicked.connect(lambda ch, b=btn: self.start_list(b)); self.grid.addWidget(lbl, row, 0); self.grid.addWidget(btn, row, 1); self.buttons[action] = btn; row += 1
         scroll.setWidget(content); layout.addWidget(scroll)
+        self.conflict_lbl = QLabel(); self.conflict_lbl.setWordWrap(True); self.conflict_lbl.setObjectName("conflict_lbl"); layout.addWidget(self.conflict_lbl)
+        self.refresh_conflicts()
         
         btn_layout = QHBoxLayout()
         reset_btn = QPushButton("RESET DEFAULTS")
-        reset_btn.setStyleSheet("background-color: #550000; color: #ffaaaa; padding: 10px; font-weight: bold; margin-top: 10px; border: 1px solid #ff5555;")
+        reset_btn.setObjectName("settings_reset_btn")
         reset_btn.clicked.connect(self.reset_defaults)
         
-        save = QPushButton("SAVE CONFIG"); save.clicked.connect(self.save_and_exit); save.setStyleSheet("background-color: #2affea; color: black; padding: 10px; font-weight: bold; margin-top: 10px;")
+        save = QPushButton("SAVE CONFIG"); save.clicked.connect(self.save_and_exit); save.setObjectName("settings_save_btn")
         
         btn_layout.addWidget(reset_btn)
         btn_layout.addWidget(save)
@@ -313,12 +2369,26 @@ class SettingsDialog(QDialog):
                 # 1. Déplacer les fichiers existants
                 old_conf = os.path.join(CURRENT_DATA_DIR, CONFIG_FILENAME)
                 old_notes = os.path.join(CURRENT_DATA_DIR, NOTES_FILENAME)
+                old_rss = os.path.join(CURRENT_DATA_DIR, RSS_CACHE_FILENAME)
+                old_macros = os.path.join(CURRENT_DATA_DIR, MACROS_FILENAME)
+                old_notes_dir = os.path.join(CURRENT_DATA_DIR, NOTES_DIRNAME)
                 
                 new_conf = os.path.join(new_dir, CONFIG_FILENAME)
                 new_notes = os.path.join(new_dir, NOTES_FILENAME)
+                new_rss = os.path.join(new_dir, RSS_CACHE_FILENAME)
+
+                # 0. Vider les écritures en attente avant de déplacer quoi que ce soit
+                self.main_window.notes_widget.flush()
 
                 if os.path.exists(old_conf): shutil.move(old_conf, new_conf)
                 if os.path.exists(old_notes): shutil.move(old_notes, new_notes)
+                if os.path.exists(old_rss): shutil.move(old_rss, new_rss)
+                if os.path.exists(old_macros): shutil.move(old_macros, os.path.join(new_dir, MACROS_FILENAME))
+                if os.path.isdir(old_notes_dir) and not os.path.exists(os.path.join(new_dir, NOTES_DIRNAME)): shutil.move(old_notes_dir, os.path.join(new_dir, NOTES_DIRNAME))
+                self.main_window.telemetry_history.move_to(os.path.join(new_dir, TELEMETRY_DIRNAME))
+                if self.main_window.journal: self.main_window.journal.move_to(os.path.join(new_dir, JOURNAL_DIRNAME))
+                old_profiles = os.path.join(CURRENT_DATA_DIR, PROFILES_DIRNAME)
+                if os.path.isdir(old_profiles) and not os.path.exists(os.path.join(new_dir, PROFILES_DIRNAME)): shutil.move(old_profiles, os.path.join(new_dir, PROFILES_DIRNAME))
                 
                 # 2. Mettre à jour la map globale
                 CURRENT_DATA_DIR = new_dir
@@ -329,40 +2399,68 @@ class SettingsDialog(QDialog):
                 QMessageBox.information(self, "Success", "Data folder moved successfully!")
                 
                 # 4. Recharger les notes dans la fenêtre principale si nécessaire
-                self.main_window.notes_widget.load_notes()
+                self.main_window.notes_widget.load_notes(); self.main_window.notes_panel.refresh_sections()
 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to move files: {e}")
 
+    def export_command_log(self):
+        try:
+            n = self.main_window.export_log()
+            QMessageBox.information(self, "Success", f"{n} log entries exported to {LOG_EXPORT_FILENAME}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export log: {e}")
+
     def reset_defaults(self):
         for key, value in DEFAULT_CONFIG.items():
-            if key != "TARGET_SCREEN_INDEX": 
-                self.config[key] = value
+            if key not in NON_BINDING_KEYS: self.config[key] = value # Bindings seulement
         for action, btn in self.buttons.items():
             if action in self.config:
                 btn.setText(str(self.config[action]).upper())
+        self.refresh_conflicts()
+
+    def refresh_conflicts(self):
+        """Recompile les bindings et signale collisions / specs invalides."""
+        self.bindings = compile_bindings(self.config)
+        bad = set(self.bindings.errors)
+        for actions in self.bindings.conflicts.values(): bad.update(actions)
+        for action, btn in self.buttons.items():
+            conflict = action in bad
+            if btn.property("conflict") != conflict: btn.setProperty("conflict", conflict); repolish(btn)
+        self.conflict_lbl.setText("\n".join(self.bindings.describe_problems()))
 
     def trigger_move_screen(self): idx = self.screen_combo.currentIndex(); self.main_window.switch_screen(idx); self.config["TARGET_SCREEN_INDEX"] = idx
-    def save_and_exit(self): self.config["TARGET_SCREEN_INDEX"] = self.screen_combo.currentIndex(); self.accept()
+    def save_and_exit(self): self.config["TARGET_SCREEN_INDEX"] = self.screen_combo.currentIndex(); self.config["PERF_HUD"] = self.perf_check.isChecked(); self.config["THEME"] = self.theme_combo.currentText(); self.bindings = compile_bindings(self.config); self.accept()
     def start_list(self, btn): self.listening_btn = btn; btn.setText("..."); self.grabKeyboard()
     def keyPressEvent(self, event):
         if self.listening_btn:
+            if event.key() in (Qt.Key.Key_Alt, Qt.Key.Key_Control, Qt.Key.Key_Shift, Qt.Key.Key_Meta): return # Attendre la touche principale
             k = event.text().lower() if event.text() else "unknown"
-            if event.key() == Qt.Key.Key_Up: k="up"
+            if Qt.Key.Key_A.value <= event.key() <= Qt.Key.Key_Z.value or Qt.Key.Key_0.value <= event.key() <= Qt.Key.Key_9.value: k = chr(event.key()).lower()
+            elif event.key() == Qt.Key.Key_Up: k="up"
             elif event.key() == Qt.Key.Key_Down: k="down"
             elif event.key() == Qt.Key.Key_Left: k="left"
             elif event.key() == Qt.Key.Key_Right: k="right"
             elif event.key() == Qt.Key.Key_Insert: k="insert"
             elif event.key() >= Qt.Key.Key_F1 and event.key() <= Qt.Key.Key_F12: k=f"f{event.key()-Qt.Key.Key_F1+1}"
-            self.config[self.listening_btn.property("action")] = k; self.listening_btn.setText(k.upper()); self.releaseKeyboard(); self.listening_btn = None
+            mods = event.modifiers()
+            for flag, name in ((Qt.KeyboardModifier.ControlModifier, "ctrl"), (Qt.KeyboardModifier.AltModifier, "alt"), (Qt.KeyboardModifier.ShiftModifier, "shift")):
+                if mods & flag and k.isalnum(): k = f"{name}+{k}"
+            action = self.listening_btn.property("action"); old = str(self.config.get(action, ""))
+            if "@" in old and " " not in old: k += old[old.rindex("@"):] # Conserver la durée de maintien
+            self.config[action] = k; self.listening_btn.setText(k.upper()); self.releaseKeyboard(); self.listening_btn = None; self.refresh_conflicts()
         else: super().keyPressEvent(event)
 
 # --- MAIN WINDOW ---
 class SC_ControlDeck(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.keyboard = Controller()
-        self.config = load_config()
+        self.input_engine = InputDispatcher()
+        self.config_file = ConfigFile(); self.config = self.config_file.load()
+        self.bindings = compile_bindings(self.config)
+        self.macros, self.macro_errors = load_macros(); self.macro_cache = {}; self.running_macros = {}; self.macro_timings = MacroTimings()
+        self.input_engine.command_finished.connect(self.on_macro_finished)
+        STARTUP_TRACE.mark("config")
         self.telemetry_tick_count = 0 
 
         self.setWindowTitle("RSI MFD")
@@ -370,144 +2468,328 @@ class SC_ControlDeck(QMainWindow):
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
 
         self.hold_active_mode = None; self.hold_triggered = False; self.hold_progress = 0.0
-        self.hold_timer = QTimer(); self.hold_timer.setInterval(16); self.hold_timer.timeout.connect(self.update_hold_sequence) 
-        self.hold_grace_timer = QTimer(); self.hold_grace_timer.setInterval(200); self.hold_grace_timer.setSingleShot(True); self.hold_grace_timer.timeout.connect(self.finalize_hold_stop)
+        self.hold_started_at = 0.0; self.hold_duration_s = 2.0; self.hold_jitter_ms = deque(maxlen=100)
+        self.scheduler = FrameScheduler(); self.game_pid = 0 # Rendu, grâce, télémétrie, journal, RSS, boot : un seul timer
+        self.hold_trigger_timer = QTimer(); self.hold_trigger_timer.setSingleShot(True); self.hold_trigger_timer.setTimerType(Qt.TimerType.PreciseTimer); self.hold_trigger_timer.timeout.connect(self.on_hold_deadline)
+
+        self.telemetry_sampler = TelemetrySampler()
+        self.telemetry_sampler.snapshot_ready.connect(self.apply_telemetry_snapshot)
+        self.telemetry_history = TelemetryHistory(get_telemetry_dir()); self.telemetry_sampler.store = self.telemetry_history; self.history_dialog = None
+
+        self.game_watcher = GameProcessWatcher()
+        self.game_watcher.status_changed.connect(self.set_game_status)
 
-        self.rss_worker = RSSWorker()
+        self.stall_watchdog = StallWatchdog(self.config.get("STALL_WATCHDOG_MS", STALL_THRESHOLD_MS))
+
+        self.mfd_server = None # Démarré dans finish_startup si NET_SERVER_PORT est configuré
+        self.feed = None; self.feed_stream = None # Idem avec FEED_SHM / FEED_SOCKET
+        self.journal = JournalWriter(get_journal_dir()) if self.config.get("SESSION_JOURNAL", True) else None # Mis en file dès maintenant, écrit à partir de finish_startup
+        if self.journal: self.journal.write(J_SESSION, {"pid": os.getpid(), "profile": self.config.get("ACTIVE_PROFILE", DEFAULT_PROFILE), "config_version": CONFIG_VERSION})
+
+        self.rss_worker = RSSWorker(self.config.get("RSS_FEED_URL", RSS_FEED_URL))
         self.rss_worker.data_refreshed.connect(self.update_rss_display)
-        self.rss_refresh_timer = QTimer()
-        self.rss_refresh_timer.setInterval(15 * 60 * 1000) 
-        self.rss_refresh_timer.timeout.connect(self.rss_worker.start)
+        self.rss_worker.finished.connect(self.schedule_rss_refresh)
+
+        self.profiles = {DEFAULT_PROFILE: default_profile()}; self.active_profile = DEFAULT_PROFILE
+        self.profile_pages = OrderedDict(); self.profile_bindings = {}; self.profile_switch_ms = deque(maxlen=50)
+        self.profile_loader = ProfileLoader(); self.profile_loader.profiles_loaded.connect(self.on_profiles_loaded)
 
-        main_widget = QWidget(); self.setCentralWidget(main_widget)
+        STARTUP_TRACE.mark("window")
+
+        self.apply_styles() # Avant les enfants : chaque widget est stylé une seule fois à sa création
+        main_widget = QWidget(); self.setCentralWidget(main_widget); self.touch_router = TouchRouter(main_widget) # Tactile multi-points pour tous les boutons du deck
         self.global_layout = QVBoxLayout(main_widget); self.global_layout.setContentsMargins(10, 10, 10, 10); self.global_layout.setSpacing(5)
         self.create_header()
         body_frame = QFrame(); self.main_layout = QGridLayout(body_frame); self.main_layout.setContentsMargins(0, 0, 0, 0); self.main_layout.setSpacing(15); self.global_layout.addWidget(body_frame)
-        self.create_systems_panel(0, 0); self.create_shield_facing_panel(0, 1); self.create_power_increments_panel(0, 2); self.create_telemetry_panel(0, 3); self.create_footer()
+        self.create_footer()
         
         self.action_overlay = ActionOverlay(self); self.action_overlay.resize(self.size()); self.action_overlay.raise_()
         self.sys_overlay = SystemOverlay(self); self.sys_overlay.resize(self.size()); self.sys_overlay.raise_()
+        self.sys_overlay.installEventFilter(self)
+        self.perf_monitor = PerfMonitor(self)
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self).activated.connect(self.toggle_perf_hud)
+        QShortcut(QKeySequence("Ctrl+Shift+T"), self).activated.connect(self.cycle_theme)
+        QShortcut(QKeySequence("Ctrl+Shift+H"), self).activated.connect(self.open_history)
+        STARTUP_TRACE.mark("shell")
 
-        self.timer = QTimer(); self.timer.timeout.connect(self.update_telemetry); self.timer.start(1000)
-        self.log_timer = QTimer(); self.log_timer.timeout.connect(self.add_random_log); self.log_timer.start(4000)
-        self.apply_styles()
-        
-        QTimer.singleShot(100, self.start_boot_sequence)
-        
-        QTimer.singleShot(2000, self.rss_worker.start)
+        # Les panneaux sont construits un par un derrière l'écran de boot, après la première image
+        self.panels_ready = False; self._panel_build_started = False
+        self.pending_panels = [("systems", self.create_systems_panel, 0, 0), ("shields", self.create_shield_facing_panel, 0, 1),
+                               ("power", self.create_power_increments_panel, 0, 2), ("telemetry", self.create_telemetry_panel, 0, 3)]
+        self.start_boot_sequence()
+        QTimer.singleShot(250, self.start_panel_build) # Filet de sécurité si la fenêtre n'est jamais peinte
+        QApplication.instance().aboutToQuit.connect(self.shutdown_services)
+
+    def eventFilter(self, obj, event):
+        if obj is self.sys_overlay and event.type() == QEvent.Type.Paint:
+            self.sys_overlay.removeEventFilter(self); STARTUP_TRACE.first_frame(); QTimer.singleShot(0, self.start_panel_build)
+        return super().eventFilter(obj, event)
+
+    def start_panel_build(self):
+        if self._panel_build_started: return
+        self._panel_build_started = True; self.build_next_panel()
+
+    def build_next_panel(self):
+        if not self.pending_panels: return # Déjà construit (build_all_panels)
+        name, builder, row, col = self.pending_panels.pop(0)
+        builder(row, col); STARTUP_TRACE.mark(f"panel:{name}")
+        if self.pending_panels: QTimer.singleShot(0, self.build_next_panel)
+        else: self.finish_startup()
+
+    def build_all_panels(self):
+        """Construction synchrone (bancs d'essai, mode headless)."""
+        self._panel_build_started = True
+        while self.pending_panels: self.build_next_panel()
+
+    def finish_startup(self):
+        self.scheduler.every("telemetry", 1000, self.update_telemetry)
+        self.scheduler.every("ambient_log", 4000, self.add_random_log, cosmetic=True)
+        self.scheduler.every("throttle", 1000, self.update_throttle)
+        self.scheduler.every("config_watch", CONFIG_WATCH_MS, self.check_config_file)
+        self.input_engine.start(); self.telemetry_sampler.start(); self.game_watcher.start()
+        if self.journal: self.journal.start()
+        if self.stall_watchdog.threshold_ms > 0: self.stall_watchdog.start()
+        self.scheduler.after("rss_refresh", 2000, self.rss_worker.start)
+        self.profile_loader.start()
+        if self.config.get("FEED_SHM", True): self.start_feed(self.config.get("FEED_SOCKET", ""))
+        if self.config.get("NET_SERVER_PORT"): self.start_mfd_server(self.config.get("NET_SERVER_HOST", "127.0.0.1"), self.config["NET_SERVER_PORT"], self.config.get("NET_SERVER_TOKEN", ""))
+        self.perf_monitor.set_enabled(self.config.get("PERF_HUD", False))
+        for name, err in self.macro_errors.items(): self.add_log_entry(f"MACRO INVALID: {name} ({err})", is_user_action=True)
+        self.panels_ready = True; STARTUP_TRACE.mark("services"); STARTUP_TRACE.ready()
+        if STARTUP_TRACE.enabled: print(STARTUP_TRACE.report()); QTimer.singleShot(0, QApplication.quit)
+
+    def toggle_perf_hud(self):
+        self.config["PERF_HUD"] = not self.perf_monitor.enabled; self.perf_monitor.set_enabled(self.config["PERF_HUD"])
 
     def resizeEvent(self, event):
         if hasattr(self, 'action_overlay'): self.action_overlay.resize(self.size()); self.action_overlay.raise_()
         if hasattr(self, 'sys_overlay'): self.sys_overlay.resize(self.size()); self.sys_overlay.raise_()
+        if hasattr(self, 'perf_monitor') and self.perf_monitor.enabled: self.perf_monitor.hud.raise_()
         super().resizeEvent(event)
     def switch_screen(self, screen_index):
         screens = QApplication.screens(); 
         if screen_index < len(screens): target_screen = screens[screen_index]; self.showNormal(); self.windowHandle().setScreen(target_screen); self.move(target_screen.geometry().x(), target_screen.geometry().y()); self.showFullScreen()
 
+    def schedule_rss_refresh(self): self.scheduler.after("rss_refresh", self.rss_worker.next_delay_ms(), self.rss_worker.start) # Backoff exponentiel hors ligne
+    def update_throttle(self):
+        """Ralentit le cosmétique quand le jeu a le focus, le suspend quand l'écran du MFD n'est plus visible."""
+        handle = self.windowHandle()
+        if handle is None or not handle.isExposed() or self.isMinimized(): factor = 0
+        elif self.game_pid and foreground_pid() == self.game_pid: factor = COSMETIC_THROTTLE_FACTOR
+        else: factor = 1
+        self.scheduler.set_cosmetic_factor(factor)
     def update_rss_display(self, items):
         if not hasattr(self, 'rss_list'): return
-        self.rss_list.clear()
-        html = ""
+        self.rss_items = items; self.rss_list.clear()
+        html = ""; r = THEME.roles()
         for date, title in items:
-            if date == "ERROR": html += f'<div style="margin-bottom:5px;"><span style="color:#ff5555;">[OFFLINE]</span> {title}</div>'
-            else: html += f'<div style="margin-bottom:8px;"><span style="color:#2affea; font-weight:bold;">[{date}]</span><br/><span style="color:#eeeeee;">{title}</span></div>'
+            if date == "ERROR": html += f'<div style="margin-bottom:5px;"><span style="color:{r["danger"]};">[OFFLINE]</span> {title}</div>'
+            else: html += f'<div style="margin-bottom:8px;"><span style="color:{r["accent"]}; font-weight:bold;">[{date}]</span><br/><span style="color:{r["rss_title"]};">{title}</span></div>'
         self.rss_list.setHtml(html)
 
-    def start_boot_sequence(self): self.sys_overlay.set_mode("BOOT"); self.boot_step = 0; self.boot_timer = QTimer(); self.boot_timer.setInterval(200); self.boot_timer.timeout.connect(self.update_boot); self.boot_timer.start()
+    def start_boot_sequence(self): self.sys_overlay.set_mode("BOOT"); self.boot_step = 0; self.scheduler.every("boot", 200, self.update_boot)
     def update_boot(self):
         if self.boot_step < len(BOOT_SEQUENCE_LOGS): self.sys_overlay.add_log(BOOT_SEQUENCE_LOGS[self.boot_step]); self.boot_step += 1
-        else: self.boot_timer.stop(); self.fade_timer = QTimer(); self.fade_timer.setInterval(50); self.fade_timer.timeout.connect(self.fade_out_boot); self.fade_timer.start()
-    def fade_out_boot(self):
-        op = self.sys_overlay.opacity - 0.05
-        if op <= 0: op = 0; self.fade_timer.stop(); self.sys_overlay.set_opacity(0)
-        else: self.sys_overlay.set_opacity(op)
-    def start_shutdown_sequence(self): self.sys_overlay.set_mode("SHUTDOWN"); self.shutdown_timer = QTimer(); self.shutdown_timer.setInterval(20); self.shutdown_timer.timeout.connect(self.update_shutdown); self.shutdown_timer.start()
-    def update_shutdown(self):
-        scale = self.sys_overlay.shutdown_y_scale - 0.02
-        if scale <= 0: scale = 0; self.shutdown_timer.stop(); QApplication.quit()
+        elif not self.panels_ready: return # Le fondu attend la fin de la construction
+        else: self.scheduler.cancel("boot"); self.scheduler.animate("boot_fade", self.fade_out_boot)
+    def fade_out_boot(self, dt):
+        op = self.sys_overlay.opacity - dt # 1 s de fondu, quelle que soit la cadence
+        if op <= 0: self.sys_overlay.set_opacity(0); return False
+        self.sys_overlay.set_opacity(op)
+    def shutdown_services(self):
+        """Arrêt propre des threads et écritures en attente (appelé une seule fois au quit)."""
+        if getattr(self, '_services_stopped', False): return
+        self._services_stopped = True
+        self.perf_monitor.set_enabled(False); self.input_engine.stop(); self.macro_timings.save(); self.telemetry_sampler.stop(); self.game_watcher.stop(); self.stall_watchdog.stop()
+        if self.mfd_server: self.mfd_server.stop()
+        if self.feed_stream: self.feed_stream.stop(); self.feed_stream = None
+        if self.feed: self.feed.close(); self.feed = None
+        if self.journal: self.journal.stop()
+        if self.scheduler.pending("profile_save"): self.scheduler.cancel("profile_save"); self.config_file.save(self.config)
+        if hasattr(self, 'notes_widget'): self.notes_widget.shutdown()
+    def start_shutdown_sequence(self): self.notes_widget.flush() if hasattr(self, 'notes_widget') else None; self.sys_overlay.set_mode("SHUTDOWN"); self.scheduler.animate("shutdown", self.update_shutdown)
+    def update_shutdown(self, dt):
+        scale = max(0.0, self.sys_overlay.shutdown_y_scale - dt) # Fermeture CRT en 1 s
         self.sys_overlay.shutdown_y_scale = scale; self.sys_overlay.update()
+        if scale <= 0: self.shutdown_services(); QApplication.quit(); return False
 
     def open_settings(self):
-        dlg = SettingsDialog(self.config, self, self)
-        if dlg.exec():
-            self.config = dlg.config
-            save_config(self.config)
+        dlg = SettingsDialog(dict(self.config), self, self) # Copie : "CANCEL" ne laisse rien derrière lui
+        if dlg.exec(): self.apply_config(dlg.config); self.config_file.save(self.config)
+
+    def check_config_file(self):
+        conf = self.config_file.poll()
+        if conf is not None: self.apply_config(conf, source="FILE")
+        elif self.config_file.last_error and self.config_file.last_error != getattr(self, '_config_error_logged', None):
+            self._config_error_logged = self.config_file.last_error; self.add_log_entry(f"CONFIG: INVALID FILE, KEEPING CURRENT ({self.config_file.last_error[:60]})", is_user_action=True)
+    def apply_config(self, new, source=None):
+        """Applique une nouvelle config au deck en marche, en ne touchant que ce qui a changé."""
+        t0 = time.perf_counter(); changed = {k for k in set(new) | set(self.config) if new.get(k) != self.config.get(k)}
+        if not changed: return changed
+        old = self.config; self.config = new
+        if any(k not in NON_BINDING_KEYS for k in changed):
+            previous = self.bindings; self.profile_bindings.clear() # Les autres profils seront recompilés à leur prochaine sélection
+            self.profile_bindings[self.active_profile] = compile_bindings(dict(self.config, **self.profiles[self.active_profile]["bindings"]), previous); self.bindings = self.profile_binding_table(self.active_profile)
+            if self.mfd_server: self.mfd_server.actions = sorted(a for a in self.bindings if a != "ATC_KEY_BASE")
+            known = set(previous.describe_problems())
+            for line in self.bindings.describe_problems(): self.add_log_entry(f"CONFIG: {line}", is_user_action=True) if line not in known else None
+        if "TARGET_SCREEN_INDEX" in changed and self.isVisible(): self.switch_screen(self.config.get("TARGET_SCREEN_INDEX", 1))
+        if "THEME" in changed: self.set_theme(self.config.get("THEME", DEFAULT_THEME))
+        if "PERF_HUD" in changed: self.perf_monitor.set_enabled(self.config.get("PERF_HUD", False))
+        if "RSS_FEED_URL" in changed: self.rss_worker.url = self.config.get("RSS_FEED_URL", RSS_FEED_URL)
+        if "ACTIVE_PROFILE" in changed and self.config.get("ACTIVE_PROFILE") in self.profiles: self.switch_profile(self.config["ACTIVE_PROFILE"])
+        restart = sorted(changed & {"STALL_WATCHDOG_MS", "NET_SERVER_PORT", "NET_SERVER_HOST", "NET_SERVER_TOKEN", "FEED_SHM", "FEED_SOCKET", "SESSION_JOURNAL"})
+        self.config_apply_ms = (time.perf_counter() - t0) * 1000.0; self._config_error_logged = None
+        if source: self.add_log_entry(f"CONFIG: {source} RELOADED, {len(changed)} KEY(S) IN {self.config_apply_ms:.1f} MS", is_user_action=True)
+        if restart: self.add_log_entry(f"CONFIG: {', '.join(restart)} APPLY ON RESTART", is_user_action=True)
+        return changed
 
     def start_hold(self, mode):
+        if self.journal: self.journal.write(J_INPUT, {"t": "hold", "m": mode, "s": "start"})
+        if self.hold_active_mode is None and mode in self.running_macros.values(): self.cancel_macros(mode); return # Nouvel appui pendant la macro : on l'interrompt
         if self.hold_active_mode != mode:
-            self.hold_active_mode = mode; self.hold_triggered = False; self.hold_progress = 0.0; 
-            color = QColor(255, 0, 0) if mode == "EJECT" else QColor(0, 255, 0)
+            self.hold_active_mode = mode; self.hold_triggered = False; self.hold_progress = 0.0; self.hold_started_at = time.perf_counter(); self.hold_duration_s = self.get_hold_duration(mode)
+            color = THEME.color("eject") if mode == "EJECT" else THEME.color("autoland")
             text = "EJECTING" if mode == "EJECT" else "AUTO-LAND"
             self.action_overlay.set_config(color, text)
-        if self.hold_grace_timer.isActive(): self.hold_grace_timer.stop(); return
-        self.action_overlay.set_state(True, self.hold_progress, self.hold_triggered); self.hold_timer.start(); self.add_log_entry(f"SYSTEM: {mode} SEQUENCE INITIATED...", is_user_action=True)
-    def stop_hold(self): self.hold_grace_timer.start()
+        if self.scheduler.pending("hold_grace"): self.scheduler.cancel("hold_grace"); return
+        self.action_overlay.set_state(True, self.hold_progress, self.hold_triggered); self.scheduler.animate("hold_render", self.render_hold_frame); self.arm_hold_deadline(); self.add_log_entry(f"SYSTEM: {mode} SEQUENCE INITIATED...", is_user_action=True)
+    def stop_hold(self):
+        if not self.hold_active_mode: return
+        if self.journal: self.journal.write(J_INPUT, {"t": "hold", "m": self.hold_active_mode, "s": "stop"})
+        self.scheduler.after("hold_grace", 200, self.finalize_hold_stop)
     def finalize_hold_stop(self):
-        self.hold_timer.stop(); self.action_overlay.set_state(False)
+        self.scheduler.cancel("hold_render"); self.hold_trigger_timer.stop(); self.action_overlay.set_state(False)
+        if self.journal: self.journal.write(J_HOLD, ("release" if self.hold_triggered else "abort", self.hold_active_mode))
         if self.hold_triggered:
-            if self.hold_active_mode == "EJECT": k = get_key_object(self.config["EXIT_SEAT"]); self.keyboard.release(k); self.add_log_entry("EJECT: RELEASED", is_user_action=True)
+            if self.hold_active_mode == "EJECT": self.send_binding("EXIT_SEAT", "release_steps", label="EJECT"); self.add_log_entry("EJECT: RELEASED", is_user_action=True)
         else: self.add_log_entry(f"SYSTEM: {self.hold_active_mode} ABORTED", is_user_action=True)
         self.hold_active_mode = None
+        if self.feed: self.feed.set_hold(None)
+    def get_hold_duration(self, mode):
+        try: return max(0.1, float(self.config.get("HOLD_DURATIONS", {}).get(mode, 2.0)))
+        except (TypeError, ValueError, AttributeError): return 2.0
+    def arm_hold_deadline(self):
+        """Le déclenchement est planifié sur l'horloge monotone, indépendamment du rythme de rendu."""
+        if self.hold_triggered: return
+        remaining = self.hold_started_at + self.hold_duration_s - time.perf_counter()
+        self.hold_trigger_timer.start(max(0, math.ceil(remaining * 1000)))
+    def on_hold_deadline(self):
+        self.update_hold_sequence()
+        if not self.hold_triggered: self.arm_hold_deadline() # Réveil légèrement en avance
     def update_hold_sequence(self):
-        self.hold_progress += (0.016 / 2.0)
-        if self.hold_progress >= 1.0: self.hold_progress = 1.0; self.trigger_hold_action() if not self.hold_triggered else None; self.hold_triggered = True
+        elapsed = time.perf_counter() - self.hold_started_at
+        self.hold_progress = min(1.0, elapsed / self.hold_duration_s)
+        if self.hold_progress >= 1.0 and not self.hold_triggered: self.hold_triggered = True; self.record_hold_timing(elapsed); self.journal.write(J_HOLD, ("trigger", self.hold_active_mode)) if self.journal else None; self.trigger_hold_action()
         self.action_overlay.set_state(True, self.hold_progress, self.hold_triggered)
+        if self.feed: self.feed.set_hold(self.hold_active_mode, self.hold_progress)
+    def render_hold_frame(self, dt): self.update_hold_sequence() # Rendu uniquement ; le déclenchement suit hold_trigger_timer
+    def record_hold_timing(self, elapsed):
+        jitter = (elapsed - self.hold_duration_s) * 1000.0; self.hold_jitter_ms.append(jitter)
+        self.add_log_entry(f"TIMING: {self.hold_active_mode} {elapsed * 1000.0:.1f} ms (REQ {self.hold_duration_s * 1000.0:.0f}, JITTER {jitter:+.1f} ms)")
+    def hold_jitter_stats(self):
+        vals = list(self.hold_jitter_ms)
+        return {"holds": len(vals), "p50_ms": percentile(vals, 50), "p99_ms": percentile(vals, 99), "max_ms": max(vals) if vals else 0.0}
     def trigger_hold_action(self):
-        if self.hold_active_mode == "EJECT": k = get_key_object(self.config["EXIT_SEAT"]); self.keyboard.press(k); self.add_log_entry("WARNING: CANOPY JETTISONED", is_user_action=True)
-        elif self.hold_active_mode == "AUTOLAND": k = get_key_object(self.config["LANDING"]); self.add_log_entry("FLIGHT: AUTO-LAND ENGAGED", is_user_action=True); self.keyboard.press(k); QTimer.singleShot(3000, lambda: self.finish_auto_land_macro(k))
-    def finish_auto_land_macro(self, k): self.keyboard.release(k); self.add_log_entry("FLIGHT: AUTO-LAND SIGNAL COMPLETE", is_user_action=True)
+        if self.hold_active_mode == "EJECT": self.cancel_macros(); self.send_binding("EXIT_SEAT", "press_steps", label="EJECT"); self.add_log_entry("WARNING: CANOPY JETTISONED", is_user_action=True)
+        elif self.hold_active_mode == "AUTOLAND": self.run_macro("AUTOLAND")
 
     def send_action(self, action_name, custom_log_text=None, silent=False):
-        k = get_key_object(self.config.get(action_name)); 
-        if k: self.keyboard.press(k); self.keyboard.release(k); self.add_log_entry(custom_log_text if custom_log_text else f"CMD: {action_name}", is_user_action=True) if not silent else None
-    def call_atc(self): k = get_key_object(self.config.get("ATC_KEY_BASE", "n")); self.add_log_entry("COMMS: HAILING LANDING SERVICES...", is_user_action=True); self.keyboard.press(Key.alt_l); self.keyboard.press(k); time.sleep(0.1); self.keyboard.release(k); self.keyboard.release(Key.alt_l); self.add_log_entry("COMMS: REQUEST SENT", is_user_action=True)
-    def add_log_entry(self, text, is_user_action=False): ts = QTime.currentTime().toString("HH:mm:ss"); fmt = f'<span style="color:#ffffff; font-weight:bold;">[{ts}] > {text}</span>' if is_user_action else f'<span style="color:#00aa00;">[{ts}] > {text}</span>'; self.log_console.append(fmt); sb = self.log_console.verticalScrollBar(); sb.setValue(sb.maximum())
+        if self.journal: self.journal.write(J_INPUT, {"t": "action", "a": action_name})
+        sent = self.run_macro(action_name) if action_name not in self.bindings and action_name in self.macros else self.send_binding(action_name) # Un bouton de profil peut lancer une macro
+        if sent: self.add_log_entry(custom_log_text if custom_log_text else f"CMD: {action_name}", is_user_action=True) if not silent else None
+    def send_binding(self, action_name, phase="steps", label=None, on_done=None):
+        """Chemin chaud : une recherche dans la table compilée puis mise en file."""
+        b = self.bindings.get(action_name)
+        if b is None: return None
+        if self.feed: self.feed.push_command(label or action_name)
+        if self.journal: self.journal.write(J_KEY, (phase, action_name))
+        return self.input_engine.send(label or action_name, getattr(b, phase), on_done)
+    def call_atc(self):
+        if self.journal: self.journal.write(J_INPUT, {"t": "atc"})
+        self.run_macro("CALL_ATC")
+    def macro_steps(self, name):
+        """Compilée une fois par table de bindings (profil actif, config) ; ValueError si la macro est invalide."""
+        cached = self.macro_cache.get(name)
+        if cached and cached[0] is self.bindings: return cached[1]
+        steps = compile_macro(self.macros[name], self.bindings); self.macro_cache[name] = (self.bindings, steps)
+        return steps
+    def run_macro(self, name, on_done=None):
+        """Planifie la macro sur l'InputDispatcher (horloge monotone, hors thread GUI) ; plusieurs macros peuvent se chevaucher."""
+        spec = self.macros.get(name)
+        if spec is None: return None
+        try: steps = self.macro_steps(name)
+        except ValueError as e: self.add_log_entry(f"MACRO INVALID: {name} ({e})", is_user_action=True); return None
+        if spec.get("log"): self.add_log_entry(str(spec["log"]), is_user_action=True)
+        done = spec.get("done")
+        def finished():
+            if done: self.add_log_entry(str(done), is_user_action=True)
+            if on_done: on_done()
+        cmd = self.input_engine.send(f"MACRO:{name}", steps, finished); self.running_macros[cmd] = name
+        if self.journal: self.journal.write(J_MACRO, ("start", name))
+        if self.feed: self.feed.push_command(name)
+        return cmd
+    def cancel_macros(self, name=None):
+        for cmd, running in list(self.running_macros.items()):
+            if name is None or running == name: self.input_engine.cancel(cmd)
+    def on_macro_finished(self, cmd):
+        name = self.running_macros.pop(cmd, None)
+        if name is None: return
+        self.macro_timings.record(name, cmd)
+        if self.journal: self.journal.write(J_MACRO, ("cancel" if cmd.cancelled else "done", name))
+        if cmd.cancelled: self.add_log_entry(f"MACRO: {name} CANCELLED", is_user_action=True)
+    def add_log_entry(self, text, is_user_action=False):
+        level = LOG_LEVEL_USER if is_user_action else LOG_LEVEL_SYSTEM; self.log_model.append(text, level); self.log_scroll_timer.start() if not self.log_scroll_timer.isActive() else None
+        if self.journal: self.journal.write(J_LOG, (level, text))
+        if self.mfd_server: self.mfd_server.publish_log(text, level)
+    def export_log(self, path=None): return self.log_model.export(path or os.path.join(get_data_dir(), LOG_EXPORT_FILENAME))
     def add_random_log(self): self.add_log_entry(random.choice(SCI_FI_LOGS), is_user_action=False)
 
-    def create_header(self): frame = QFrame(); frame.setObjectName("header_frame"); frame.setMaximumHeight(60); layout = QHBoxLayout(frame); lbl_brand = QLabel("RSI SYSTEMS // CONSTELLATION CLASS"); lbl_brand.setStyleSheet("font-size: 20px; font-weight: bold; letter-spacing: 3px; color: #2affea;"); lbl_id = QLabel("UEE ID: 948-Alpha-7"); lbl_id.setStyleSheet("color: #aaaaaa; font-family: 'Consolas';"); layout.addWidget(lbl_brand); layout.addStretch(); layout.addWidget(lbl_id); self.global_layout.addWidget(frame)
-    def create_footer(self): frame = QFrame(); frame.setObjectName("header_frame"); frame.setMaximumHeight(40); layout = QHBoxLayout(frame); self.status_lbl = QLabel("SYSTEM STATUS: ONLINE"); self.status_lbl.setStyleSheet("color: #44ff44; font-weight: bold;"); layout.addWidget(self.status_lbl); layout.addStretch(); layout.addWidget(QLabel("VERSION 33.1 [DATA PATH FIX]")); self.global_layout.addWidget(frame)
+    def create_header(self): frame = QFrame(); frame.setObjectName("header_frame"); frame.setMaximumHeight(60); layout = QHBoxLayout(frame); lbl_brand = QLabel("RSI SYSTEMS // CONSTELLATION CLASS"); lbl_brand.setObjectName("brand_lbl"); lbl_id = QLabel("UEE ID: 948-Alpha-7"); lbl_id.setObjectName("id_lbl"); self.profile_combo = QComboBox(); self.profile_combo.setObjectName("profile_combo"); self.profile_combo.setFocusPolicy(Qt.FocusPolicy.NoFocus); self.profile_combo.addItem(DEFAULT_PROFILE); self.profile_combo.textActivated.connect(self.switch_profile); layout.addWidget(lbl_brand); layout.addStretch(); layout.addWidget(self.profile_combo); layout.addSpacing(15); layout.addWidget(lbl_id); self.global_layout.addWidget(frame)
+    def create_footer(self): frame = QFrame(); frame.setObjectName("header_frame"); frame.setMaximumHeight(40); layout = QHBoxLayout(frame); self.status_lbl = QLabel("SYSTEM STATUS: ONLINE"); self.status_lbl.setObjectName("status_lbl"); self.status_lbl.setProperty("state", "online"); layout.addWidget(self.status_lbl); layout.addStretch(); layout.addWidget(QLabel("VERSION 33.1 [DATA PATH FIX]")); self.global_layout.addWidget(frame)
     def create_telemetry_panel(self, row, col):
         frame = QFrame(); frame.setObjectName("panel_frame"); layout = QVBoxLayout(frame); hw = QGridLayout(); layout.addWidget(QLabel("HARDWARE MONITOR"))
         
-        self.bar_cpu = QProgressBar(); self.bar_cpu.setFormat("CPU %p%"); self.bar_cpu.setStyleSheet("QProgressBar::chunk { background-color: #2affea; }"); hw.addWidget(QLabel("CPU"), 0, 0); hw.addWidget(self.bar_cpu, 0, 1)
-        self.bar_ram = QProgressBar(); self.bar_ram.setFormat("RAM %p%"); self.bar_ram.setStyleSheet("QProgressBar::chunk { background-color: #ffaa00; }"); hw.addWidget(QLabel("RAM"), 1, 0); hw.addWidget(self.bar_ram, 1, 1)
-        self.bar_disk = QProgressBar(); self.bar_disk.setFormat("DISK %p%"); self.bar_disk.setStyleSheet("QProgressBar::chunk { background-color: #ff5555; }"); hw.addWidget(QLabel("DSK"), 2, 0); hw.addWidget(self.bar_disk, 2, 1)
-        self.bar_swap = QProgressBar(); self.bar_swap.setFormat("SWAP %p%"); self.bar_swap.setStyleSheet("QProgressBar::chunk { background-color: #aa55ff; }"); hw.addWidget(QLabel("SWP"), 3, 0); hw.addWidget(self.bar_swap, 3, 1)
+        self.bar_cpu = QProgressBar(); self.bar_cpu.setFormat("CPU %p%"); self.bar_cpu.setObjectName("bar_cpu"); hw.addWidget(QLabel("CPU"), 0, 0); hw.addWidget(self.bar_cpu, 0, 1)
+        self.bar_ram = QProgressBar(); self.bar_ram.setFormat("RAM %p%"); self.bar_ram.setObjectName("bar_ram"); hw.addWidget(QLabel("RAM"), 1, 0); hw.addWidget(self.bar_ram, 1, 1)
+        self.bar_disk = QProgressBar(); self.bar_disk.setFormat("DISK %p%"); self.bar_disk.setObjectName("bar_disk"); hw.addWidget(QLabel("DSK"), 2, 0); hw.addWidget(self.bar_disk, 2, 1)
+        self.bar_swap = QProgressBar(); self.bar_swap.setFormat("SWAP %p%"); self.bar_swap.setObjectName("bar_swap"); hw.addWidget(QLabel("SWP"), 3, 0); hw.addWidget(self.bar_swap, 3, 1)
+        
+        self.cpu_spark = SparklineWidget(THEME.color("cpu")); self.cpu_spark.clicked.connect(self.open_history); self.cpu_spark.setToolTip("TELEMETRY HISTORY (CTRL+SHIFT+H)"); hw.addWidget(self.cpu_spark, 4, 0, 1, 2)
+        self.core_bars = CoreBarsWidget(THEME.color("cpu")); hw.addWidget(self.core_bars, 5, 0, 1, 2)
+        self.telemetry_values = {}
         
         layout.addLayout(hw); layout.addSpacing(20)
         
-        layout.addWidget(QLabel("COMMAND LOGS")); self.log_console = QTextEdit(); self.log_console.setReadOnly(True); self.log_console.setObjectName("log_console"); self.log_console.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff); layout.addWidget(self.log_console); layout.addStretch()
-        self.time_lbl=QLabel("00:00:00"); self.time_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter); self.time_lbl.setStyleSheet("font-size:30px; color:white; font-family:'Consolas'; border: 1px solid #334455; border-radius: 5px; margin-bottom: 10px;"); layout.addWidget(self.time_lbl)
-        h_btn = QVBoxLayout(); h_btn.setSpacing(10); sett=QPushButton("SYSTEM CONFIG"); sett.setStyleSheet("font-size: 18px; border: 2px solid #888888; color: #cccccc;"); sett.setMinimumHeight(80); sett.clicked.connect(self.open_settings)
-        quit_btn=QPushButton("DISCONNECT"); quit_btn.setObjectName("close_btn"); quit_btn.setMinimumHeight(80); quit_btn.setStyleSheet("font-size: 18px; background-color: #330000; color: #ff5555; border: 2px solid #ff0000;"); quit_btn.clicked.connect(self.start_shutdown_sequence); h_btn.addWidget(sett); h_btn.addWidget(quit_btn); layout.addLayout(h_btn); self.main_layout.addWidget(frame, row, col)
+        layout.addWidget(QLabel("COMMAND LOGS")); purge_stale_log_spills(get_data_dir()); self.log_model = LogModel(parent=self, spill_path=get_log_spill_path()); self.log_console = QListView(); self.log_console.setModel(self.log_model); self.log_console.setUniformItemSizes(True); self.log_console.setSelectionMode(QListView.SelectionMode.NoSelection); self.log_console.setEditTriggers(QListView.EditTrigger.NoEditTriggers); self.log_console.setObjectName("log_console"); self.log_scroll_timer = QTimer(); self.log_scroll_timer.setSingleShot(True); self.log_scroll_timer.setInterval(0); self.log_scroll_timer.timeout.connect(self.log_console.scrollToBottom); self.log_console.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff); layout.addWidget(self.log_console); layout.addStretch()
+        self.time_lbl=QLabel("00:00:00"); self.time_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter); self.time_lbl.setObjectName("clock_lbl"); layout.addWidget(self.time_lbl)
+        h_btn = QVBoxLayout(); h_btn.setSpacing(10); sett=QPushButton("SYSTEM CONFIG"); sett.setObjectName("config_btn"); sett.setMinimumHeight(80); sett.clicked.connect(self.open_settings)
+        quit_btn=QPushButton("DISCONNECT"); quit_btn.setObjectName("close_btn"); quit_btn.setMinimumHeight(80); quit_btn.clicked.connect(self.start_shutdown_sequence); h_btn.addWidget(sett); h_btn.addWidget(quit_btn); layout.addLayout(h_btn); self.main_layout.addWidget(frame, row, col)
         
     def update_telemetry(self): 
         self.telemetry_tick_count += 1
         self.time_lbl.setText(QTime.currentTime().toString("HH:mm:ss"))
-        self.bar_cpu.setValue(int(psutil.cpu_percent()))
-        self.bar_ram.setValue(int(psutil.virtual_memory().percent))
-        
-        if self.telemetry_tick_count % 300 == 0 or self.telemetry_tick_count == 1:
-            try: self.bar_disk.setValue(int(psutil.disk_usage('/').percent))
-            except: pass
-            try: self.bar_swap.setValue(int(psutil.swap_memory().percent))
-            except: pass
-            
-            game_running = False
-            for proc in psutil.process_iter(['name']):
-                try:
-                    if proc.info['name'] == "StarCitizen.exe":
-                        game_running = True
-                        break
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-            
-            if game_running:
-                self.status_lbl.setText("SYSTEM STATUS: ONLINE")
-                self.status_lbl.setStyleSheet("color: #44ff44; font-weight: bold;")
-            else:
-                self.status_lbl.setText("SYSTEM STATUS: OFFLINE")
-                self.status_lbl.setStyleSheet("color: #ff4444; font-weight: bold;")
+
+    def set_game_status(self, online, pid=0):
+        self.game_pid = pid if online else 0
+        self.status_lbl.setText("SYSTEM STATUS: ONLINE" if online else "SYSTEM STATUS: OFFLINE")
+        state = "online" if online else "offline"
+        if self.status_lbl.property("state") != state: self.status_lbl.setProperty("state", state); repolish(self.status_lbl)
+        if self.feed: self.feed.set_game(online, pid)
+
+    def apply_telemetry_snapshot(self, snap):
+        """Applique un instantané du sampler : seules les barres dont la valeur change sont repeintes."""
+        for key, bar in (("cpu", self.bar_cpu), ("ram", self.bar_ram), ("disk", self.bar_disk), ("swap", self.bar_swap)):
+            val = snap.get(key)
+            if val is not None and self.telemetry_values.get(key) != val: self.telemetry_values[key] = val; bar.setValue(val)
+        self.cpu_spark.push(snap["cpu"]); self.core_bars.set_cores(snap["cores"])
+        if self.mfd_server: self.mfd_server.publish_telemetry(snap)
+        if self.feed: self.feed.publish_telemetry(snap)
+        if self.journal: self.journal.write(J_TELEMETRY, snap)
+
+    def open_history(self):
+        if self.history_dialog is None: self.history_dialog = HistoryDialog(self.telemetry_history, self) # Non modal : le deck reste utilisable
+        self.history_dialog.show(); self.history_dialog.raise_()
 
     def create_shield_facing_panel(self, row, col):
         frame = QFrame(); frame.setObjectName("panel_frame"); layout = QVBoxLayout(frame)
@@ -519,11 +2801,13 @@ class SC_ControlDeck(QMainWindow):
         grp_back = self.create_shield_group("BACK", "SHIELD_BACK", "SHIELD_FWD"); grid.addWidget(grp_back, 2, 1)
         btn_reset = QPushButton("RST"); btn_reset.setFixedSize(80, 80); btn_reset.setObjectName("btn_shd_reset"); btn_reset.clicked.connect(lambda: self.send_action("SHIELD_RESET", "SHIELD RESET")); btn_reset.setFocusPolicy(Qt.FocusPolicy.NoFocus); grid.addWidget(btn_reset, 1, 1, Qt.AlignmentFlag.AlignCenter)
         layout.addLayout(grid)
-        layout.addSpacing(20); layout.addWidget(QLabel("RSI SUB-SPACE COMM-LINK")); self.rss_list = QTextEdit(); self.rss_list.setReadOnly(True); self.rss_list.setObjectName("log_console"); self.rss_list.setStyleSheet("background-color: #050505; border: 1px solid #2affea; color: #2affea; font-family: 'Verdana'; font-size: 11px; padding: 5px;"); layout.addWidget(self.rss_list)
+        layout.addSpacing(20); layout.addWidget(QLabel("RSI SUB-SPACE COMM-LINK")); self.rss_list = QTextEdit(); self.rss_list.setReadOnly(True); self.rss_list.setObjectName("rss_console"); layout.addWidget(self.rss_list)
+        cached_news = load_rss_cache().get("items")
+        if cached_news: self.update_rss_display([tuple(i) for i in cached_news]) # Affichage instantané depuis le cache disque
         self.main_layout.addWidget(frame, row, col)
 
     def create_shield_group(self, label, inc, dec):
-        w = QFrame(); w.setStyleSheet("background-color: rgba(0,20,40,0.4); border: 1px solid #4444ff; border-radius: 4px;"); l = QVBoxLayout(w); l.setContentsMargins(2,2,2,2); l.setSpacing(2); lbl = QLabel(label); lbl.setAlignment(Qt.AlignmentFlag.AlignCenter); lbl.setStyleSheet("color:#aaaaff; font-size:12px; border:none; background:transparent;"); l.addWidget(lbl); h = QHBoxLayout(); h.setSpacing(2); 
+        w = QFrame(); w.setObjectName("shield_group"); l = QVBoxLayout(w); l.setContentsMargins(2,2,2,2); l.setSpacing(2); lbl = QLabel(label); lbl.setAlignment(Qt.AlignmentFlag.AlignCenter); lbl.setObjectName("shield_group_lbl"); l.addWidget(lbl); h = QHBoxLayout(); h.setSpacing(2); 
         
         bd = QPushButton("-"); bd.setFixedSize(50,50); bd.setObjectName("btn_shield_dec"); bd.setFocusPolicy(Qt.FocusPolicy.NoFocus); bd.clicked.connect(lambda: self.send_action(dec, f"SHIELD {label} (-)")); 
         bi = QPushButton("+"); bi.setFixedSize(50,50); bi.setObjectName("btn_shield_inc"); bi.setFocusPolicy(Qt.FocusPolicy.NoFocus); bi.clicked.connect(lambda: self.send_action(inc, f"SHIELD {label} (+)")); 
@@ -531,29 +2815,20 @@ class SC_ControlDeck(QMainWindow):
         h.addWidget(bd); h.addWidget(bi); l.addLayout(h); return w
 
     def create_systems_panel(self, row, col):
+        self.systems_stack = QStackedWidget(); self.show_profile_page(self.active_profile)
+        self.main_layout.addWidget(self.systems_stack, row, col)
+
+    def build_systems_page(self, btns):
         frame = QFrame(); frame.setObjectName("panel_frame"); layout = QGridLayout(frame); layout.addWidget(QLabel("FLIGHT SYSTEMS"), 0, 0, 1, 3) 
         
-        btns = [
-            ("FLIGHT READY", "FLIGHT_READY", True), 
-            ("ENGINES", "ENGINES", True), 
-            ("QUANTUM", "QUANTUM", True),     
-            ("SCAN MODE", "SCAN", False), 
-            ("LANDING GEAR", "LANDING", True), 
-            ("DOORS", "DOORS", True),         
-            ("LIGHTS", "LIGHTS", True),       
-            ("SPACE BRAKE", "SPACE_BRAKE", False), 
-            ("DECOUPLED", "DECOUPLED", True), 
-            ("VTOL MODE", "VTOL", True)
-        ]
-        
-        r,c=1,0
+        r,c=1,0; frame.toggles = []
         for t, a, is_toggle in btns:
             b = QPushButton(t); b.setMinimumHeight(60); b.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-            if is_toggle: b.setCheckable(True)
+            if is_toggle: b.setCheckable(True); frame.toggles.append((t, b)); b.toggled.connect(self.publish_toggles)
             b.clicked.connect(lambda ch, x=a, text=t: self.send_action(x, text))
             layout.addWidget(b,r,c); c+=1; 
             if c>1: c=0; r+=1 
-        r += 1; layout.addWidget(QLabel("LANDING SERVICES"), r, 0, 1, 2); r += 1; btn_atc = QPushButton("CALL ATC (REQ LAND)"); btn_atc.setMinimumHeight(70); btn_atc.setStyleSheet("border-color: #ffff00; color: #ffff00;"); btn_atc.clicked.connect(self.call_atc); btn_atc.setFocusPolicy(Qt.FocusPolicy.NoFocus); layout.addWidget(btn_atc, r, 0); btn_al = HoldButton("AUTO LAND (HOLD)"); btn_al.setMinimumHeight(70); btn_al.setStyleSheet("border-color: #00ff00; color: #00ff00;"); btn_al.on_press_callback = lambda: self.start_hold("AUTOLAND"); btn_al.on_release_callback = self.stop_hold; layout.addWidget(btn_al, r, 1)
+        r += 1; layout.addWidget(QLabel("LANDING SERVICES"), r, 0, 1, 2); r += 1; btn_atc = QPushButton("CALL ATC (REQ LAND)"); btn_atc.setMinimumHeight(70); btn_atc.setObjectName("btn_atc"); btn_atc.clicked.connect(self.call_atc); btn_atc.setFocusPolicy(Qt.FocusPolicy.NoFocus); layout.addWidget(btn_atc, r, 0); btn_al = HoldButton("AUTO LAND (HOLD)"); btn_al.setMinimumHeight(70); btn_al.setObjectName("btn_autoland"); btn_al.on_press_callback = lambda: self.start_hold("AUTOLAND"); btn_al.on_release_callback = self.stop_hold; layout.addWidget(btn_al, r, 1)
         r += 1; 
         
         btn_exit = QPushButton("EXIT SEAT"); 
@@ -569,7 +2844,52 @@ class SC_ControlDeck(QMainWindow):
         ej.on_release_callback = self.stop_hold; 
         layout.addWidget(ej, r, 1);
         
-        self.main_layout.addWidget(frame, row, col)
+        return frame
+
+    # --- PROFILS : pages pré-construites dans un QStackedWidget, cache LRU ---
+    def profile_page(self, name):
+        """Page du profil (construite au besoin), marquée comme la plus récente ; évince au-delà de PROFILE_CACHE_MAX."""
+        page = self.profile_pages.get(name)
+        if page is None:
+            page = self.build_systems_page(self.profiles[name]["systems"]); self.systems_stack.addWidget(page); self.profile_pages[name] = page
+        self.profile_pages.move_to_end(name)
+        while len(self.profile_pages) > PROFILE_CACHE_MAX:
+            old_name = next(n for n in self.profile_pages if n != self.active_profile and n != name)
+            old = self.profile_pages.pop(old_name); self.systems_stack.removeWidget(old); old.deleteLater()
+        return page
+    def profile_binding_table(self, name):
+        table = self.profile_bindings.get(name)
+        if table is None: table = self.profile_bindings[name] = compile_bindings(dict(self.config, **self.profiles[name]["bindings"]))
+        return table
+    def show_profile_page(self, name):
+        self.active_profile = name; self.systems_stack.setCurrentWidget(self.profile_page(name)); self.bindings = self.profile_binding_table(name)
+        if self.feed: self.feed.set_profile(name); self.publish_toggles()
+    def switch_profile(self, name):
+        if name not in self.profiles or (name == self.active_profile and hasattr(self, 'systems_stack')): return
+        if not hasattr(self, 'systems_stack'): self.active_profile = name; return # Panneau pas encore construit
+        if self.hold_active_mode: self.scheduler.cancel("hold_grace"); self.finalize_hold_stop() # Ne pas garder une touche maintenue d'un autre vaisseau
+        self.cancel_macros()
+        t0 = time.perf_counter(); warm = name in self.profile_pages; self.show_profile_page(name); ms = (time.perf_counter() - t0) * 1000.0; self.profile_switch_ms.append(ms)
+        self.config["ACTIVE_PROFILE"] = name; self.scheduler.after("profile_save", 1000, lambda: self.config_file.save(self.config)) # Écriture hors du chemin de bascule
+        if self.profile_combo.currentText() != name: self.profile_combo.setCurrentText(name)
+        self.add_log_entry(f"PROFILE: {name} LOADED ({ms:.1f} MS{'' if warm else ', COLD'})", is_user_action=True)
+    def on_profiles_loaded(self, profiles):
+        self.profiles = {DEFAULT_PROFILE: default_profile(), **profiles}; self.profile_bindings.clear()
+        self.profile_combo.clear(); self.profile_combo.addItems(list(self.profiles))
+        wanted = self.config.get("ACTIVE_PROFILE", DEFAULT_PROFILE)
+        if wanted not in self.profiles: wanted = self.active_profile if self.active_profile in self.profiles else DEFAULT_PROFILE
+        if wanted != self.active_profile: self.switch_profile(wanted)
+        for name in [n for n in self.profile_pages if n not in self.profiles]: page = self.profile_pages.pop(name); self.systems_stack.removeWidget(page); page.deleteLater()
+        self.profile_combo.setCurrentText(self.active_profile); self.bindings = self.profile_binding_table(self.active_profile)
+        self.warm_queue = [n for n in self.profiles if n not in self.profile_pages][:PROFILE_CACHE_MAX - len(self.profile_pages)]
+        self.scheduler.after("profile_warm", 0, self.warm_next_profile)
+    def warm_next_profile(self):
+        """Une page par tick de l'ordonnanceur : le GUI reste réactif pendant le préchauffage."""
+        while self.warm_queue:
+            name = self.warm_queue.pop(0)
+            if name in self.profiles and name not in self.profile_pages:
+                self.profile_page(name); self.profile_binding_table(name); self.profile_pages.move_to_end(self.active_profile); break
+        if self.warm_queue: self.scheduler.after("profile_warm", 0, self.warm_next_profile)
 
     def create_power_increments_panel(self, row, col):
         frame = QFrame(); frame.setObjectName("panel_frame"); layout = QGridLayout(frame); 
@@ -578,45 +2898,70 @@ class SC_ControlDeck(QMainWindow):
         def add_pwr(idx, name, key_base): 
             dec=QPushButton("-"); dec.setFixedSize(60,80); dec.setObjectName(f"btn_{name.lower()}_dec"); dec.setFocusPolicy(Qt.FocusPolicy.NoFocus); dec.clicked.connect(lambda: self.decrease_power_logic(name)); 
             inc=QPushButton("+"); inc.setFixedSize(60,80); inc.setObjectName(f"btn_{name.lower()}_inc"); inc.setFocusPolicy(Qt.FocusPolicy.NoFocus); inc.clicked.connect(lambda: self.send_action(key_base, f"PWR: {name} (+)")); 
-            lbl=QLabel(name); lbl.setAlignment(Qt.AlignmentFlag.AlignCenter); lbl.setStyleSheet("color:white; font-weight:bold;"); layout.addWidget(dec,idx,0); layout.addWidget(lbl,idx,1); layout.addWidget(inc,idx,2)
+            lbl=QLabel(name); lbl.setAlignment(Qt.AlignmentFlag.AlignCenter); lbl.setObjectName("power_lbl"); layout.addWidget(dec,idx,0); layout.addWidget(lbl,idx,1); layout.addWidget(inc,idx,2)
         
         add_pwr(1, "WEAPONS", "WEAPON_POWER"); add_pwr(2, "SHIELDS", "SHIELD_POWER"); add_pwr(3, "ENGINES", "ENGINE_POWER"); rst=QPushButton("RESET DISTRIB."); rst.setMinimumHeight(60); rst.setFocusPolicy(Qt.FocusPolicy.NoFocus); rst.clicked.connect(lambda: self.send_action("POWER_RESET", "PWR: RESET DISTRIB")); layout.addWidget(rst,4,0,1,3)
-        layout.addWidget(QLabel("COUNTERMEASURES"), 5, 0, 1, 3); btn_decoy = QPushButton("DECOY (FLARES)"); btn_decoy.setMinimumHeight(70); btn_decoy.setObjectName("btn_weapons_inc"); btn_decoy.setFocusPolicy(Qt.FocusPolicy.NoFocus); btn_decoy.clicked.connect(lambda: self.send_action("DECOY", "DEFENSE: DECOY LAUNCHED")); layout.addWidget(btn_decoy, 6, 0, 1, 3); btn_noise = QPushButton("NOISE (CHAFFS)"); btn_noise.setMinimumHeight(70); btn_noise.setStyleSheet("color: #aaaaaa; border-color: #aaaaaa;"); btn_noise.setFocusPolicy(Qt.FocusPolicy.NoFocus); btn_noise.clicked.connect(lambda: self.send_action("NOISE", "DEFENSE: NOISE FIELD ACTIVE")); layout.addWidget(btn_noise, 7, 0, 1, 3)
+        layout.addWidget(QLabel("COUNTERMEASURES"), 5, 0, 1, 3); btn_decoy = QPushButton("DECOY (FLARES)"); btn_decoy.setMinimumHeight(70); btn_decoy.setObjectName("btn_weapons_inc"); btn_decoy.setFocusPolicy(Qt.FocusPolicy.NoFocus); btn_decoy.clicked.connect(lambda: self.send_action("DECOY", "DEFENSE: DECOY LAUNCHED")); layout.addWidget(btn_decoy, 6, 0, 1, 3); btn_noise = QPushButton("NOISE (CHAFFS)"); btn_noise.setMinimumHeight(70); btn_noise.setObjectName("btn_noise"); btn_noise.setFocusPolicy(Qt.FocusPolicy.NoFocus); btn_noise.clicked.connect(lambda: self.send_action("NOISE", "DEFENSE: NOISE FIELD ACTIVE")); layout.addWidget(btn_noise, 7, 0, 1, 3)
         
         layout.addWidget(QLabel("MISSION NOTES"))
-        self.notes_widget = NotesWidget()
-        layout.addWidget(self.notes_widget, 8, 0, 1, 3)
+        self.notes_panel = NotesPanel(); self.notes_widget = self.notes_panel.editor
+        layout.addWidget(self.notes_panel, 8, 0, 1, 3)
         
         self.main_layout.addWidget(frame, row, col)
 
-    def decrease_power_logic(self, target): self.add_log_entry(f"REBALANCING: DECREASE {target}", is_user_action=True); self.send_action("SHIELD_POWER", silent=True) if target=="WEAPONS" else None; self.send_action("ENGINE_POWER", silent=True) if target=="WEAPONS" else None; self.send_action("WEAPON_POWER", silent=True) if target=="SHIELDS" else None; self.send_action("ENGINE_POWER", silent=True) if target=="SHIELDS" else None; self.send_action("WEAPON_POWER", silent=True) if target=="ENGINES" else None; self.send_action("SHIELD_POWER", silent=True) if target=="ENGINES" else None
-
-    def apply_styles(self):
-        self.setStyleSheet("""
-            QMainWindow { background-color: #000000; }
-            QWidget { font-family: 'Verdana'; font-size: 14px; }
-            QFrame#panel_frame { background-color: #0a0a0a; border: 1px solid #2affea; border-radius: 0px; border-right: 5px solid #2affea; }
-            QFrame#header_frame { background-color: #0a0a0a; border-bottom: 2px solid #2affea; }
-            QLabel { color: #2affea; font-weight: bold; }
-            QLabel#panel_title { font-size: 18px; border-bottom: 1px dashed #2affea; margin-bottom: 15px; padding-bottom: 5px; color: #ffffff;}
-            QTextEdit#log_console { background-color: #000000; border: 1px dotted #004400; font-family: 'Consolas'; font-size: 11px; }
-            QPushButton { background-color: rgba(42, 255, 234, 0.08); color: #2affea; border: 1px solid #2affea; border-radius: 2px; font-weight: bold; }
-            QPushButton:pressed { background-color: #2affea; color: black; }
-            QPushButton:checked { background-color: #2affea; color: black; border: 2px solid #ffffff; }
-            QPushButton:hover { background-color: rgba(42, 255, 234, 0.2); border: 1px solid white; }
-            QPushButton#btn_shd_reset { color: #ffaa00; border: 2px solid #ffaa00; font-size: 16px; }
-            QPushButton#btn_shd_reset:pressed { background-color: #ffaa00; color: black; }
-            QPushButton#btn_shield_inc, QPushButton#btn_shield_dec { font-size: 24px; border: 1px solid #4444ff; color: #4444ff; background-color: rgba(0,0,50,0.3); }
-            QPushButton#btn_weapons_inc, QPushButton#btn_weapons_dec { color: #ff4444; border-color: #ff4444; font-size: 20px; }
-            QPushButton#btn_engines_inc, QPushButton#btn_engines_dec { color: #44ff44; border-color: #44ff44; font-size: 20px; }
-            QPushButton#btn_shields_inc, QPushButton#btn_shields_dec { color: #4444ff; border-color: #4444ff; font-size: 20px; }
-            QPushButton#close_btn { background-color: #220000; color: #aa0000; border: 1px solid #550000; }
-            QPushButton#btn_danger { color: #ffaa00; border: 1px dashed #ffaa00; }
-            QProgressBar { border: 1px solid #334455; background-color: #000000; text-align: center; color: white; }
-        """)
+    def start_mfd_server(self, host, port, token=""):
+        if not token and not is_loopback_host(host): # Jamais d'injection de touches ouverte à tout le réseau sans jeton
+            import secrets
+            token = self.config["NET_SERVER_TOKEN"] = secrets.token_urlsafe(16); self.config_file.save(self.config)
+            self.add_log_entry(f"NET: ACCESS TOKEN GENERATED FOR {host} (NET_SERVER_TOKEN IN CONFIG)", is_user_action=True)
+        self.mfd_server = MFDServer([a for a in self.bindings if a != "ATC_KEY_BASE"], host, port, token, macros=self.macros)
+        self.mfd_server.remote_command.connect(self.handle_remote_command, Qt.ConnectionType.QueuedConnection); self.mfd_server.start()
+        return self.mfd_server
+    def start_feed(self, socket_path=""):
+        """Segment de mémoire partagée (et flux socket optionnel) pour les overlays et outils locaux."""
+        if sc_mfd_feed is None: print("Feed Error: sc_mfd_feed.py not found next to the script"); return None
+        try: self.feed = sc_mfd_feed.FeedWriter()
+        except Exception as e: print(f"Feed Error: {e}"); return None
+        self.feed.set_game(bool(self.game_pid), self.game_pid); self.feed.set_profile(self.active_profile); self.publish_toggles()
+        if socket_path:
+            if not hasattr(__import__("socket"), "AF_UNIX"): print("Feed Error: Unix sockets not supported on this system")
+            else: self.feed_stream = sc_mfd_feed.FeedStreamServer(socket_path); self.feed_stream.start()
+        return self.feed
+    def publish_toggles(self, *_):
+        page = self.profile_pages.get(self.active_profile)
+        if self.feed and page is not None: self.feed.set_toggles((t, b.isChecked()) for t, b in page.toggles)
+    def handle_remote_command(self, msg):
+        t = msg["t"]
+        if t == "action": self.send_action(msg["a"], f"NET: {msg['a']}")
+        elif t == "hold": self.start_hold(msg["m"]) if msg["s"] == "start" else self.stop_hold()
+        elif t == "atc": self.call_atc()
+        elif t == "power_dec": self.decrease_power_logic(msg["target"])
+        elif t == "macro":
+            if self.journal: self.journal.write(J_INPUT, msg)
+            self.cancel_macros(msg["m"]) if msg.get("s") == "cancel" else self.run_macro(msg["m"])
+
+    def replay_record(self, kind, value):
+        """Rejoue une entrée du journal de session (entrées utilisateur et télémétrie) ; le reste (journal, touches, macros) est ignoré,
+        ce sont des sorties du deck. Les entrées rejouées sont réenregistrées si le journal tourne : run_replay compare ce second journal à l'original."""
+        if kind == J_TELEMETRY: self.apply_telemetry_snapshot(value)
+        elif kind == J_INPUT: self.send_action(value["a"]) if value.get("t") == "action" else self.handle_remote_command(value)
+
+    def decrease_power_logic(self, target): self.journal.write(J_INPUT, {"t": "power_dec", "target": target}) if self.journal else None; self.add_log_entry(f"REBALANCING: DECREASE {target}", is_user_action=True); self.run_macro(f"POWER_DEC_{target}")
+
+    def apply_styles(self): THEME.apply(self.config.get("THEME", DEFAULT_THEME)) # Feuille unique posée sur l'application ; marque cette fenêtre au thème courant
+
+    def cycle_theme(self): names = THEME.names(); self.set_theme(names[(names.index(THEME.name) + 1) % len(names)] if THEME.name in names else DEFAULT_THEME)
+    def set_theme(self, name):
+        """Bascule de thème à chaud : propriété theme + repolish des widgets (feuille inchangée), puis recoloration des widgets peints à la main."""
+        self.config["THEME"] = name; THEME.apply(name)
+        if hasattr(self, 'cpu_spark'): self.cpu_spark.set_color(THEME.color("cpu")); self.core_bars.set_color(THEME.color("cpu")); self.log_model.set_colors(THEME.color("log_system"), THEME.color("log_user"))
+        if getattr(self, 'rss_items', None): self.update_rss_display(self.rss_items)
+        if self.hold_active_mode: self.action_overlay.set_config(THEME.color("eject") if self.hold_active_mode == "EJECT" else THEME.color("autoland"), self.action_overlay.text_main)
+        self.sys_overlay.update(); self.perf_monitor.hud.update()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    STARTUP_TRACE.mark("qapplication")
     window = SC_ControlDeck()
     saved_screen_idx = window.config.get("TARGET_SCREEN_INDEX", 1)
     screens = app.screens()
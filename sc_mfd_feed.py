@@ -0,0 +1,312 @@
+"""Flux local du MFD : instantané à disposition fixe en mémoire partagée + flux de changements optionnel.
+
+Le deck (sc-mfd.py) écrit, n'importe quel outil local lit, sans psutil ni Qt, sans solliciter le deck :
+
+    from sc_mfd_feed import FeedReader
+    with FeedReader() as feed:
+        state = feed.read()                      # dict complet (télémétrie, jeu, hold, profil, toggles, commandes)
+        if feed.changed(state["seq"]): ...       # test d'un seul entier, sans copie
+
+    python sc_mfd_feed.py                        # affiche l'état courant
+    python sc_mfd_feed.py --watch                # réaffiche à chaque changement
+    python sc_mfd_feed.py --stream /tmp/mfd.sock # suit le flux JSON du socket Unix (FEED_SOCKET)
+    python sc_mfd_feed.py --bench 16             # débit avec 16 processus lecteurs concurrents
+
+Protocole seqlock : l'écrivain passe le compteur à une valeur impaire, écrit le bloc, puis le repasse à une
+valeur paire. Un lecteur copie le segment entre deux lectures égales et paires du compteur, sinon il recommence.
+Seule la bibliothèque standard est utilisée.
+"""
+import os
+import sys
+import json
+import time
+import struct
+import threading
+from collections import deque
+
+FEED_NAME = os.environ.get("SC_MFD_FEED_NAME", "RSI_MFD_FEED") # Variable d'environnement : deck de test / deuxième deck
+FEED_MAGIC = b"SCMF"
+FEED_VERSION = 1
+FEED_MAX_CORES = 64
+FEED_MAX_TOGGLES = 32
+FEED_NAME_LEN = 24
+FEED_COMMANDS = 8 # Dernières commandes envoyées au jeu (anneau)
+FEED_MISSING = 255
+FEED_HOLD_MODES = (None, "EJECT", "AUTOLAND")
+FEED_STREAM_POLL_S = 0.05 # Cadence de scrutation du flux socket, uniquement quand un client est connecté
+
+HEADER = struct.Struct("<4sHHII") # magic, version, taille du segment, séquence (seqlock), pid de l'écrivain (0 = arrêté)
+SEQ = struct.Struct("<I"); SEQ_OFFSET = 8; PID_OFFSET = 12
+BLOCKS = (
+    ("telemetry", struct.Struct(f"<d5B{FEED_MAX_CORES}B")), # ts, cpu, ram, disk, swap, nb coeurs, coeurs
+    ("game", struct.Struct("<BI")), # en ligne, pid
+    ("hold", struct.Struct("<Bf")), # mode (index FEED_HOLD_MODES), progression 0..1
+    ("profile", struct.Struct(f"<{FEED_NAME_LEN}s")),
+    ("toggles", struct.Struct(f"<BI{FEED_MAX_TOGGLES * FEED_NAME_LEN}s")), # nombre, masque des états, noms
+    ("commands", struct.Struct(f"<I{FEED_COMMANDS}d{FEED_COMMANDS * FEED_NAME_LEN}s")), # total envoyé, horodatages, noms (plus ancien d'abord)
+)
+
+def _layout():
+    offsets, off = {}, HEADER.size
+    for name, st in BLOCKS: offsets[name] = (off, st); off += (st.size + 7) & ~7 # Blocs alignés sur 8 octets
+    return offsets, off
+FEED_LAYOUT, FEED_SIZE = _layout()
+
+def _name(text): return text.encode("utf-8")[:FEED_NAME_LEN]
+def _names(blob, count): return [blob[i * FEED_NAME_LEN:(i + 1) * FEED_NAME_LEN].rstrip(b"\0").decode("utf-8", "replace") for i in range(count)]
+
+def _attach(name, create):
+    """Écrivain suivi par le resource_tracker (segment supprimé même après un plantage) ; lecteurs non suivis,
+    sinon un lecteur qui se termine supprimerait le segment du deck."""
+    from multiprocessing import shared_memory
+    if create: return shared_memory.SharedMemory(name=name, create=True, size=FEED_SIZE)
+    if sys.version_info >= (3, 13): return shared_memory.SharedMemory(name=name, track=False)
+    if os.name != "posix": return shared_memory.SharedMemory(name=name)
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register; resource_tracker.register = lambda *args, **kwargs: None # Pas d'enregistrement (un unregister toucherait celui de l'écrivain)
+    try: return shared_memory.SharedMemory(name=name)
+    finally: resource_tracker.register = register
+
+def _owner_pid(name):
+    try:
+        shm = _attach(name, False)
+        try: return HEADER.unpack_from(shm.buf, 0)[4] if shm.size >= HEADER.size else 0
+        finally: shm.close()
+    except (OSError, ValueError): return 0
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid) # PROCESS_QUERY_LIMITED_INFORMATION
+        if handle: ctypes.windll.kernel32.CloseHandle(handle)
+        return bool(handle)
+    try: os.kill(pid, 0); return True
+    except ProcessLookupError: return False
+    except PermissionError: return True
+
+class FeedWriter:
+    """Côté deck. Chaque écriture = quelques pack_into dans la mémoire mappée : aucun appel système."""
+    def __init__(self, name=FEED_NAME):
+        self.name = name; self.seq = 0; self.writes = 0; self._lock = threading.Lock(); self._commands = deque(maxlen=FEED_COMMANDS); self._command_total = 0
+        try: self.shm = _attach(name, True)
+        except FileExistsError:
+            owner = _owner_pid(name)
+            if owner and owner != os.getpid() and _pid_alive(owner): raise RuntimeError(f"MFD feed '{name}' already published by pid {owner}")
+            if os.name == "posix": self._unlink(); self.shm = _attach(name, True) # Segment orphelin d'un plantage : recréé
+            else: # Windows : encore ouvert par un lecteur ; repris tel quel
+                self.shm = _attach(name, False)
+                if self.shm.size < FEED_SIZE: self.shm.close(); raise
+        self.buf = self.shm.buf
+        self.buf[:FEED_SIZE] = bytes(FEED_SIZE)
+        HEADER.pack_into(self.buf, 0, FEED_MAGIC, FEED_VERSION, FEED_SIZE, 0, os.getpid())
+
+    def _write(self, block, *values):
+        off, st = FEED_LAYOUT[block]
+        with self._lock: # Plusieurs threads du deck peuvent publier ; les lecteurs, eux, ne prennent jamais de verrou
+            if self.buf is None: return # Fermé (arrêt du deck)
+            self.seq += 1; SEQ.pack_into(self.buf, SEQ_OFFSET, self.seq)
+            st.pack_into(self.buf, off, *values)
+            self.seq += 1; SEQ.pack_into(self.buf, SEQ_OFFSET, self.seq)
+            self.writes += 1
+
+    def publish_telemetry(self, snap):
+        cores = tuple(snap.get("cores", ()))[:FEED_MAX_CORES]
+        vals = [FEED_MISSING if snap.get(k) is None else max(0, min(100, int(snap[k]))) for k in ("cpu", "ram", "disk", "swap")]
+        self._write("telemetry", snap.get("ts", time.time()), *vals, len(cores), *(max(0, min(100, int(c))) for c in cores), *([0] * (FEED_MAX_CORES - len(cores))))
+    def set_game(self, online, pid=0): self._write("game", 1 if online else 0, pid if online else 0)
+    def set_hold(self, mode, progress=0.0): self._write("hold", FEED_HOLD_MODES.index(mode) if mode in FEED_HOLD_MODES else 0, float(progress))
+    def set_profile(self, name): self._write("profile", _name(name))
+    def set_toggles(self, toggles):
+        """toggles : [(nom, coché)] du panneau système affiché."""
+        toggles = list(toggles)[:FEED_MAX_TOGGLES]; mask = 0
+        for i, (_, on) in enumerate(toggles): mask |= (1 << i) if on else 0
+        self._write("toggles", len(toggles), mask, b"".join(_name(n).ljust(FEED_NAME_LEN, b"\0") for n, _ in toggles))
+    def push_command(self, name):
+        with self._lock: self._commands.append((time.time(), _name(name))); self._command_total += 1; cmds = list(self._commands); total = self._command_total
+        cmds = [(0.0, b"")] * (FEED_COMMANDS - len(cmds)) + cmds
+        self._write("commands", total, *(ts for ts, _ in cmds), b"".join(n.ljust(FEED_NAME_LEN, b"\0") for _, n in cmds))
+
+    def _unlink(self):
+        from multiprocessing import shared_memory
+        try: shm = shared_memory.SharedMemory(name=self.name); shm.close(); shm.unlink()
+        except FileNotFoundError: pass
+    def close(self):
+        """pid à 0 (les lecteurs voient l'arrêt), puis suppression du segment (POSIX ; Windows le libère avec le dernier handle)."""
+        with self._lock:
+            if self.buf is None: return
+            struct.pack_into("<I", self.buf, PID_OFFSET, 0); self.buf = None
+        self.shm.close()
+        if os.name == "posix":
+            try: self.shm.unlink()
+            except FileNotFoundError: pass
+
+class FeedReader:
+    """Côté outil. read() : copie cohérente du segment (quelques µs), sans verrou ni appel au deck."""
+    def __init__(self, name=FEED_NAME):
+        self.shm = _attach(name, False); self.buf = self.shm.buf; self.reads = 0; self.retries = 0
+        magic, version, size, _, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != FEED_MAGIC or version != FEED_VERSION or size != FEED_SIZE or self.shm.size < FEED_SIZE:
+            self.close(); raise ValueError(f"Incompatible MFD feed (magic={magic!r}, version={version}, size={size})")
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+    def close(self):
+        if self.buf is not None: self.buf.release(); self.buf = None; self.shm.close()
+
+    def seq(self): return SEQ.unpack_from(self.buf, SEQ_OFFSET)[0]
+    def changed(self, last_seq): return self.seq() != last_seq
+    def writer_alive(self): return struct.unpack_from("<I", self.buf, PID_OFFSET)[0] != 0
+
+    def read_raw(self):
+        """(seq, bytes) cohérents : recommence tant qu'une écriture est en cours ou a eu lieu pendant la copie."""
+        spins = 0
+        while True:
+            s1 = SEQ.unpack_from(self.buf, SEQ_OFFSET)[0]
+            if not s1 & 1:
+                data = bytes(self.buf[:FEED_SIZE])
+                if SEQ.unpack_from(self.buf, SEQ_OFFSET)[0] == s1: self.reads += 1; return s1, data
+            self.retries += 1; spins += 1
+            if spins > 100: time.sleep(0); spins = 0 # Écrivain préempté au milieu d'un bloc : céder la main
+
+    def read(self): return decode(*self.read_raw())
+
+def decode(seq, data):
+    """Segment brut -> dict (format stable, identique au flux socket)."""
+    _, _, _, _, pid = HEADER.unpack_from(data, 0); out = {"seq": seq, "writer_pid": pid}
+    off, st = FEED_LAYOUT["telemetry"]; v = st.unpack_from(data, off)
+    out["ts"] = v[0]; out.update({k: (None if v[i + 1] == FEED_MISSING else v[i + 1]) for i, k in enumerate(("cpu", "ram", "disk", "swap"))}); out["cores"] = list(v[6:6 + v[5]])
+    off, st = FEED_LAYOUT["game"]; online, gpid = st.unpack_from(data, off); out["game_online"] = bool(online); out["game_pid"] = gpid
+    off, st = FEED_LAYOUT["hold"]; mode, progress = st.unpack_from(data, off); out["hold_mode"] = FEED_HOLD_MODES[mode] if mode < len(FEED_HOLD_MODES) else None; out["hold_progress"] = round(progress, 4)
+    off, st = FEED_LAYOUT["profile"]; out["profile"] = st.unpack_from(data, off)[0].rstrip(b"\0").decode("utf-8", "replace")
+    off, st = FEED_LAYOUT["toggles"]; count, mask, names = st.unpack_from(data, off); out["toggles"] = {n: bool(mask >> i & 1) for i, n in enumerate(_names(names, count))}
+    off, st = FEED_LAYOUT["commands"]; v = st.unpack_from(data, off); total = v[0]; stamps = v[1:1 + FEED_COMMANDS]; names = _names(v[-1], FEED_COMMANDS)
+    out["command_total"] = total; out["commands"] = [(ts, n) for ts, n in zip(stamps, names) if n]
+    return out
+
+# --- FLUX DE CHANGEMENTS (SOCKET UNIX) ---
+class _StreamClient:
+    __slots__ = ("event", "pending")
+    def __init__(self, event): self.event = event; self.pending = None
+
+class FeedStreamServer(threading.Thread):
+    """Diffuse les changements en lignes JSON. C'est un simple lecteur du segment : rien à faire côté deck.
+    Premier message {"t": "snap", ...} complet, puis {"t": "diff", "seq": n, <champs modifiés>}. Client lent : seul le dernier état compte."""
+    def __init__(self, path, name=FEED_NAME, poll_s=FEED_STREAM_POLL_S):
+        super().__init__(daemon=True); self.path = path; self.name = name; self.poll_s = poll_s
+        self.loop = None; self.clients = set(); self.ready = threading.Event(); self.sent = 0; self.error = None
+
+    def run(self):
+        import asyncio
+        self.loop = asyncio.new_event_loop()
+        try: self.loop.run_until_complete(self._serve())
+        except Exception as e: self.error = e; print(f"Feed stream error: {e}")
+        finally: self.ready.set(); self.loop.close()
+
+    async def _serve(self):
+        import asyncio
+        if os.path.exists(self.path): os.unlink(self.path) # Socket orphelin d'une session précédente
+        self.reader = FeedReader(self.name); self._halted = asyncio.Event(); self._wake = asyncio.Event(); self._baseline = None
+        server = await asyncio.start_unix_server(self._handle, path=self.path); self.ready.set()
+        last = None
+        try:
+            while not self._halted.is_set():
+                if not self.clients: # Personne n'écoute : aucun réveil périodique
+                    self._wake.clear(); await self._wake.wait(); last = self._baseline; continue
+                if self.reader.changed(last["seq"]):
+                    state = self.reader.read(); diff = {k: v for k, v in state.items() if last.get(k) != v}; last = state
+                    for client in list(self.clients): # Client en retard : les diffs s'accumulent en un seul message
+                        client.pending = diff if client.pending is None else dict(client.pending, **diff); client.event.set()
+                await asyncio.sleep(self.poll_s)
+        finally:
+            server.close(); self.reader.close()
+            try: os.unlink(self.path)
+            except OSError: pass
+
+    async def _handle(self, reader, writer):
+        import asyncio
+        client = _StreamClient(asyncio.Event()); state = self.reader.read()
+        if not self.clients: self._baseline = state # Premier client : les diffs partent de son instantané (un changement avant le réveil n'est pas perdu)
+        self.clients.add(client); self._wake.set()
+        try:
+            writer.write((json.dumps(dict(state, t="snap")) + "\n").encode()); await writer.drain(); self.sent += 1
+            while not self._halted.is_set():
+                await client.event.wait(); client.event.clear()
+                diff, client.pending = client.pending, None
+                if diff: writer.write((json.dumps(dict(diff, t="diff")) + "\n").encode()); await writer.drain(); self.sent += 1
+        except (ConnectionError, asyncio.CancelledError): pass
+        finally:
+            self.clients.discard(client); writer.close()
+
+    def stop(self):
+        if self.loop and self.loop.is_running():
+            def _halt():
+                self._halted.set(); self._wake.set()
+                for c in self.clients: c.event.set()
+            self.loop.call_soon_threadsafe(_halt)
+        self.join(2.0)
+
+def stream(path):
+    """Générateur côté outil : état complet reconstruit à chaque message du flux socket."""
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM); sock.connect(path); state = {}
+    with sock, sock.makefile("r", encoding="utf-8") as f:
+        for line in f:
+            msg = json.loads(line); kind = msg.pop("t"); state = msg if kind == "snap" else dict(state, **msg)
+            yield state
+
+# --- BANC DE DEBIT ---
+def _reader_proc(name, seconds, out):
+    reader = FeedReader(name); end = time.perf_counter() + seconds; n = 0
+    while time.perf_counter() < end:
+        reader.read(); n += 1
+    out.put((n, reader.retries)); reader.close()
+
+def run_throughput(writer, readers=8, seconds=2.0, publish_hz=60):
+    """N processus lecteurs décodent en boucle pendant qu'un thread publie (60 Hz = animation de hold ; 0 = aussi vite que possible).
+    Retourne lectures/s, taux de relecture (lectures déchirées) et coût d'une publication côté écrivain."""
+    import multiprocessing as mp
+    ctx = mp.get_context("spawn"); out = ctx.Queue(); stop = threading.Event(); publish = {"n": 0, "s": 0.0}
+    snap = {"ts": time.time(), "cpu": 42, "ram": 61, "disk": 70, "swap": None, "cores": tuple(range(16))}
+    def pump():
+        while not stop.is_set():
+            t0 = time.perf_counter(); writer.publish_telemetry(snap); publish["s"] += time.perf_counter() - t0; publish["n"] += 1
+            if publish_hz: time.sleep(1.0 / publish_hz)
+    procs = [ctx.Process(target=_reader_proc, args=(writer.name, seconds, out)) for _ in range(readers)]
+    for p in procs: p.start()
+    time.sleep(0.3); pumper = threading.Thread(target=pump, daemon=True); pumper.start() # Lecteurs démarrés (spawn) avant la mesure
+    results = [out.get(timeout=seconds + 30) for _ in procs]; stop.set(); pumper.join()
+    for p in procs: p.join()
+    reads = sum(n for n, _ in results); retries = sum(r for _, r in results)
+    return {"readers": readers, "reads_per_s": reads / seconds, "reads_per_s_per_reader": reads / seconds / readers,
+            "retry_ratio": retries / max(1, reads), "publish_us": publish["s"] * 1e6 / max(1, publish["n"]), "publishes": publish["n"]}
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="SC MFD local feed reader")
+    parser.add_argument("--name", default=FEED_NAME, help="nom du segment de mémoire partagée")
+    parser.add_argument("--watch", action="store_true", help="réaffiche à chaque changement")
+    parser.add_argument("--stream", metavar="SOCKET", help="suit le flux JSON du socket Unix")
+    parser.add_argument("--bench", type=int, metavar="READERS", help="banc de débit (segment privé, sans deck)")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--publish-hz", type=float, default=60, help="cadence de l'écrivain pendant le banc (0 = en continu)")
+    args = parser.parse_args(argv)
+    if args.bench:
+        writer = FeedWriter(f"{args.name}_BENCH_{os.getpid()}")
+        try: print(json.dumps(run_throughput(writer, args.bench, args.seconds, args.publish_hz), indent=2))
+        finally: writer.close()
+        return 0
+    if args.stream:
+        for state in stream(args.stream): print(json.dumps(state))
+        return 0
+    try: reader = FeedReader(args.name)
+    except FileNotFoundError: print("MFD feed not running"); return 1
+    with reader:
+        last = None
+        while True:
+            if last is None or reader.changed(last):
+                state = reader.read(); last = state["seq"]; print(json.dumps(state))
+            if not args.watch: return 0
+            if not reader.writer_alive(): print("MFD stopped"); return 0
+            time.sleep(FEED_STREAM_POLL_S)
+
+if __name__ == "__main__":
+    sys.exit(main())
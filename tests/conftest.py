@@ -0,0 +1,44 @@
+"""Fixtures communes : module du deck chargé comme dans le banc (Qt offscreen, faux pynput, dossier de données temporaire)."""
+import os
+import sys
+import time
+import tempfile
+import importlib.util
+
+import pytest
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _load_bench():
+    spec = importlib.util.spec_from_file_location("sc_mfd_bench", os.path.join(HERE, "sc-mfd-bench.py"))
+    mod = importlib.util.module_from_spec(spec); spec.loader.exec_module(mod)
+    return mod
+
+@pytest.fixture(scope="session")
+def bench():
+    return _load_bench()
+
+@pytest.fixture(scope="session")
+def mfd(bench):
+    mod = bench.load_deck_module(tempfile.mkdtemp(prefix="sc_mfd_tests_"))
+    mod.DEFAULT_CONFIG["RSS_FEED_URL"] = "http://127.0.0.1:9/" # Pas de réseau pendant les tests
+    return mod
+
+@pytest.fixture(scope="session")
+def app(mfd):
+    return mfd.QApplication.instance() or mfd.QApplication(sys.argv[:1])
+
+@pytest.fixture
+def spin(app):
+    def run(ms):
+        end = time.perf_counter() + ms / 1000.0
+        while time.perf_counter() < end: app.processEvents(); time.sleep(0.001)
+    return run
+
+@pytest.fixture
+def deck(mfd, app, spin):
+    d = mfd.SC_ControlDeck(); d.build_all_panels(); d.show(); spin(50)
+    for job in ("telemetry", "ambient_log", "throttle", "rss_refresh"): d.scheduler.cancel(job)
+    d.input_engine.backend = mfd.RecordingBackend()
+    yield d
+    d.shutdown_services(); d.close(); d.deleteLater(); spin(10)
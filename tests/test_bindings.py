@@ -0,0 +1,9 @@
+def test_settings_are_never_compiled_as_bindings(mfd):
+    table = mfd.compile_bindings(dict(mfd.DEFAULT_CONFIG, RSS_FEED_URL="k", NET_SERVER_HOST="h", FEED_SOCKET="x"))
+    assert not any(key in table for key in mfd.DEFAULT_SETTINGS)
+    assert set(table) == set(mfd.DEFAULT_BINDINGS) and not table.errors
+
+
+def test_custom_actions_stay_bindings(mfd):
+    table = mfd.compile_bindings(dict(mfd.DEFAULT_CONFIG, CARGO_LIGHTS="alt+l"))
+    assert table.get("CARGO_LIGHTS").spec == "alt+l"
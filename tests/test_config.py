@@ -0,0 +1,50 @@
+import json
+import os
+
+
+def _write(mfd, path, data): mfd.atomic_write_text(str(path), data if isinstance(data, str) else json.dumps(data)) # Édition externe (nouvel inode)
+
+
+def test_v1_file_is_migrated_and_rewritten(mfd, tmp_path):
+    path = tmp_path / "c.json"; path.write_text(json.dumps({"ATC_KEY_BASE": "v", "DECOY": "h"}))
+    conf = mfd.ConfigFile(str(path)).load()
+    assert conf["ATC_KEY_BASE"] == "alt+v@0.1" and conf["DECOY"] == "h" and conf["CONFIG_VERSION"] == mfd.CONFIG_VERSION
+    assert conf["THEME"] == mfd.DEFAULT_CONFIG["THEME"] # Clés manquantes reprises des défauts
+    on_disk = json.loads(path.read_text())
+    assert on_disk["CONFIG_VERSION"] == mfd.CONFIG_VERSION and on_disk["ATC_KEY_BASE"] == "alt+v@0.1"
+    assert mfd.ConfigFile(str(path)).load()["ATC_KEY_BASE"] == "alt+v@0.1" # Migration appliquée une seule fois
+
+
+def test_current_file_is_not_rewritten(mfd, tmp_path):
+    path = tmp_path / "c.json"; text = json.dumps(dict(mfd.DEFAULT_CONFIG, DECOY="h")); path.write_text(text)
+    cfg = mfd.ConfigFile(str(path)); assert cfg.load()["DECOY"] == "h"
+    assert path.read_text() == text and cfg.poll() is None
+
+
+def test_unreadable_or_future_files_fall_back_and_are_kept(mfd, tmp_path):
+    for text in ("{not json", json.dumps({"CONFIG_VERSION": mfd.CONFIG_VERSION + 1})):
+        path = tmp_path / "c.json"; path.write_text(text); cfg = mfd.ConfigFile(str(path))
+        assert cfg.load() == mfd.DEFAULT_CONFIG and cfg.last_error
+        assert (tmp_path / "c.json.bad").read_text() == text # Copie avant qu'une sauvegarde n'écrase l'original
+
+
+def test_poll_sees_external_edits_only(mfd, tmp_path):
+    path = tmp_path / "c.json"; cfg = mfd.ConfigFile(str(path)); conf = cfg.load(); assert cfg.save(conf)
+    assert cfg.poll() is None # Notre propre écriture
+    _write(mfd, path, path.read_text()); assert cfg.poll() is None # Même contenu
+    _write(mfd, path, dict(conf, DECOY="k")); assert cfg.poll()["DECOY"] == "k"
+    _write(mfd, path, "[]"); assert cfg.poll() is None and cfg.last_error
+    _write(mfd, path, dict(conf, DECOY="j")); assert cfg.poll()["DECOY"] == "j" and cfg.last_error is None
+
+
+def test_deck_hot_reloads_the_config_file(mfd, deck, tmp_path):
+    path = tmp_path / "c.json"; deck.config_file = mfd.ConfigFile(str(path)); deck.config_file.save(deck.config)
+    log = deck.log_model.records; before = len(log)
+    _write(mfd, path, dict(deck.config, DECOY="alt+k", NET_SERVER_PORT=9999)); deck.check_config_file()
+    assert deck.bindings.get("DECOY").spec == "alt+k" and deck.config["NET_SERVER_PORT"] == 9999
+    lines = [log[i][2] for i in range(before, len(log))]
+    assert lines[0].startswith("CONFIG: FILE RELOADED, 2 KEY(S)") and lines[1] == "CONFIG: NET_SERVER_PORT APPLY ON RESTART"
+    _write(mfd, path, "{"); deck.check_config_file(); deck.check_config_file()
+    assert deck.bindings.get("DECOY").spec == "alt+k" # Fichier invalide : config en cours conservée
+    assert [log[i][2] for i in range(before, len(log))][2:] == [f"CONFIG: INVALID FILE, KEEPING CURRENT ({deck.config_file.last_error[:60]})"] # Signalé une fois
+    assert not os.path.exists(str(path) + ".bad") # Seul load() copie le fichier illisible
@@ -0,0 +1,66 @@
+import os
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def feed(mfd):
+    return mfd.sc_mfd_feed
+
+
+@pytest.fixture
+def writer(feed):
+    w = feed.FeedWriter(f"SC_MFD_TEST_{os.getpid()}_{time.monotonic_ns()}")
+    yield w
+    w.close()
+
+
+def test_reader_decodes_every_block(feed, writer):
+    writer.publish_telemetry({"ts": 12.5, "cpu": 42, "ram": 130, "disk": None, "swap": 3, "cores": (10, 20)})
+    writer.set_game(True, 4242); writer.set_hold("AUTOLAND", 0.25); writer.set_profile("MINING")
+    writer.set_toggles([("VPN", True), ("HDR", False)]); writer.push_command("EJECT"); writer.push_command("LAND")
+    with feed.FeedReader(writer.name) as reader:
+        state = reader.read()
+        assert state["seq"] == writer.seq and state["seq"] % 2 == 0 and state["writer_pid"] == os.getpid()
+        assert (state["cpu"], state["ram"], state["disk"], state["swap"], state["cores"]) == (42, 100, None, 3, [10, 20]) # Bornes et champ absent
+        assert state["game_online"] and state["game_pid"] == 4242 and (state["hold_mode"], state["hold_progress"]) == ("AUTOLAND", 0.25)
+        assert state["profile"] == "MINING" and state["toggles"] == {"VPN": True, "HDR": False}
+        assert state["command_total"] == 2 and [n for _, n in state["commands"]] == ["EJECT", "LAND"] # Plus ancien d'abord
+        assert not reader.changed(state["seq"])
+        writer.set_hold(None); assert reader.changed(state["seq"])
+
+
+def test_reader_retries_while_a_write_is_in_progress(feed, writer):
+    writer.set_profile("OLD"); result = {}
+    with feed.FeedReader(writer.name) as reader:
+        feed.SEQ.pack_into(writer.buf, feed.SEQ_OFFSET, writer.seq + 1) # Écrivain bloqué au milieu d'un bloc (compteur impair)
+        off, st = feed.FEED_LAYOUT["profile"]; st.pack_into(writer.buf, off, b"HALF")
+        t = threading.Thread(target=lambda: result.update(state=reader.read())); t.start(); time.sleep(0.05)
+        assert t.is_alive() and reader.retries > 0 # Aucune copie déchirée rendue
+        st.pack_into(writer.buf, off, b"NEW"); writer.seq += 2; feed.SEQ.pack_into(writer.buf, feed.SEQ_OFFSET, writer.seq)
+        t.join(2)
+        assert result["state"]["profile"] == "NEW" and result["state"]["seq"] == writer.seq
+
+
+def test_second_writer_is_refused_and_close_is_visible(feed, writer):
+    feed.struct.pack_into("<I", writer.buf, feed.PID_OFFSET, os.getppid()) # Segment publié par un autre processus vivant
+    with pytest.raises(RuntimeError): feed.FeedWriter(writer.name)
+    with feed.FeedReader(writer.name) as reader:
+        assert reader.writer_alive()
+        writer.close(); writer.set_profile("AFTER") # Fermé : écriture ignorée
+        assert not reader.writer_alive()
+    with pytest.raises(FileNotFoundError): feed.FeedReader(writer.name) # Segment supprimé (POSIX)
+
+
+def test_stream_sends_a_snapshot_then_diffs(feed, writer, tmp_path):
+    writer.set_profile("A"); path = str(tmp_path / "feed.sock")
+    server = feed.FeedStreamServer(path, writer.name, poll_s=0.01); server.start(); assert server.ready.wait(5)
+    try:
+        states = feed.stream(path); first = next(states)
+        assert first["profile"] == "A" and "seq" in first
+        writer.set_profile("B"); second = next(states)
+        assert second["profile"] == "B" and second["seq"] > first["seq"] and second["cpu"] == first["cpu"] # État complet reconstruit
+        states.close()
+    finally: server.stop()
@@ -0,0 +1,34 @@
+import time
+
+
+def _hold(deck, mode, seconds):
+    deck.config["HOLD_DURATIONS"] = {mode: seconds}; deck.start_hold(mode)
+
+
+def test_hold_triggers_on_the_clock_even_without_frames(mfd, deck, spin):
+    _hold(deck, "EJECT", 0.12)
+    deck.scheduler.cancel("hold_render") # Aucune image rendue : seul le minuteur monotone reste
+    spin(60); assert not deck.hold_triggered
+    spin(200)
+    assert deck.hold_triggered and deck.hold_jitter_stats()["holds"] == 1
+    assert 0.0 <= deck.hold_jitter_ms[-1] < 100.0
+    assert [op for _, op, _ in deck.input_engine.backend.events][:1] == ["press"] # EXIT_SEAT enfoncé au déclenchement
+    deck.stop_hold(); spin(300)
+    assert deck.hold_active_mode is None
+
+
+def test_progress_follows_elapsed_time_not_frame_count(mfd, deck, spin):
+    _hold(deck, "AUTOLAND", 10.0)
+    deck.hold_started_at = time.perf_counter() - 2.5 # Équivalent d'une longue série d'images perdues
+    deck.update_hold_sequence()
+    assert 0.25 <= deck.hold_progress < 0.3 and not deck.hold_triggered
+    deck.stop_hold(); spin(300)
+    assert deck.hold_active_mode is None and not deck.hold_triggered
+
+
+def test_quick_release_and_repress_keeps_the_same_hold(mfd, deck, spin):
+    _hold(deck, "EJECT", 10.0); started = deck.hold_started_at
+    deck.stop_hold(); spin(50); deck.start_hold("EJECT") # Rebond du doigt dans la fenêtre de grâce
+    spin(300)
+    assert deck.hold_active_mode == "EJECT" and deck.hold_started_at == started
+    deck.stop_hold(); spin(300)
@@ -0,0 +1,55 @@
+import time
+
+
+def _run(mfd, fn, timeout=2.0):
+    engine = mfd.InputDispatcher(); engine.backend = mfd.RecordingBackend(); engine.start()
+    try:
+        cmds = fn(engine); deadline = time.perf_counter() + timeout
+        while any(c.t_done is None for c in cmds) and time.perf_counter() < deadline: time.sleep(0.005)
+    finally: engine.stop()
+    return engine, cmds
+
+
+def test_steps_run_in_order_at_their_offsets(mfd):
+    steps = [(0.0, "press", "a"), (0.05, "release", "a"), (0.02, "press", "b"), (0.08, "release", "b")]
+    engine, (cmd,) = _run(mfd, lambda e: [e.send("T", steps)])
+    events = engine.backend.events
+    assert [(op, k) for _, op, k in events] == [("press", "a"), ("press", "b"), ("release", "a"), ("release", "b")]
+    t0 = events[0][0]
+    for (ts, op, k), offset in zip(events, (0.0, 0.02, 0.05, 0.08)): assert ts - t0 >= offset - 0.002
+    assert cmd.t_done is not None and cmd.remaining == 0
+
+
+def test_jitter_is_recorded_per_step(mfd):
+    engine, (cmd,) = _run(mfd, lambda e: [e.send("T", [(0.0, "press", "a"), (0.03, "release", "a")])])
+    assert all(j is not None and j >= 0.0 for j in cmd.jitter_ms)
+    assert len(engine.jitter_ms) == 2 and engine.latency_stats()["jitter_p99_ms"] < 50.0
+
+
+def test_concurrent_commands_interleave(mfd):
+    engine, _ = _run(mfd, lambda e: [e.send("A", [(0.0, "press", "a"), (0.06, "release", "a")]), e.send("B", [(0.02, "press", "b"), (0.03, "release", "b")])])
+    assert [k for _, _, k in engine.backend.events] == ["a", "b", "b", "a"]
+
+
+def test_empty_command_finishes_immediately(mfd):
+    finished = []
+    engine = mfd.InputDispatcher(); engine.command_finished.connect(finished.append, mfd.Qt.ConnectionType.DirectConnection); engine.start()
+    try:
+        cmd = engine.send("EMPTY", []); deadline = time.perf_counter() + 1.0
+        while cmd.t_done is None and time.perf_counter() < deadline: time.sleep(0.005)
+    finally: engine.stop()
+    assert cmd.t_done is not None and finished == [cmd]
+
+
+def test_failed_press_is_not_released_on_cancel(mfd):
+    class FlakyBackend(mfd.RecordingBackend):
+        def press(self, key):
+            if key == "x": raise OSError("injection refused")
+            super().press(key)
+    engine = mfd.InputDispatcher(); engine.backend = FlakyBackend(); engine.start()
+    try:
+        cmd = engine.send("T", [(0.0, "press", "x"), (0.0, "press", "y"), (1.0, "release", "y"), (1.0, "release", "x")])
+        time.sleep(0.05); engine.cancel(cmd); deadline = time.perf_counter() + 1.0
+        while cmd.t_done is None and time.perf_counter() < deadline: time.sleep(0.005)
+    finally: engine.stop()
+    assert cmd.cancelled and [(op, k) for _, op, k in engine.backend.events] == [("press", "y"), ("release", "y")]
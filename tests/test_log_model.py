@@ -0,0 +1,42 @@
+import os
+
+
+def test_export_covers_entries_evicted_from_the_ring(mfd, app, tmp_path):
+    model = mfd.LogModel(capacity=50, spill_path=str(tmp_path / "spill.txt"))
+    for i in range(1234): model.append(f"ENTRY {i:04d}", mfd.LOG_LEVEL_USER if i % 2 else mfd.LOG_LEVEL_SYSTEM)
+    assert len(model.records) == 50
+    out = tmp_path / "export.txt"
+    assert model.export(str(out)) == 1234
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1234 and lines[0].endswith("[SYS] ENTRY 0000") and lines[-1].endswith("[USER] ENTRY 1233")
+
+
+def test_without_spill_export_is_the_ring(mfd, app, tmp_path):
+    model = mfd.LogModel(capacity=10)
+    for i in range(25): model.append(f"E{i}")
+    assert model.export(str(tmp_path / "e.txt")) == 10 and not os.path.exists(tmp_path / "spill.txt")
+
+
+def test_reopening_a_spill_never_truncates_it(mfd, app, tmp_path):
+    spill = str(tmp_path / "spill.txt")
+    first = mfd.LogModel(capacity=10, spill_path=spill)
+    for i in range(300): first.append(f"A{i}")
+    first.flush_spill(); before = open(spill, encoding="utf-8").read()
+    mfd.LogModel(capacity=10, spill_path=spill)
+    assert before and open(spill, encoding="utf-8").read() == before
+
+
+def test_each_deck_log_gets_its_own_spill(mfd, app):
+    a, b = mfd.get_log_spill_path(), mfd.get_log_spill_path()
+    assert a != b and str(os.getpid()) in os.path.basename(a)
+    first = mfd.LogModel(capacity=10, spill_path=a); second = mfd.LogModel(capacity=10, spill_path=b) # Deuxième deck, reconstruction
+    for i in range(300): first.append(f"A{i}")
+    for i in range(150): second.append(f"B{i}")
+    assert first.export(a + ".txt") == 300 and second.export(b + ".txt") == 150
+
+
+def test_stale_spills_of_dead_processes_are_purged(mfd, tmp_path):
+    ours = tmp_path / mfd.LOG_SPILL_FILENAME.format(pid=os.getpid(), n=1); dead = tmp_path / mfd.LOG_SPILL_FILENAME.format(pid=2 ** 22 + 1, n=1)
+    ours.write_text("x"); dead.write_text("y")
+    mfd.purge_stale_log_spills(str(tmp_path))
+    assert ours.exists() and not dead.exists()
@@ -0,0 +1,79 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+
+def test_compile_places_steps_at_absolute_offsets(mfd):
+    bindings = {"DECOY": mfd.Binding("DECOY", "h")}
+    steps = mfd.compile_macro({"steps": ["DECOY", {"wait": 0.2}, {"hold": "n", "for": 1.5}, "x"], "gap": 0.1}, bindings)
+    assert [(round(t, 3), op, k) for t, op, k in steps] == [
+        (0.0, "press", "h"), (0.0, "release", "h"), # Nom d'action : binding courant
+        (0.3, "press", "n"), (1.8, "release", "n"), # gap + wait, puis maintien
+        (1.9, "press", "x"), (1.9, "release", "x")]
+
+
+def test_compile_keeps_chords_down_and_releases_them_at_the_end(mfd):
+    steps = mfd.compile_macro({"steps": [{"press": "ctrl"}, "a", {"press": "shift"}, {"release": "shift"}, "b"], "gap": 0}, {})
+    ctrl, shift = (mfd.Binding(None, k).press_steps[0][2] for k in ("ctrl", "shift")); keys = [(op, k) for _, op, k in steps]
+    assert keys[0] == ("press", ctrl) and keys[-1] == ("release", ctrl) # Jamais laissée enfoncée
+    assert keys.count(("press", shift)) == keys.count(("release", shift)) == 1
+
+
+@pytest.mark.parametrize("spec, error", [
+    ({"steps": [{"release": "ctrl"}]}, "step 1: release of"),
+    ({"steps": ["a", {"wait": "soon"}]}, "step 2:"),
+    ({"steps": ["a", 42]}, "step 2: bad step"),
+    ({"steps": [{"wait": 1}]}, "no key steps"),
+    ({"steps": ["a"], "gap": "x"}, "bad gap"),
+])
+def test_compile_reports_the_faulty_step(mfd, spec, error):
+    with pytest.raises(ValueError, match=error): mfd.compile_macro(spec, {})
+
+
+def test_user_macros_extend_and_override_the_builtins(mfd, tmp_path):
+    path = tmp_path / "macros.json"
+    path.write_text(json.dumps({"salvo": ["DECOY", "DECOY"], "AUTOLAND": {"steps": ["l"]}, "BROKEN": {"steps": "DECOY"}}))
+    macros, errors = mfd.load_macros(str(path))
+    assert macros["SALVO"] == {"steps": ["DECOY", "DECOY"]} and macros["AUTOLAND"] == {"steps": ["l"]} and "CALL_ATC" in macros
+    assert errors == {"BROKEN": "missing steps list"} and "BROKEN" not in macros
+    path.write_text("[1, 2]")
+    macros, errors = mfd.load_macros(str(path))
+    assert set(macros) == set(mfd.DEFAULT_MACROS) and list(errors) == [mfd.MACROS_FILENAME] # Fichier invalide : intégrées seules
+
+
+def test_timings_aggregate_per_step_and_reset_on_a_new_layout(mfd, tmp_path):
+    timings = mfd.MacroTimings(); layout = ((0.0, "press", "a"), (0.1, "release", "a"))
+    for j in (1.0, 3.0): timings.record("M", SimpleNamespace(cancelled=False, steps=layout, jitter_ms=[j, None]))
+    timings.record("M", SimpleNamespace(cancelled=True, steps=layout, jitter_ms=[99.0, 99.0]))
+    stats = timings.stats()["M"]
+    assert (stats["runs"], stats["cancelled"], stats["max_ms"]) == (2, 1, 3.0) # Exécution annulée : pas de mesure
+    assert [s["max_ms"] for s in stats["steps"]] == [3.0, 0.0] and stats["steps"][1]["at_s"] == 0.1
+    timings.record("M", SimpleNamespace(cancelled=False, steps=layout[:1], jitter_ms=[5.0]))
+    assert [s["max_ms"] for s in timings.stats()["M"]["steps"]] == [5.0] # Macro recompilée : mesures repartent de zéro
+    timings.save(str(tmp_path / "t.json")); assert json.loads((tmp_path / "t.json").read_text())["M"]["runs"] == 3
+
+
+def test_deck_caches_compiled_macros_per_binding_table(mfd, deck):
+    steps = deck.macro_steps("POWER_DEC_WEAPONS")
+    assert deck.macro_steps("POWER_DEC_WEAPONS") is steps
+    deck.bindings = mfd.compile_bindings(deck.config, deck.bindings) # Nouvelle table (rechargement, profil)
+    assert deck.macro_steps("POWER_DEC_WEAPONS") is not steps and deck.macro_steps("POWER_DEC_WEAPONS") == steps
+
+
+def _log_lines(deck, n):
+    records = deck.log_model.records; return [records[i][2] for i in range(len(records) - n, len(records))]
+
+
+def test_deck_runs_a_macro_and_records_its_timing(mfd, deck, spin):
+    deck.macros["SALVO"] = {"steps": ["DECOY", "DECOY"], "gap": 0.01, "log": "DEFENSE: SALVO", "done": "SALVO DONE"}
+    deck.macros["BAD"] = {"steps": [{"release": "DECOY"}]}
+    assert deck.run_macro("BAD") is None and _log_lines(deck, 1)[0].startswith("MACRO INVALID: BAD (step 1")
+    assert deck.run_macro("SALVO") is not None
+    end = time.perf_counter() + 2
+    while not deck.macro_timings.runs.get("SALVO") and time.perf_counter() < end: spin(10)
+    decoy = deck.bindings.get("DECOY")
+    assert [(op, k) for _, op, k in deck.input_engine.backend.events] == [(op, k) for _, op, k in decoy.steps] * 2
+    assert deck.macro_timings.stats()["SALVO"]["runs"] == 1 and not deck.running_macros
+    assert _log_lines(deck, 2) == ["DEFENSE: SALVO", "SALVO DONE"]
@@ -0,0 +1,88 @@
+import base64
+import json
+import os
+import socket
+
+import pytest
+
+TOKEN = "s3cret-token"
+
+
+@pytest.fixture
+def server(mfd, app):
+    srv = mfd.MFDServer(["DECOY"], "127.0.0.1", 0, TOKEN); srv.start(); assert srv.ready.wait(5)
+    yield srv
+    srv.stop()
+
+
+def _line_client(port):
+    sock = socket.create_connection(("127.0.0.1", port), timeout=2); return sock, sock.makefile("rb")
+
+
+def _ws_hello(port, path):
+    """Handshake WebSocket ; renvoie les premiers octets reçus après le 101 (None si rien ne vient)."""
+    sock = socket.create_connection(("127.0.0.1", port), timeout=0.5)
+    key = base64.b64encode(os.urandom(16)).decode()
+    sock.sendall(f"GET {path} HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n\r\n".encode())
+    data = b""
+    while b"\r\n\r\n" not in data: data += sock.recv(4096)
+    rest = data.split(b"\r\n\r\n", 1)[1]
+    try:
+        while len(rest) < 2: rest += sock.recv(4096)
+    except socket.timeout: return None
+    finally: sock.close()
+    return rest # Une trame est arrivée : le client a été authentifié
+
+
+def test_non_loopback_without_token_is_refused(mfd):
+    with pytest.raises(ValueError): mfd.MFDServer([], "0.0.0.0", 0, "")
+    assert mfd.is_loopback_host("127.0.0.1") and mfd.is_loopback_host("localhost") and not mfd.is_loopback_host("0.0.0.0")
+
+
+def test_deck_generates_a_token_for_lan_binding(deck):
+    deck.config["NET_SERVER_TOKEN"] = ""
+    srv = deck.start_mfd_server("0.0.0.0", 0); srv.ready.wait(5)
+    try: assert len(deck.config["NET_SERVER_TOKEN"]) >= 16 and srv.token == deck.config["NET_SERVER_TOKEN"]
+    finally: srv.stop(); deck.mfd_server = None
+
+
+def test_in_band_auth_is_exact(server):
+    sock, f = _line_client(server.port)
+    sock.sendall(json.dumps({"t": "auth", "token": TOKEN + "junk"}).encode() + b"\n")
+    assert json.loads(f.readline())["t"] == "error"
+    sock.sendall(json.dumps({"t": "auth", "token": TOKEN}).encode() + b"\n")
+    assert json.loads(f.readline())["t"] == "hello"
+    sock.close()
+
+
+def test_url_token_must_be_the_token_parameter(server):
+    assert _ws_hello(server.port, f"/?x=token={TOKEN}junk") is None
+    assert _ws_hello(server.port, f"/?token={TOKEN}junk") is None
+    assert _ws_hello(server.port, f"/?token={TOKEN}") is not None
+
+
+def test_oversized_line_closes_only_that_client(mfd, server):
+    sock, f = _line_client(server.port)
+    sock.sendall(b"x" * (mfd.NET_MAX_MESSAGE_BYTES + 10) + b"\n")
+    assert f.readline() == b"" # Connexion fermée par le serveur
+    sock.close()
+    other, g = _line_client(server.port)
+    other.sendall(json.dumps({"t": "ping", "id": 7}).encode() + b"\n")
+    assert json.loads(g.readline())["id"] == 7
+    other.close()
+
+
+def test_remote_action_runs_on_the_gui_thread(mfd, deck, spin):
+    deck.config["NET_SERVER_TOKEN"] = TOKEN
+    srv = deck.start_mfd_server("127.0.0.1", 0, TOKEN); assert srv.ready.wait(5)
+    try:
+        sock, f = _line_client(srv.port)
+        sock.sendall(json.dumps({"t": "auth", "token": TOKEN}).encode() + b"\n"); assert json.loads(f.readline())["t"] == "hello"
+        sock.sendall(json.dumps({"t": "action", "a": "DECOY", "id": 1}).encode() + b"\n")
+        assert json.loads(f.readline()) == {"t": "ack", "id": 1, "ok": True}
+        assert not deck.input_engine.backend.events # Acquitté par le serveur, rien exécuté tant que le GUI n'a pas tourné
+        spin(100)
+        assert [op for _, op, _ in deck.input_engine.backend.events][:1] == ["press"]
+        assert deck.log_model.records[len(deck.log_model.records) - 1][2] == "NET: DECOY"
+        sock.close()
+    finally: srv.stop(); deck.mfd_server = None
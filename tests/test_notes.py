@@ -0,0 +1,73 @@
+import os
+
+
+def test_writer_keeps_only_the_last_snapshot_per_file(mfd, tmp_path):
+    writer = mfd.NotesWriter()
+    path = str(tmp_path / "notes.txt")
+    for i in range(20): writer.submit(path, f"draft {i}")
+    assert writer.flush()
+    assert open(path, encoding="utf-8").read() == "draft 19"
+    assert writer.writes == 1 and writer.coalesced == 19 and writer.failures == 0
+    assert os.listdir(tmp_path) == ["notes.txt"] # Aucun fichier temporaire laissé derrière
+
+
+def test_writer_thread_flushes_before_stopping(mfd, tmp_path):
+    writer = mfd.NotesWriter(); writer.start()
+    paths = [str(tmp_path / f"{i}.txt") for i in range(3)]
+    for p in paths: writer.submit(p, p)
+    writer.stop()
+    assert not writer.isRunning() and all(open(p, encoding="utf-8").read() == p for p in paths)
+
+
+def test_typing_burst_is_saved_once_after_the_idle_window(mfd, app, spin):
+    editor = mfd.NotesWidget(save_delay_ms=80)
+    try:
+        editor.moveCursor(editor.textCursor().MoveOperation.End); editor.writer.flush(); writes = editor.writer.writes
+        for ch in "QT 28.5 HUR-L1": editor.insertPlainText(ch); spin(5)
+        assert editor.dirty and editor.snapshot_count == 0
+        spin(200); assert editor.writer.flush()
+        assert not editor.dirty and editor.snapshot_count == 1
+        assert editor.writer.writes - writes <= 2 # La section, plus l'index si le titre a changé
+        with open(editor.store.path(editor.section_id), encoding="utf-8") as f: assert f.read().endswith("QT 28.5 HUR-L1")
+    finally: editor.shutdown(); editor.deleteLater()
+
+
+def test_legacy_notes_are_split_on_headings(mfd):
+    text = "# ROUTES\nHUR-L1 -> ARC-L2\n# PRICES\nLaranite 28.5\n"
+    assert mfd.split_note_sections(text) == ["# ROUTES\nHUR-L1 -> ARC-L2\n", "# PRICES\nLaranite 28.5\n"]
+    long = "x\n\n" * 50; parts = mfd.split_note_sections(long, max_chars=20)
+    assert "".join(parts) == long and len(parts) > 1 and all(len(p) <= 40 for p in parts) # Coupé sur une ligne vide passé la taille cible
+    assert mfd.note_title("\n  ## cargo runs  \nbody") == "CARGO RUNS"
+
+
+def test_index_tracks_updates_and_matches_prefixes(mfd):
+    index = mfd.NoteIndex()
+    index.update("s1", "Laranite at HUR-L1"); index.update("s2", "Quantanium at ARC-L2")
+    assert index.sections_for(["lar"]) == {"s1"} and index.sections_for(["zz"]) == set()
+    assert index.sections_for(["hur", "l1"]) == {"s1"} and index.sections_for(["at"]) == {"s1", "s2"}
+    index.update("s1", "Agricium at CRU-L4")
+    assert index.sections_for(["lar"]) == set() and "laranite" not in index.vocabulary()
+    index.remove("s2")
+    assert index.sections_for(["quant"]) == set() and "s2" not in index.section_tokens
+
+
+def test_store_loads_sections_lazily_and_searches_lines(mfd, tmp_path):
+    legacy = tmp_path / "legacy.txt"; legacy.write_text("# ROUTES\nHUR-L1 -> ARC-L2\n# PRICES\nLaranite 28.5 at HUR\nGold 6.1\n", encoding="utf-8")
+    store = mfd.NoteStore(str(tmp_path / "notes")); (tmp_path / "notes").mkdir()
+    writer = mfd.NotesWriter()
+    for path, text in store.load(str(legacy)): writer.submit(path, text)
+    writer.flush()
+    fresh = mfd.NoteStore(str(tmp_path / "notes")); assert fresh.load() == []
+    assert [s["title"] for s in fresh.sections] == ["ROUTES", "PRICES"] and not fresh._texts # Seul l'index est lu
+    index = mfd.NoteIndex()
+    for sec in fresh.sections: index.update(sec["id"], fresh.text(sec["id"]))
+    s1, s2 = (sec["id"] for sec in fresh.sections)
+    assert fresh.search(index, "hur") == [(s1, 1, "HUR-L1 -> ARC-L2"), (s2, 1, "Laranite 28.5 at HUR")]
+    assert fresh.search(index, "lar 28") == [(s2, 1, "Laranite 28.5 at HUR")] and fresh.search(index, "platinum") == []
+
+
+def test_title_change_rewrites_the_index_only_when_needed(mfd, tmp_path):
+    store = mfd.NoteStore(str(tmp_path)); store.load(); sid = store.current
+    writes = store.set_text(sid, "# MINING\nlocations")
+    assert [os.path.basename(p) for p, _ in writes] == [f"{sid}.txt", mfd.NOTES_INDEX_FILENAME]
+    assert [os.path.basename(p) for p, _ in store.set_text(sid, "# MINING\nmore locations")] == [f"{sid}.txt"]
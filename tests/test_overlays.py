@@ -0,0 +1,34 @@
+from PyQt6.QtCore import QPoint
+
+
+def test_system_overlay_keeps_qwidget_render(mfd, app):
+    overlay = mfd.SystemOverlay(); overlay.resize(320, 200); overlay.set_mode("BOOT"); overlay.add_log("BIOS CHECK... OK")
+    pixmap = overlay.grab() # QWidget.render(target, ...) sous le capot
+    assert not pixmap.isNull() and pixmap.width() == 320
+    image = mfd.QPixmap(320, 200); overlay.render(image)
+    assert overlay.frame_times_ms
+
+
+def test_action_overlay_repaints_only_disc_and_tapes(mfd, app):
+    overlay = mfd.ActionOverlay(); overlay.resize(800, 600)
+    region = overlay.damage_region()
+    assert region.contains(QPoint(400, 300)) and region.contains(QPoint(5, 5)) and region.contains(QPoint(5, 595))
+    assert not region.contains(QPoint(20, 300)) # Côtés de l'écran : jamais repeints pendant un maintien
+    assert region.boundingRect().width() == 800
+
+
+def test_action_overlay_layers_are_cached_until_the_colour_changes(mfd, app):
+    overlay = mfd.ActionOverlay(); overlay.resize(800, 600); overlay.set_config(mfd.QColor(255, 0, 0), "EJECT")
+    for i in range(5): overlay.set_state(True, i / 5.0); overlay.grab()
+    tile, disc = overlay.tape_tile(), overlay.disc_cache()
+    assert overlay.frame_stats()["frames"] == 5
+    overlay.set_state(True, 0.9); overlay.grab()
+    assert overlay.tape_tile() is tile and overlay.disc_cache() is disc
+    overlay.set_config(mfd.QColor(255, 0, 0), "EJECT"); assert overlay.tape_tile() is tile
+    overlay.set_config(mfd.QColor(0, 200, 255), "AUTO-LAND"); assert overlay.tape_tile() is not tile and overlay.disc_cache() is disc
+
+
+def test_inactive_action_overlay_paints_nothing(mfd, app):
+    overlay = mfd.ActionOverlay(); overlay.resize(400, 300)
+    overlay.set_state(False); overlay.grab()
+    assert overlay.frame_stats()["frames"] == 0
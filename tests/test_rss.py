@@ -0,0 +1,57 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>RSI</title>
+<entry><title>Patch 4.2 Live</title><updated>2026-10-01T10:00:00Z</updated></entry>
+<entry><title>Invictus Launch Week</title><updated>2026-09-20T10:00:00Z</updated></entry>
+</feed>"""
+ETAG = '"v1"'; LAST_MODIFIED = "Thu, 01 Oct 2026 10:00:00 GMT"
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    requests = []
+    def do_GET(self):
+        FeedHandler.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG or self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+            self.send_response(304); self.end_headers(); return
+        self.send_response(200); self.send_header("Content-Type", "application/atom+xml"); self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED); self.send_header("Content-Length", str(len(FEED))); self.end_headers(); self.wfile.write(FEED)
+    def log_message(self, *args): pass
+
+
+@pytest.fixture
+def feed_server(monkeypatch):
+    monkeypatch.setenv("no_proxy", "127.0.0.1"); monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    FeedHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler); thread = threading.Thread(target=server.serve_forever, daemon=True); thread.start()
+    yield server
+    server.shutdown(); server.server_close()
+
+
+def _fetch(mfd, url):
+    worker = mfd.RSSWorker(url); got = []
+    worker.data_refreshed.connect(got.append, mfd.Qt.ConnectionType.DirectConnection)
+    worker.run() # Synchrone : même code que dans le thread
+    return worker, got[-1]
+
+
+def test_200_then_304_then_offline_cache(mfd, feed_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(mfd, "get_rss_cache_path", lambda: str(tmp_path / "rss_cache.json"))
+    url = f"http://127.0.0.1:{feed_server.server_address[1]}/atom"
+    expected = [("2026-10-01", "Patch 4.2 Live"), ("2026-09-20", "Invictus Launch Week")]
+
+    worker, items = _fetch(mfd, url)
+    assert worker.last_status == "UPDATED" and items == expected
+    assert "If-None-Match" not in FeedHandler.requests[0]
+
+    worker, items = _fetch(mfd, url)
+    assert worker.last_status == "NOT_MODIFIED" and items == expected
+    assert FeedHandler.requests[1].get("If-None-Match") == ETAG and FeedHandler.requests[1].get("If-Modified-Since") == LAST_MODIFIED
+
+    feed_server.shutdown(); feed_server.server_close()
+    worker, items = _fetch(mfd, url)
+    assert worker.last_status == "OFFLINE" and worker.failures == 1
+    assert items[0][0] == "ERROR" and items[1:] == expected
@@ -0,0 +1,39 @@
+import time
+
+
+def test_due_jobs_share_one_wakeup(mfd, app, spin):
+    sched = mfd.FrameScheduler(); runs = []
+    sched.every("a", 100, lambda: runs.append("a")); sched.every("b", 95, lambda: runs.append("b")) # Dans la marge de 10 %
+    spin(130)
+    assert sorted(runs) == ["a", "b"] and sched.wakeups == 1
+
+
+def test_one_shot_runs_once_and_cancel_stops_the_timer(mfd, app, spin):
+    sched = mfd.FrameScheduler(); runs = []
+    sched.after("once", 10, lambda: runs.append(1)); sched.every("tick", 20, lambda: runs.append(2))
+    spin(60); sched.cancel("tick"); count = len(runs); spin(60)
+    assert runs.count(1) == 1 and len(runs) == count and not sched.jobs and not sched.timer.isActive()
+
+
+def test_animation_runs_every_frame_until_it_returns_false(mfd, app, spin):
+    sched = mfd.FrameScheduler(); frames = []
+    sched.animate("anim", lambda dt: frames.append(dt) or len(frames) < 3)
+    assert sched.animating() and sched.timer.timerType() == mfd.Qt.TimerType.PreciseTimer
+    spin(150)
+    assert len(frames) == 3 and not sched.pending("anim") and not sched.animating()
+
+
+def test_suspended_cosmetic_jobs_never_wake_the_loop(mfd, app, spin):
+    sched = mfd.FrameScheduler(); runs = []
+    sched.every("ambient", 10, lambda: runs.append(1), cosmetic=True); sched.set_cosmetic_factor(0)
+    spin(60)
+    assert not runs and sched.wakeups == 0 and not sched.timer.isActive()
+    sched.set_cosmetic_factor(1); spin(40)
+    assert runs
+
+
+def test_late_tick_does_not_burst_to_catch_up(mfd, app, spin):
+    sched = mfd.FrameScheduler(); runs = []
+    sched.every("t", 10, lambda: runs.append(1))
+    time.sleep(0.1); spin(5) # Boucle figée 10 intervalles
+    assert len(runs) == 1
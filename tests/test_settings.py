@@ -0,0 +1,8 @@
+def test_reset_defaults_only_touches_bindings(mfd, deck):
+    deck.config.update({"DECOY": "alt+z", "THEME": "NIGHT_VISION", "ACTIVE_PROFILE": "CUTLASS", "NET_SERVER_PORT": 8765, "SESSION_JOURNAL": False})
+    dlg = mfd.SettingsDialog(dict(deck.config), deck, deck)
+    dlg.reset_defaults()
+    assert dlg.config["DECOY"] == mfd.DEFAULT_BINDINGS["DECOY"]
+    assert (dlg.config["THEME"], dlg.config["ACTIVE_PROFILE"], dlg.config["NET_SERVER_PORT"], dlg.config["SESSION_JOURNAL"]) == ("NIGHT_VISION", "CUTLASS", 8765, False)
+    assert dlg.buttons["DECOY"].text() == mfd.DEFAULT_BINDINGS["DECOY"].upper()
+    dlg.deleteLater()
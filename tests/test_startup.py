@@ -0,0 +1,31 @@
+import os
+
+
+def test_profiler_marks_phases_and_first_frame_once(mfd):
+    prof = mfd.StartupProfiler(enabled=True)
+    prof.mark("config"); prof.first_frame(); first = prof.first_frame_ms; prof.first_frame(); prof.ready()
+    data = prof.as_dict()
+    assert list(data["phases_ms"]) == ["config", "first_frame"] and data["time_to_first_frame_ms"] == first
+    assert data["time_to_ready_ms"] >= first and "TIME TO FIRST FRAME" in prof.report()
+
+
+def test_panels_are_built_one_per_event_loop_turn(mfd, app, spin):
+    deck = mfd.SC_ControlDeck(); deck.show()
+    try:
+        total = len(deck.pending_panels); assert total > 1 and not deck.panels_ready
+        deck.start_panel_build()
+        assert len(deck.pending_panels) == total - 1 # La boucle d'événements reprend la main entre deux panneaux
+        for _ in range(200):
+            if deck.panels_ready: break
+            spin(10)
+        assert deck.panels_ready and not deck.pending_panels
+    finally: deck.shutdown_services(); deck.close(); deck.deleteLater(); spin(10)
+
+
+def test_initial_setup_moves_legacy_files_next_to_the_script(mfd, tmp_path, monkeypatch):
+    anchor = tmp_path / "appdata"; legacy = tmp_path / "cwd"; legacy.mkdir()
+    monkeypatch.setattr(mfd, "FIXED_APPDATA_DIR", str(anchor)); monkeypatch.setattr(mfd, "LOCATION_MAP_FILE", str(anchor / "storage_location.json"))
+    (legacy / mfd.CONFIG_FILENAME).write_text("{}"); (legacy / mfd.NOTES_FILENAME).write_text("notes")
+    monkeypatch.chdir(legacy)
+    assert mfd.ensure_initial_setup() == str(anchor)
+    assert sorted(os.listdir(anchor)) == sorted([mfd.CONFIG_FILENAME, mfd.NOTES_FILENAME, "storage_location.json"]) and not os.listdir(legacy)
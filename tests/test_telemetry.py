@@ -0,0 +1,27 @@
+import time
+
+
+def test_sample_is_one_compact_snapshot(mfd):
+    sampler = mfd.TelemetrySampler(history_size=3)
+    for _ in range(5): snap = sampler.sample()
+    assert set(snap) == {"ts", "cpu", "cores", "ram", "disk", "swap"}
+    assert 0 <= snap["cpu"] <= 100 and isinstance(snap["cores"], tuple) and all(isinstance(c, int) for c in snap["cores"])
+    assert sampler.sample_count == 5 and len(sampler.recent()) == 3 and sampler.recent(1) == [snap]
+
+
+def test_sampler_thread_emits_and_stops_promptly(mfd, app, spin):
+    sampler = mfd.TelemetrySampler(interval_s=0.02); got = []
+    sampler.snapshot_ready.connect(got.append); sampler.start()
+    try: spin(150)
+    finally:
+        t0 = time.perf_counter(); sampler.stop(); stop_s = time.perf_counter() - t0
+    assert len(got) >= 2 and got[-1]["ts"] > got[0]["ts"]
+    assert not sampler.isRunning() and stop_s < 0.5 # stop() réveille l'attente au lieu de finir l'intervalle
+
+
+def test_snapshot_updates_only_changed_bars(mfd, deck):
+    disk = deck.telemetry_values.get("disk")
+    snap = {"ts": time.time(), "cpu": 42, "cores": (40, 44), "ram": 63, "disk": None, "swap": 7}
+    deck.apply_telemetry_snapshot(snap)
+    assert (deck.bar_cpu.value(), deck.bar_ram.value(), deck.bar_swap.value()) == (42, 63, 7)
+    assert deck.telemetry_values["cpu"] == 42 and deck.telemetry_values.get("disk") == disk # None = métrique absente, pas remise à zéro
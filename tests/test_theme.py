@@ -0,0 +1,22 @@
+def _edge(widget):
+    img = widget.grab().toImage(); return img.pixelColor(0, widget.height() // 2).name()
+
+
+def test_swap_recolours_without_touching_the_stylesheet(mfd, app, deck, spin):
+    btn = deck.findChild(mfd.QPushButton, "config_btn"); sheet = app.styleSheet(); compiles = mfd.THEME.compile_count
+    deck.set_theme("CONSTELLATION"); spin(10)
+    assert _edge(btn) == mfd.THEMES["CONSTELLATION"]["config_border"]
+    deck.set_theme("NIGHT_VISION"); spin(10)
+    assert _edge(btn) == mfd.THEMES["NIGHT_VISION"]["config_border"]
+    assert app.styleSheet() == sheet and mfd.THEME.compile_count == compiles and deck.property(mfd.THEME_PROPERTY) == "NIGHT_VISION"
+    deck.set_theme(mfd.DEFAULT_THEME)
+
+
+def test_dialogs_and_late_windows_follow_the_current_theme(mfd, app, deck, spin):
+    deck.set_theme("HIGH_CONTRAST"); spin(10)
+    dlg = mfd.SettingsDialog(dict(deck.config), deck, deck); dlg.show(); spin(10)
+    save = dlg.findChild(mfd.QPushButton, "settings_save_btn")
+    assert save.grab().toImage().pixelColor(save.width() // 2, save.height() - 4).name() == mfd.THEMES["HIGH_CONTRAST"]["accent"]
+    late = mfd.QMainWindow(); assert mfd.THEME.apply("HIGH_CONTRAST") is False # Même thème : seule la nouvelle fenêtre est marquée
+    assert late.property(mfd.THEME_PROPERTY) == "HIGH_CONTRAST"
+    dlg.close(); dlg.deleteLater(); late.deleteLater(); deck.set_theme(mfd.DEFAULT_THEME)
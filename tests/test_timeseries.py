@@ -0,0 +1,55 @@
+import os
+
+
+def _rec(ts, v=10): return (float(ts), v, v, v, v, v, v, v, v)
+
+
+def test_segment_appends_and_reads_a_range(mfd, tmp_path):
+    f = mfd.TimeSeriesFile(str(tmp_path / "t.bin"), 100)
+    for i in range(50): f.append(_rec(1000 + i, i))
+    assert f.count() == 50 and f.first_ts() == 1000.0
+    rows = f.read(1010, 1020)
+    assert [r[0] for r in rows] == [float(t) for t in range(1010, 1020)] and rows[0][1] == 10 # Borne haute exclue
+    assert f.read(0, 1000) == [] and f.read(2000, 3000) == []
+    f.close()
+
+
+def test_full_segment_rotates_into_a_bounded_pair(mfd, tmp_path):
+    path = str(tmp_path / "t.bin"); f = mfd.TimeSeriesFile(path, 10)
+    for i in range(25): f.append(_rec(i))
+    assert f.rotations == 2 and f.count() == 5
+    assert sorted(os.listdir(tmp_path)) == ["t.bin", "t.bin.1"] # Au plus deux segments
+    assert [r[0] for r in f.read(0, 100)] == [float(t) for t in range(10, 25)] # Le plus ancien segment est perdu
+    assert f.first_ts() == 10.0
+    f.close()
+
+
+def test_segment_survives_reopen_and_rejects_foreign_files(mfd, tmp_path):
+    path = str(tmp_path / "t.bin"); f = mfd.TimeSeriesFile(path, 10)
+    for i in range(3): f.append(_rec(i))
+    f.close()
+    ro = mfd.TimeSeriesFile(path, 10, readonly=True); assert ro.count() == 0 and ro.open() and ro.count() == 3; ro.close()
+    with open(path, "r+b") as raw: raw.write(b"XXXX")
+    assert not mfd.TimeSeriesFile(path, 10, readonly=True).open() # Mauvais magic : ignoré en lecture
+    f = mfd.TimeSeriesFile(path, 10); f.open(); assert f.count() == 0; f.close() # En écriture : segment neuf
+
+
+def test_history_aggregates_minutes_and_keeps_the_open_bucket_visible(mfd, tmp_path):
+    h = mfd.TelemetryHistory(str(tmp_path / "telemetry"))
+    for i in range(120): h.append({"ts": 60.0 + i, "cpu": 20 if i % 2 else 40, "ram": 50, "disk": None, "swap": 150})
+    tier, rows = h.read(60, 180, tier="1m")
+    assert tier == "1m" and [r[0] for r in rows] == [60.0, 120.0] # Deuxième minute : seau en cours, pas encore sur disque
+    assert rows[0][1:5] == (30, 50, mfd.TS_MISSING, 100) and rows[0][5] == 40 # Moyenne, champ absent, valeur bornée, maximum
+    h.close()
+    h = mfd.TelemetryHistory(str(tmp_path / "telemetry"), readonly=True)
+    assert [r[0] for r in h.read(60, 180, tier="1m")[1]] == [60.0, 120.0] # Seau partiel écrit à la fermeture
+    assert len(h.read(60, 180)[1]) == 120
+    h.close()
+
+
+def test_history_picks_the_finest_tier_that_fits(mfd, tmp_path):
+    h = mfd.TelemetryHistory(str(tmp_path / "telemetry"))
+    for i in range(10): h.append({"ts": 1000.0 + i, "cpu": 1, "ram": 1, "disk": 1, "swap": 1})
+    assert h.pick_tier(1000, 1010, 100) == "1s"
+    assert h.pick_tier(0, 86400, 2000) == "1m" and h.pick_tier(0, 30 * 86400, 5000) == "10m"
+    h.close()
@@ -0,0 +1,52 @@
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QEventPoint
+
+P, S, R = QEventPoint.State.Pressed, QEventPoint.State.Stationary, QEventPoint.State.Released
+
+
+def _button(mfd, deck, prefix):
+    return next(b for b in deck.findChildren(mfd.QPushButton) if b.text().startswith(prefix) and b.isVisible())
+
+
+def _centre(w): return QPointF(w.mapToGlobal(w.rect().center()))
+
+
+def test_two_simultaneous_touch_points_fire_two_buttons(mfd, deck):
+    router = deck.touch_router; a, b = _button(mfd, deck, "DECOY"), _button(mfd, deck, "NOISE")
+    clicks = {a: 0, b: 0}
+    for btn in (a, b): btn.clicked.connect(lambda _=False, btn=btn: clicks.__setitem__(btn, clicks[btn] + 1))
+
+    assert router.route([(3, P, _centre(a)), (4, P, _centre(b))], 0)
+    assert clicks == {a: 1, b: 1} # Action à l'appui, un clic par point
+    assert a.isDown() and b.isDown() and router.points == {3: a, 4: b}
+
+    assert router.route([(3, R, _centre(a)), (4, S, _centre(b))], 0)
+    assert not a.isDown() and b.isDown() and list(router.points) == [4]
+    assert not router.route([(4, S, _centre(b))], 0) # Point immobile : rien à faire
+    assert router.route([(4, R, _centre(b))], 0)
+    assert clicks == {a: 1, b: 1} and not b.isDown() and not router.points and not router.held
+    assert router.latency_stats()["untimed"] == 2 # Horodatage 0 : latence non comptée
+
+
+def test_touch_outside_buttons_is_left_to_qt(mfd, deck):
+    router = deck.touch_router
+    assert not router.route([(7, P, QPointF(-500, -500))], 0)
+    assert not router.points and not router.route([(7, R, QPointF(-500, -500))], 0)
+
+
+def test_second_finger_on_the_same_button_and_cancel(mfd, deck):
+    router = deck.touch_router; a = _button(mfd, deck, "DECOY"); clicks = []
+    a.clicked.connect(lambda: clicks.append(1))
+    assert router.inject([(1, P, a), (2, P, a)])
+    assert clicks == [1] and router.held == {a: 2} # Deuxième doigt : pas de second clic
+    router.route([(1, R, _centre(a))], 0); assert a.isDown()
+    router.cancel_all()
+    assert not a.isDown() and not router.points and not router.held
+
+
+def test_hold_button_presses_and_releases_with_its_point(mfd, deck):
+    router = deck.touch_router; hold = next(b for b in deck.findChildren(mfd.HoldButton) if b.isVisible()); calls = []
+    hold.on_press_callback = lambda: calls.append("press"); hold.on_release_callback = lambda: calls.append("release")
+    router.inject([(5, P, hold)]); assert calls == ["press"] and hold.isDown()
+    router.inject([(5, R, hold)]); assert calls == ["press", "release"] and not hold.isDown()
+    assert router.latency_stats()["count"] == 1 # Injection horodatée sur time.monotonic
@@ -0,0 +1,25 @@
+import time
+
+
+def _block_gui(seconds):
+    time.sleep(seconds) # Boucle d'événements figée
+
+
+def test_stall_is_detected_with_the_gui_stack(mfd, app, spin):
+    dog = mfd.StallWatchdog(threshold_ms=40); dog.start()
+    try:
+        spin(100); assert dog.stall_stats()["stalls"] == 0 and dog.stall_stats()["answered"] > 0
+        _block_gui(0.25); spin(100)
+    finally: dog.stop()
+    stats = dog.stall_stats()
+    assert stats["stalls"] == 1 and len(stats["recent"]) == 1
+    stall = stats["recent"][0]
+    assert stall["duration_ms"] >= 200 and any("_block_gui" in line for line in stall["stack"])
+
+
+def test_pings_are_answered_from_the_gui_thread(mfd, app, spin):
+    dog = mfd.StallWatchdog(threshold_ms=60); dog.start()
+    try: spin(400)
+    finally: dog.stop()
+    stats = dog.stall_stats()
+    assert stats["pings"] >= 5 and stats["pings"] - stats["answered"] <= 1 and stats["stalls"] == 0